@@ -0,0 +1,153 @@
+"""
+Backfill memory benchmark: peak RSS and time versus the number of seasons.
+
+Runs scripts/backfill.py against synthetic FanGraphs-shaped batting tables
+(no network) and a store that discards writes, once per span, each in a
+fresh process so peak RSS is measured per span:
+
+    python benchmarks/bench_backfill.py --spans 10 50 155 --output backfill.json
+
+With a bounded intermediate, peak RSS should stay flat as the span grows
+while the time grows linearly.
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks.bench_hot_paths import _git_commit
+
+LAST_SEASON = 2025
+CAREER_SEASONS = 8
+
+_STATS = {
+    "G": (20, 162), "PA": (50, 700), "AB": (45, 620), "H": (10, 200), "1B": (5, 150), "2B": (1, 45),
+    "3B": (0, 10), "HR": (0, 50), "R": (5, 120), "RBI": (5, 130), "BB": (2, 110), "SO": (5, 200),
+    "SB": (0, 40), "CS": (0, 12),
+}
+_RATES = {
+    "AVG": (0.18, 0.33), "OBP": (0.25, 0.42), "SLG": (0.3, 0.6), "OPS": (0.55, 1.0), "ISO": (0.05, 0.3),
+    "BABIP": (0.24, 0.36), "BB%": (3, 16), "K%": (8, 32), "BB/K": (0.1, 1.2), "wOBA": (0.26, 0.42),
+    "wRC+": (50, 170), "WAR": (-1, 8), "Off": (-20, 50), "Def": (-15, 15), "BsR": (-5, 8),
+}
+_CONTACT = {"Hard%": (25, 55), "Barrel%": (2, 18), "EV": (84, 95), "LA": (5, 20)}
+
+
+class DiscardingStore:
+    """Counts Firestore writes without keeping them, so RSS reflects only the backfill"""
+
+    def __init__(self):
+        self.writes = 0
+
+    def collection(self, name: str) -> "DiscardingStore":
+        return self
+
+    def document(self, doc_id: str) -> "DiscardingStore":
+        return self
+
+    def set(self, *args, **kwargs) -> None:
+        self.writes += 1
+
+    def batch(self) -> "DiscardingStore":
+        return self
+
+    def commit(self) -> None:
+        pass
+
+
+def make_batting_frame(first: int, last: int, hitters: int, seed: int = 42):
+    """batting_stats-shaped frame: `hitters` rows per season, each hitter active CAREER_SEASONS seasons"""
+    import numpy as np
+    import pandas as pd
+
+    frames = []
+    for season in range(first, last + 1):
+        rng = np.random.default_rng(seed + season)
+        slots = np.arange(hitters)
+        # Slot i starts a new career every CAREER_SEASONS seasons, offset by i
+        cohort = (season + slots % CAREER_SEASONS) // CAREER_SEASONS
+        ids = cohort * hitters + slots + 1
+        columns = {"IDfg": ids, "Season": season, "Name": [f"Player {i}" for i in ids],
+                   "Age": 22 + (season + slots % CAREER_SEASONS) % CAREER_SEASONS,
+                   "Team": rng.choice(["NYY", "BOS", "CHC", "LAD", "- - -"], hitters)}
+        for stat, (low, high) in _STATS.items():
+            columns[stat] = rng.integers(low, high, hitters)
+        stats = dict(_RATES, **(_CONTACT if season >= 2015 else {}))
+        for stat, (low, high) in stats.items():
+            columns[stat] = rng.uniform(low, high, hitters).round(3)
+        frames.append(pd.DataFrame(columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_span(seasons: int, args) -> Dict:
+    """One backfill of the last `seasons` seasons in this process"""
+    from scripts.backfill import Backfill
+
+    store = DiscardingStore()
+    with tempfile.TemporaryDirectory() as work_dir:
+        backfill = Backfill(
+            store, work_dir, LAST_SEASON - seasons + 1, LAST_SEASON,
+            chunk_years=args.chunk_years, rows_per_bucket=args.rows_per_bucket,
+            fetch=lambda first, last: make_batting_frame(first, last, args.hitters, args.seed),
+            lookup=lambda ids: {i: 100_000 + i for i in ids},
+        )
+        summary = backfill.run(project=False)  # The store discards writes, so there is nothing to project from
+    summary["writes"] = store.writes
+    summary["rows"] = seasons * args.hitters
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Peak RSS of the streaming backfill versus seasons ingested")
+    parser.add_argument("--spans", type=int, nargs="+", default=[10, 50, 155])
+    parser.add_argument("--hitters", type=int, default=600, help="Hitters per season")
+    parser.add_argument("--chunk-years", type=int, default=5)
+    parser.add_argument("--rows-per-bucket", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_span(args.child, args)))
+        return
+
+    results: List[Dict] = []
+    for seasons in args.spans:
+        print(f"{seasons} seasons...", file=sys.stderr)
+        child = subprocess.run(
+            [sys.executable, __file__, "--child", str(seasons), "--hitters", str(args.hitters),
+             "--chunk-years", str(args.chunk_years), "--rows-per-bucket", str(args.rows_per_bucket),
+             "--seed", str(args.seed)],
+            capture_output=True, text=True, check=True,
+        )
+        results.append({"span": seasons, **json.loads(child.stdout.strip().splitlines()[-1])})
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "hitters_per_season": args.hitters,
+            "rows_per_bucket": args.rows_per_bucket,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote {len(results)} spans to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Response encoding benchmark: JSON vs MessagePack vs Arrow IPC.
+
+Encodes the same response content the player routes produce (after FastAPI's
+response_model serialization, which is shared by every format) and reports
+encode latency and payload size per format:
+
+    python benchmarks/bench_encoding.py --output encoding.json
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import platform
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.bench_hot_paths import _git_commit, measure
+from benchmarks.catalog import make_catalog, make_queries
+from benchmarks.local_store import LocalFirestore
+from models.players import SavedPlayer
+from services.player_search_service import PlayerSearchService
+from utils.negotiation import ARROW, JSON, MSGPACK, NegotiatedResponse
+
+
+def build_payloads(args) -> Dict[str, object]:
+    """Response content for each route shape, as FastAPI hands it to the response class"""
+    catalog = make_catalog(args.catalog_size, seed=args.seed)
+    queries = make_queries(catalog, 40, seed=args.seed + 1)
+
+    service = PlayerSearchService()
+    service.db = LocalFirestore()
+    service.db.load_players(catalog)
+    loop = asyncio.new_event_loop()
+    try:
+        detail = loop.run_until_complete(service.get_player_detail(catalog[0]["mlbam_id"]))
+        search = loop.run_until_complete(service.search(queries[0]))
+        batch = loop.run_until_complete(service.search_batch(queries))
+    finally:
+        loop.close()
+
+    saved = [
+        SavedPlayer(id=p["mlbam_id"], name=p["name"], years_active=f"{min(p['seasons'])}-{max(p['seasons'])}")
+        for p in catalog[:50]
+    ]
+    return {
+        "player_detail": jsonable_encoder(detail),
+        "search": jsonable_encoder(search),
+        "search_batch": jsonable_encoder(batch),
+        "saved_players": jsonable_encoder(saved),
+    }
+
+
+def bench_payload(name: str, content, args) -> List[Dict]:
+    tabular = isinstance(content, list)
+    results = []
+    for media_type in (JSON, MSGPACK, ARROW):
+        if media_type == ARROW and not tabular:
+            continue
+        size = len(NegotiatedResponse(content, media_type=media_type).body)
+        timing = measure(
+            lambda i: NegotiatedResponse(content, media_type=media_type),
+            min_iterations=args.min_iterations,
+            min_seconds=args.min_seconds,
+        )
+        results.append({"benchmark": f"encode.{name}", "media_type": media_type, "bytes": size, **timing})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare response encodings")
+    parser.add_argument("--catalog-size", type=int, default=2_000)
+    parser.add_argument("--min-iterations", type=int, default=200)
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for name, content in build_payloads(args).items():
+        print(f"encode {name}...", file=sys.stderr)
+        results.extend(bench_payload(name, content, args))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
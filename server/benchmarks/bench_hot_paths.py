@@ -0,0 +1,235 @@
+"""
+Microbenchmarks for the player hot paths.
+
+Measures latency and allocations for:
+  - PlayerSearchService.search against synthetic catalogs (1k-1M players)
+  - PlayerSearchService.search_batch (a 40-name roster) against the same catalogs
+  - PlayerSearchService.get_player_detail, uncached (Firestore read through the
+    guard plus document -> PlayerDetail construction) and from the detail cache
+  - SavedPlayer validation
+
+Results are written as JSON so they can be compared across commits:
+
+    python benchmarks/bench_hot_paths.py --sizes 1000,10000,100000 --output results.json
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from benchmarks.catalog import make_catalog, make_queries
+from benchmarks.local_store import LocalFirestore
+from models.players import SavedPlayer
+from services.player_search_service import PlayerSearchService
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def measure(fn: Callable[[int], None], min_iterations: int, min_seconds: float) -> Dict:
+    """
+    Time `fn(i)` repeatedly, then run one traced pass for allocations.
+
+    Latency runs without tracemalloc (it slows allocation-heavy code several
+    times over); allocations are measured on a separate pass of the same calls.
+    """
+    fn(0)  # warm-up
+
+    timings = []
+    start = time.perf_counter()
+    i = 0
+    while i < min_iterations or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - t0)
+        i += 1
+    elapsed = time.perf_counter() - start
+
+    traced = min(len(timings), 200)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    snapshot_before = tracemalloc.take_snapshot()
+    for j in range(traced):
+        fn(j)
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allocated = sum(
+        stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, "filename")
+        if stat.size_diff > 0
+    )
+
+    timings.sort()
+    return {
+        "iterations": len(timings),
+        "ops_per_sec": round(len(timings) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(timings) * 1e3, 4),
+        "p50_ms": round(_percentile(timings, 50) * 1e3, 4),
+        "p95_ms": round(_percentile(timings, 95) * 1e3, 4),
+        "p99_ms": round(_percentile(timings, 99) * 1e3, 4),
+        "max_ms": round(timings[-1] * 1e3, 4),
+        "alloc_peak_kib": round((peak - before) / 1024, 2),
+        "alloc_retained_kib_per_op": round(allocated / traced / 1024, 3),
+    }
+
+
+def bench_search(size: int, loop: asyncio.AbstractEventLoop, args) -> List[Dict]:
+    catalog = make_catalog(size, seed=args.seed, with_stats=False)
+    queries = make_queries(catalog, 500, seed=args.seed + 1)
+
+    service = PlayerSearchService()
+    service.db = LocalFirestore()
+    service.db.load_players(catalog)
+    del catalog
+
+    t0 = time.perf_counter()
+    loop.run_until_complete(service._load_database())
+    load_seconds = time.perf_counter() - t0
+
+    result = measure(
+        lambda i: loop.run_until_complete(service.search(queries[i % len(queries)])),
+        min_iterations=args.min_iterations,
+        min_seconds=args.min_seconds,
+    )
+    roster_size = 40
+    batch = measure(
+        lambda i: loop.run_until_complete(service.search_batch(
+            [queries[(i * roster_size + j) % len(queries)] for j in range(roster_size)]
+        )),
+        min_iterations=max(1, args.min_iterations // 10),
+        min_seconds=args.min_seconds,
+    )
+    return [
+        {"benchmark": "search.load_database", "catalog_size": size, "seconds": round(load_seconds, 4)},
+        {"benchmark": "search", "catalog_size": size, **result},
+        {"benchmark": "search_batch", "catalog_size": size, "queries": roster_size, **batch},
+    ]
+
+
+def bench_player_detail(loop: asyncio.AbstractEventLoop, args) -> List[Dict]:
+    service = PlayerSearchService()
+    service.db = LocalFirestore()
+    catalog = make_catalog(1_000, seed=args.seed, with_stats=True)
+    service.db.load_players(catalog)
+    ids = [p["mlbam_id"] for p in catalog]
+
+    # Bypasses _detail_cache, so every iteration reads and builds a PlayerDetail
+    uncached = measure(
+        lambda i: loop.run_until_complete(service._fetch_player_detail(ids[i % len(ids)])),
+        min_iterations=args.min_iterations,
+        min_seconds=args.min_seconds,
+    )
+    for player_id in ids:
+        loop.run_until_complete(service.get_player_detail(player_id))
+    cached = measure(
+        lambda i: loop.run_until_complete(service.get_player_detail(ids[i % len(ids)])),
+        min_iterations=args.min_iterations,
+        min_seconds=args.min_seconds,
+    )
+    avg_seasons = round(statistics.fmean(len(p["seasons"]) for p in catalog), 2)
+    return [
+        {"benchmark": "get_player_detail.uncached", "avg_seasons": avg_seasons, **uncached},
+        {"benchmark": "get_player_detail.cached", "avg_seasons": avg_seasons, **cached},
+    ]
+
+
+def bench_saved_player(args) -> Dict:
+    rng = random.Random(args.seed)
+    catalog = make_catalog(1_000, seed=args.seed, with_stats=False)
+    payloads = [
+        {
+            "id": p["mlbam_id"],
+            "name": p["name"],
+            "image_url": f"https://img.mlbstatic.com/{p['mlbam_id']}.png",
+            "years_active": f"{min(p['seasons'])}-{max(p['seasons'])}",
+            "score": rng.uniform(60, 100),
+        }
+        for p in catalog
+    ]
+
+    result = measure(
+        lambda i: SavedPlayer(**payloads[i % len(payloads)]),
+        min_iterations=args.min_iterations * 10,
+        min_seconds=args.min_seconds,
+    )
+    return {"benchmark": "saved_player_validation", **result}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark player search hot paths")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated catalog sizes for the search benchmark")
+    parser.add_argument("--min-iterations", type=int, default=50)
+    parser.add_argument("--min-seconds", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    loop = asyncio.new_event_loop()
+    results = []
+
+    for size in sizes:
+        print(f"search: catalog of {size} players...", file=sys.stderr)
+        results.extend(bench_search(size, loop, args))
+
+    print("get_player_detail...", file=sys.stderr)
+    results.extend(bench_player_detail(loop, args))
+
+    print("SavedPlayer validation...", file=sys.stderr)
+    results.append(bench_saved_player(args))
+
+    loop.close()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Projection benchmark on full-history catalogs.
+
+Builds synthetic catalogs spanning 1871-2025 (about 20k hitters is the size
+of real MLB history) and measures:
+  - project_players over every player's seasons (the vectorized Marcel pass)
+  - run_projections against the in-memory store: projected read of the last
+    three seasons, projection, and diffing against stored projections (the
+    warm-up run writes them; timed runs find nothing changed)
+  - PlayerSearchService.leaderboard on the index built from the result
+
+    python benchmarks/bench_projections.py --sizes 20000,100000 --output projections.json
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import platform
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks.bench_hot_paths import _git_commit, measure
+from benchmarks.catalog import iter_players
+from benchmarks.local_store import LocalFirestore
+from scripts.projections import project_players, run_projections
+from services.player_search_service import PlayerSearchService
+
+FIRST_SEASON = 1871
+LAST_SEASON = 2025
+
+
+def bench_size(size: int, args) -> List[Dict]:
+    catalog = list(iter_players(size, seed=args.seed, first_year=FIRST_SEASON, last_year=LAST_SEASON))
+    seasons = [player["seasons"] for player in catalog]
+    target = LAST_SEASON + 1
+    projected = sum(projection is not None for projection in project_players(seasons, target))
+    meta = {"catalog_size": size, "projected": projected,
+            "player_seasons": sum(len(player_seasons) for player_seasons in seasons)}
+
+    results = [{"case": "project_players", **meta,
+                **measure(lambda i, seasons=seasons: project_players(seasons, target), args.min_iterations, args.min_seconds)}]
+
+    store = LocalFirestore()
+    store.load_players(catalog)
+    del catalog, seasons
+    results.append({"case": "run_projections", **meta,
+                    **measure(lambda i: run_projections(store, target), args.min_iterations, args.min_seconds)})
+
+    service = PlayerSearchService()
+    service.db = store
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(service.leaderboard())  # builds the index
+        results.append({"case": "leaderboard", **meta, **measure(
+            lambda i: loop.run_until_complete(service.leaderboard("projected_score", 25)),
+            args.min_iterations, args.min_seconds,
+        )})
+    finally:
+        loop.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark next-season projections on full-history catalogs")
+    parser.add_argument("--sizes", default="20000", help="Comma-separated catalog sizes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-iterations", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=2.0)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"{size} players...", file=sys.stderr)
+        results.extend(bench_size(size, args))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seasons": f"{FIRST_SEASON}-{LAST_SEASON}",
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
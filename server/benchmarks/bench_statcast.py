@@ -0,0 +1,154 @@
+"""
+Statcast store benchmark: staging a season of pitches and aggregating it.
+
+Stages synthetic statcast-shaped pitches (make_pitch_frame: no network) for
+`--days` game days through scripts/statcast.py, then measures
+StatcastStore.aggregate:
+  - a full season for every batter, with and without a split
+  - a full season, a month and two weeks for one batter (partition pruning
+    plus the batter filter)
+
+    python benchmarks/bench_statcast.py --days 186 --pitches-per-day 4000 --output statcast.json
+
+Peak RSS is reported after all cases; the full season is never loaded at once.
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import contextlib
+import json
+import platform
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.bench_hot_paths import _git_commit, measure
+from scripts.backfill import _peak_rss_mb
+from scripts.statcast import StatcastIngest
+from utils.statcast import StatcastStore
+
+OPENING_DAY = date(2024, 3, 28)
+FIRST_BATTER_ID = 600_000
+
+_PITCH_TYPES = ["FF", "SI", "SL", "CH", "CU", "FC", "ST"]
+_OUTCOMES = ["field_out", "single", "double", "triple", "home_run", "grounded_into_double_play"]
+_OUTCOME_P = [0.62, 0.22, 0.07, 0.01, 0.05, 0.03]
+_WOBA_VALUE = {"single": 0.88, "double": 1.25, "triple": 1.6, "home_run": 2.0, "walk": 0.69}
+
+
+def make_pitch_frame(start: date, end: date, batters: int = 600, pitches_per_day: int = 4000, seed: int = 42):
+    """statcast-shaped frame: `pitches_per_day` pitches on every date from start to end, `batters` hitters"""
+    import pandas as pd
+
+    frames = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        rng = np.random.default_rng(seed + day.toordinal())
+        n = pitches_per_day
+        kind = rng.choice(["B", "S", "X"], n, p=[0.36, 0.46, 0.18])
+        strike = rng.choice(["called_strike", "swinging_strike", "foul", "foul_tip"], n, p=[0.35, 0.25, 0.36, 0.04])
+        description = np.where(kind == "B", "ball", np.where(kind == "X", "hit_into_play", strike))
+
+        events = np.full(n, None, dtype=object)
+        in_play = kind == "X"
+        events[in_play] = rng.choice(_OUTCOMES, int(in_play.sum()), p=_OUTCOME_P)
+        # Roughly one pitch in ten ends a plate appearance without a ball in play
+        ends = rng.random(n) < 0.1
+        events[ends & (kind == "B")] = "walk"
+        events[ends & (kind == "S") & (description != "foul")] = "strikeout"
+
+        speed = np.where(in_play, rng.normal(89, 14, n).clip(30, 120), np.nan)
+        angle = np.where(in_play, rng.normal(12, 26, n).clip(-80, 85), np.nan)
+        barrel = (speed >= 98) & (angle >= 8) & (angle <= 32)
+        speed_angle = np.where(in_play, np.where(barrel, 6, rng.integers(1, 6, n)), np.nan)
+        woba_value = np.array([_WOBA_VALUE.get(event, 0.0) if event else np.nan for event in events])
+        expected = np.where(in_play, (speed_angle / 6) ** 2 * 1.4, np.nan)
+
+        frames.append(pd.DataFrame({
+            "pitch_type": rng.choice(_PITCH_TYPES, n),
+            "game_date": pd.Timestamp(day),
+            "batter": FIRST_BATTER_ID + rng.integers(0, batters, n),
+            "pitcher": 500_000 + rng.integers(0, batters // 2, n),
+            "events": events,
+            "description": description,
+            "stand": rng.choice(["L", "R"], n, p=[0.4, 0.6]),
+            "p_throws": rng.choice(["L", "R"], n, p=[0.3, 0.7]),
+            "type": kind,
+            "inning_topbot": rng.choice(["Top", "Bot"], n),
+            "launch_speed": speed.round(1),
+            "launch_angle": angle.round(0),
+            "launch_speed_angle": speed_angle,
+            "estimated_woba_using_speedangle": expected.round(3),
+            "woba_value": woba_value,
+            "woba_denom": np.where(pd.notna(events), 1.0, np.nan),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the date-partitioned Statcast store")
+    parser.add_argument("--days", type=int, default=186, help="Game days staged (186 is a regular season)")
+    parser.add_argument("--pitches-per-day", type=int, default=4000)
+    parser.add_argument("--batters", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-iterations", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=2.0)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    end = OPENING_DAY + timedelta(days=args.days - 1)
+    batter = FIRST_BATTER_ID + 7
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory() as root:
+        store = StatcastStore(root)
+        ingest = StatcastIngest(
+            store, recent_days=0,
+            fetch=lambda first, last: make_pitch_frame(first, last, args.batters, args.pitches_per_day, args.seed),
+        )
+        began = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stderr):  # Progress lines, kept out of the JSON report
+            staged = ingest.run(OPENING_DAY, end)
+        meta = {"pitches": staged["pitches"], "game_days": staged["game_days"],
+                "disk_mb": round(sum(f.stat().st_size for f in Path(root).rglob("*.parquet")) / 2**20, 1)}
+        results.append({"case": "ingest", **meta, "seconds": round(time.perf_counter() - began, 3)})
+
+        cases = {
+            "season_all_batters": dict(),
+            "season_all_batters_by_month": dict(split="month"),
+            "season_one_batter": dict(batters=[batter]),
+            "season_one_batter_by_pitcher_hand": dict(batters=[batter], split="pitcher_hand"),
+            "month_one_batter": dict(start=end - timedelta(days=29), batters=[batter]),
+            "two_weeks_one_batter": dict(start=end - timedelta(days=13), batters=[batter]),
+        }
+        for case, query in cases.items():
+            query = {"start": OPENING_DAY, "end": end, **query}
+            results.append({"case": case, **meta, "rows": len(store.aggregate(**query)),
+                            **measure(lambda i: store.aggregate(**query), args.min_iterations, args.min_seconds)})
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pitches_per_day": args.pitches_per_day,
+            "batters": args.batters,
+            "peak_rss_mb": _peak_rss_mb(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Synthetic player catalogs for benchmarks.
+
+Names are drawn from Zipf-weighted pools of real MLB first names and surnames,
+so common names ("Jose", "Rodriguez", "Smith") repeat at roughly the rate they
+do in the real player registry, and a share of names carry accents, suffixes,
+initials or hyphenated surnames. Season lines follow the shape written by
+scripts/get_players.py, including the materialized aggregates when stats are generated.
+"""
+import random
+from typing import Dict, Iterator, List
+
+from scripts.aggregates import compute_aggregates
+
+FIRST_NAMES = [
+    "Jose", "Luis", "Juan", "Carlos", "Mike", "John", "Chris", "Matt", "Ryan", "Josh",
+    "David", "Jason", "Alex", "Daniel", "Kevin", "Brandon", "Tyler", "Nick", "Justin", "Jake",
+    "Miguel", "Pedro", "Rafael", "Francisco", "Ángel", "Andrés", "Víctor", "Yordan", "Vladimir", "Ronald",
+    "Shohei", "Seiya", "Masataka", "Yoshinobu", "Ha-Seong", "Jung Hoo", "Aaron", "Mookie", "Freddie", "Bryce",
+    "Corey", "Kyle", "Trea", "Bobby", "Gunnar", "Adley", "Julio", "Elly", "Jazz", "CJ",
+    "J.D.", "A.J.", "J.P.", "T.J.", "Ke'Bryan", "Ji Hwan", "Wander", "Xander", "Giancarlo", "Yadier",
+    "Salvador", "Marcell", "Anthony", "William", "Andrew", "Thomas", "Patrick", "Sean", "Zach", "Austin",
+]
+
+SURNAMES = [
+    "Rodriguez", "Martinez", "Garcia", "Hernandez", "Gonzalez", "Perez", "Smith", "Johnson", "Williams", "Brown",
+    "Jones", "Miller", "Davis", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "White",
+    "Peña", "Muñoz", "Báez", "Núñez", "Acuña", "Suárez", "Ohtani", "Suzuki", "Yoshida", "Yamamoto",
+    "Kim", "Lee", "Judge", "Betts", "Freeman", "Harper", "Seager", "Tucker", "Turner", "Witt",
+    "Henderson", "Rutschman", "De La Cruz", "Chisholm", "Guerrero", "Tatis", "Soto", "Alvarez", "Ramirez", "Machado",
+    "Santana", "Ortiz", "Cruz", "Reyes", "Torres", "Castillo", "Vargas", "Rosario", "Franco", "Bogaerts",
+    "Stanton", "Molina", "Ozuna", "Realmuto", "Goldschmidt", "Arenado", "Trout", "Kiner-Falefa", "Hayes", "Crow-Armstrong",
+]
+
+SUFFIXES = ["Jr.", "Sr.", "II", "III"]
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BOS", "CHC", "CIN", "CLE", "COL", "CHW", "DET",
+    "HOU", "KCR", "LAA", "LAD", "MIA", "MIL", "MIN", "NYM", "NYY", "OAK",
+    "PHI", "PIT", "SDP", "SEA", "SFG", "STL", "TBR", "TEX", "TOR", "WSN",
+]
+
+
+def _zipf_weights(n: int, s: float = 1.07) -> List[float]:
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+class NameGenerator:
+    """Draws realistic, frequently repeating player names"""
+
+    def __init__(self, seed: int = 0):
+        self._rng = random.Random(seed)
+        self._first_weights = _zipf_weights(len(FIRST_NAMES))
+        self._last_weights = _zipf_weights(len(SURNAMES))
+
+    def name(self) -> str:
+        rng = self._rng
+        first = rng.choices(FIRST_NAMES, weights=self._first_weights)[0]
+        last = rng.choices(SURNAMES, weights=self._last_weights)[0]
+
+        roll = rng.random()
+        if roll < 0.06:
+            # Compound Latin surname, e.g. "Luis Garcia Martinez"
+            last = f"{last} {rng.choices(SURNAMES, weights=self._last_weights)[0]}"
+        elif roll < 0.09:
+            last = f"{last} {rng.choice(SUFFIXES)}"
+        return f"{first} {last}"
+
+    def names(self, count: int) -> List[str]:
+        return [self.name() for _ in range(count)]
+
+
+def typo(name: str, rng: random.Random) -> str:
+    """Apply one realistic typing mistake (drop, swap or replace a character)"""
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.random()
+    if kind < 0.33:
+        return name[:i] + name[i + 1:]
+    if kind < 0.66:
+        return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+    return name[:i] + rng.choice("aeiourstln") + name[i + 1:]
+
+
+def season_line(rng: random.Random, team: str) -> Dict:
+    """Generate one season of stats shaped like scripts/get_players.py output"""
+    pa = rng.randint(50, 720)
+    ab = int(pa * rng.uniform(0.86, 0.92))
+    hits = int(ab * rng.uniform(0.18, 0.32))
+    doubles = int(hits * rng.uniform(0.15, 0.25))
+    triples = int(hits * rng.uniform(0.0, 0.03))
+    home_runs = int(hits * rng.uniform(0.02, 0.25))
+    singles = max(hits - doubles - triples - home_runs, 0)
+    walks = int(pa * rng.uniform(0.04, 0.16))
+    strikeouts = int(pa * rng.uniform(0.10, 0.33))
+    avg = hits / ab if ab else 0.0
+    obp = (hits + walks) / pa if pa else 0.0
+    slg = (singles + 2 * doubles + 3 * triples + 4 * home_runs) / ab if ab else 0.0
+    has_statcast = rng.random() < 0.8
+
+    return {
+        "games": min(162, int(pa / rng.uniform(3.6, 4.4))),
+        "plate_appearances": pa,
+        "at_bats": ab,
+        "hits": hits,
+        "singles": singles,
+        "doubles": doubles,
+        "triples": triples,
+        "home_runs": home_runs,
+        "runs": int(pa * rng.uniform(0.08, 0.18)),
+        "rbi": int(pa * rng.uniform(0.07, 0.2)),
+        "walks": walks,
+        "strikeouts": strikeouts,
+        "stolen_bases": rng.randint(0, 40),
+        "caught_stealing": rng.randint(0, 10),
+        "batting_average": round(avg, 3),
+        "on_base_percentage": round(obp, 3),
+        "slugging_percentage": round(slg, 3),
+        "ops": round(obp + slg, 3),
+        "isolated_power": round(slg - avg, 3),
+        "babip": round(rng.uniform(0.22, 0.36), 3),
+        "walk_rate": round(walks / pa, 3),
+        "strikeout_rate": round(strikeouts / pa, 3),
+        "bb_k_ratio": round(walks / strikeouts, 2) if strikeouts else 0.0,
+        "woba": round(rng.uniform(0.24, 0.42), 3),
+        "wrc_plus": float(rng.randint(40, 190)),
+        "war": round(rng.uniform(-1.5, 9.0), 1),
+        "off": round(rng.uniform(-20, 60), 1),
+        "def": round(rng.uniform(-15, 15), 1),
+        "base_running": round(rng.uniform(-5, 8), 1),
+        "hard_hit_rate": round(rng.uniform(0.25, 0.55), 3) if has_statcast else None,
+        "barrel_rate": round(rng.uniform(0.02, 0.2), 3) if has_statcast else None,
+        "avg_exit_velocity": round(rng.uniform(84, 95), 1) if has_statcast else None,
+        "avg_launch_angle": round(rng.uniform(4, 22), 1) if has_statcast else None,
+        "team_abbrev": team,
+    }
+
+
+def iter_players(
+    size: int,
+    seed: int = 0,
+    with_stats: bool = True,
+    first_year: int = 2015,
+    last_year: int = 2024,
+) -> Iterator[Dict]:
+    """
+    Yield `size` player documents shaped like the Firestore `players` collection.
+
+    With `with_stats=False` each season maps to an empty dict, which keeps
+    million-player catalogs small enough for search benchmarks while
+    preserving season years.
+    """
+    rng = random.Random(seed)
+    names = NameGenerator(seed)
+    span = last_year - first_year + 1
+
+    for i in range(size):
+        team = rng.choice(TEAMS)
+        career_length = max(1, min(span, int(rng.expovariate(1 / 4)) + 1))
+        last = last_year - rng.randrange(0, span - career_length + 1)
+        first = last - career_length + 1
+
+        # Not drawn from `rng`, so the rest of the catalog stays reproducible
+        debut_age = 20 + (i * 7) % 10
+        seasons = {}
+        for year in range(first, last + 1):
+            if rng.random() < 0.1 and year not in (first, last):
+                continue  # Missed season (injury, minors)
+            seasons[str(year)] = season_line(rng, team) if with_stats else {}
+            if with_stats:
+                seasons[str(year)]["age"] = debut_age + year - first
+
+        most_recent = seasons[max(seasons)]
+        player = {
+            "mlbam_id": 400000 + i,
+            "fangraphs_id": 10000 + i,
+            "name": names.name(),
+            "team_abbrev": team,
+            "overall_score": most_recent.get("wrc_plus", float(rng.randint(40, 190))),
+            "season_years": sorted(int(year) for year in seasons),
+            "career_pa": sum(line.get("plate_appearances", 0) for line in seasons.values())
+            if with_stats else rng.randint(1, 700) * len(seasons),
+            "seasons": seasons,
+        }
+        if with_stats:
+            player.update(compute_aggregates([seasons])[0])
+        yield player
+
+
+def make_catalog(size: int, seed: int = 0, with_stats: bool = True) -> List[Dict]:
+    """Materialize a synthetic catalog as a list of player documents"""
+    return list(iter_players(size, seed=seed, with_stats=with_stats))
+
+
+def make_queries(catalog: List[Dict], count: int, seed: int = 1) -> List[str]:
+    """
+    Build a realistic search workload from catalog names: full names, surnames,
+    typeahead prefixes and misspellings.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        name = catalog[rng.randrange(len(catalog))]["name"]
+        kind = rng.random()
+        if kind < 0.3:
+            queries.append(name)
+        elif kind < 0.5:
+            queries.append(name.split()[-1])
+        elif kind < 0.8:
+            queries.append(name[:rng.randint(3, max(3, len(name) - 1))])
+        else:
+            queries.append(typo(name, rng))
+    return queries
@@ -0,0 +1,154 @@
+"""
+Storage fault-injection run for the resilience layer (utils/resilience.py).
+
+Drives `benchmarks.load_app:app` in-process with concurrent detail and
+saved-player requests while the in-memory store injects latency and errors,
+one scenario after another, and reports per scenario the status codes,
+p50/p99 latency, and what the guard did (retries, rejections, hedges,
+stale fallbacks, final breaker state):
+
+    python benchmarks/fault_injection.py --users 20 --duration 5 --output faults.json
+
+Scenarios run in order, so `outage` shows the breaker opening and
+`recovery` shows it closing again after CIRCUIT_RESET_SECONDS.
+"""
+import os
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Rate limits would shed this synthetic traffic before it reaches storage
+os.environ.setdefault("RATE_LIMIT_PER_SECOND", "0")
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.bench_hot_paths import _git_commit, _percentile
+
+SCENARIOS = [
+    ("healthy", {}),
+    ("latency_tail", {"latency": 0.002, "slow_rate": 0.05, "slow_latency": 1.0}),
+    ("brownout", {"latency": 0.002, "error_rate": 0.3}),
+    ("outage", {"error_rate": 1.0}),
+    ("recovery", None),
+]
+
+
+def _guard_counters() -> Dict[str, float]:
+    from utils.resilience import storage_attempts, storage_fallbacks, storage_hedges
+    totals: Dict[str, float] = defaultdict(float)
+    for key, value in storage_attempts._values.items():
+        totals[f"attempts_{key[2]}"] += value
+    for key, value in storage_hedges._values.items():
+        totals[f"hedge_won_by_{key[2]}"] += value
+    for value in storage_fallbacks._values.values():
+        totals["stale_fallbacks"] += value
+    return totals
+
+
+async def _user(client: httpx.AsyncClient, user: int, player_ids: List[int], stop_at: float,
+                latencies: List[float], statuses: Dict[int, int]) -> None:
+    rng = random.Random(user)
+    headers = {"Authorization": f"Bearer bench-user-{user}"}
+    while time.monotonic() < stop_at:
+        if rng.random() < 0.8:
+            request = client.get(f"/api/players/{rng.choice(player_ids)}/detail")
+        else:
+            request = client.get("/api/players/saved", headers=headers)
+        start = time.perf_counter()
+        response = await request
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] += 1
+
+
+async def run(args) -> List[Dict]:
+    from benchmarks.load_app import app, store
+    from config.settings import settings
+    from services import player_search_service
+    from utils.resilience import firestore_guard
+
+    settings.PLAYER_DETAIL_HEDGE_AFTER = args.hedge_after
+
+    player_ids = [int(doc_id) for doc_id in list(store._collections["players"])[:args.players]]
+    results = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        # Warm a slice of the detail cache so stale fallbacks have something to serve
+        for player_id in player_ids[: len(player_ids) // 2]:
+            await client.get(f"/api/players/{player_id}/detail")
+        player_search_service._detail_cache.ttl = args.detail_ttl
+
+        for name, plan in SCENARIOS:
+            if plan is None:
+                store.clear_faults()
+                await asyncio.sleep(firestore_guard.breaker.reset_timeout)
+            else:
+                store.inject(seed=args.seed, **plan)
+            print(f"{name}...", file=sys.stderr)
+
+            before = _guard_counters()
+            latencies: List[float] = []
+            statuses: Dict[int, int] = defaultdict(int)
+            stop_at = time.monotonic() + args.duration
+            await asyncio.gather(*(
+                _user(client, user, player_ids, stop_at, latencies, statuses) for user in range(args.users)
+            ))
+            after = _guard_counters()
+            latencies.sort()
+            results.append({
+                "scenario": name,
+                "fault_plan": plan,
+                "requests": len(latencies),
+                "statuses": dict(sorted(statuses.items())),
+                "p50_ms": round(_percentile(latencies, 50), 3),
+                "p99_ms": round(_percentile(latencies, 99), 3),
+                "guard": {key: after[key] - before.get(key, 0.0) for key in after if after[key] - before.get(key, 0.0)},
+                "breaker_state": firestore_guard.breaker.state,
+            })
+    store.clear_faults()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exercise storage timeouts, retries and the circuit breaker")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario")
+    parser.add_argument("--players", type=int, default=500, help="Distinct players requested")
+    parser.add_argument("--detail-ttl", type=float, default=1.0, help="Detail cache TTL during the run")
+    parser.add_argument("--hedge-after", type=float, default=0.0,
+                        help="Hedge detail reads after this many seconds (0 = off)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "users": args.users,
+            "duration": args.duration,
+            "hedge_after": args.hedge_after,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote {len(results)} scenarios to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+`main:app` wired to the in-memory Firestore stand-in for load testing.
+
+Seeds a synthetic catalog and replaces Firebase token verification with a stub
+that accepts `Authorization: Bearer <user_id>`, so saved-player routes can be
+driven without real accounts. Run under uvicorn:
+
+    LOADTEST_CATALOG_SIZE=5000 uvicorn benchmarks.load_app:app
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import os
+
+from fastapi import Header, HTTPException, status
+
+from benchmarks.catalog import make_catalog
+from benchmarks.local_store import LocalFirestore
+from config.firebase import firebase_service
+from main import app
+from middleware.auth import get_current_user
+from services.auth_service import auth_service
+from scripts.aggregates import build_season_tables
+from scripts.projections import run_projections
+
+CATALOG_SIZE = int(os.getenv("LOADTEST_CATALOG_SIZE", 5000))
+CATALOG_SEED = int(os.getenv("LOADTEST_SEED", 42))
+
+store = LocalFirestore()
+catalog = make_catalog(CATALOG_SIZE, seed=CATALOG_SEED)
+store.load_players(catalog)
+tables = build_season_tables(catalog)
+for year, table in tables.items():
+    store.collection("season_stats").document(year).set(table)
+run_projections(store, max(int(year) for year in tables) + 1)
+del catalog, tables
+
+# Every service resolves its database through firebase_service, so Firestore is never initialized
+firebase_service.use(store)
+
+
+async def stub_current_user(authorization: str = Header(None)) -> str:
+    """Accept any `Bearer <user_id>` header; the token is the user id"""
+    parts = (authorization or "").split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authorization header missing"
+        )
+    # As verify_token does, so these users get the admission priority lane
+    auth_service.remember_verified(parts[1])
+    return parts[1]
+
+
+app.dependency_overrides[get_current_user] = stub_current_user
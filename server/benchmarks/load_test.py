@@ -0,0 +1,278 @@
+"""
+End-to-end load test for a single uvicorn worker.
+
+Starts `benchmarks.load_app:app` (main:app on the in-memory store) in one
+uvicorn worker, replays a mix of virtual-user sessions against it and reports
+throughput and p50/p95/p99 latency per route, checked against latency SLOs:
+
+    python benchmarks/load_test.py --users 50 --duration 60 --output load.json
+
+Sessions:
+  - typeahead: types a player name one character at a time against /search
+  - detail:    opens /{player_id}/detail for a few players
+  - saved:     authenticated add / list / get / delete of saved players
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_hot_paths import _git_commit, _percentile
+from benchmarks.catalog import iter_players, typo
+
+SERVER_DIR = Path(__file__).parent.parent
+
+# Default p99 SLOs (ms) per route; override with --slo route=ms
+DEFAULT_SLOS = {
+    "GET /api/players/search": 150.0,
+    "GET /api/players/{player_id}/detail": 100.0,
+    "POST /api/players/saved": 100.0,
+    "GET /api/players/saved": 100.0,
+    "GET /api/players/saved/{player_id}": 100.0,
+    "DELETE /api/players/saved/{player_id}": 100.0,
+}
+
+
+class Recorder:
+    """Collects latencies per route template"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    async def request(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        t0 = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            if self.recording:
+                self.errors[route] += 1
+            return None
+        elapsed = time.perf_counter() - t0
+
+        if self.recording:
+            self.latencies[route].append(elapsed)
+            self.statuses[route][response.status_code] += 1
+            if response.status_code >= 500:
+                self.errors[route] += 1
+        return response
+
+
+class Workload:
+    def __init__(self, args):
+        players = list(iter_players(args.catalog_size, seed=args.seed, with_stats=False))
+        self.names = [p["name"] for p in players]
+        self.ids = [p["mlbam_id"] for p in players]
+        self.think = args.think_ms / 1000
+        self.mix = [("typeahead", args.typeahead_weight), ("detail", args.detail_weight), ("saved", args.saved_weight)]
+
+    async def typeahead(self, client, rec: Recorder, rng: random.Random) -> None:
+        name = rng.choice(self.names)
+        if rng.random() < 0.2:
+            name = typo(name, rng)
+        # Client debounce lets roughly every other keystroke through
+        for end in range(3, len(name) + 1, 2):
+            await rec.request(client, "GET /api/players/search", "GET", "/api/players/search", params={"q": name[:end]})
+            await asyncio.sleep(rng.uniform(0.05, 0.15))
+
+    async def detail(self, client, rec: Recorder, rng: random.Random) -> None:
+        for _ in range(rng.randint(1, 3)):
+            player_id = rng.choice(self.ids)
+            await rec.request(client, "GET /api/players/{player_id}/detail", "GET", f"/api/players/{player_id}/detail")
+            await asyncio.sleep(self.think * rng.uniform(0.5, 1.5))
+
+    async def saved(self, client, rec: Recorder, rng: random.Random, user_id: str) -> None:
+        headers = {"Authorization": f"Bearer {user_id}"}
+        i = rng.randrange(len(self.ids))
+        player = {"id": self.ids[i], "name": self.names[i], "years_active": "2015-2024"}
+
+        await rec.request(client, "POST /api/players/saved", "POST", "/api/players/saved", json=player, headers=headers)
+        await rec.request(client, "GET /api/players/saved", "GET", "/api/players/saved", headers=headers)
+        await rec.request(client, "GET /api/players/saved/{player_id}", "GET", f"/api/players/saved/{player['id']}", headers=headers)
+        if rng.random() < 0.5:
+            await rec.request(client, "DELETE /api/players/saved/{player_id}", "DELETE", f"/api/players/saved/{player['id']}", headers=headers)
+
+    async def virtual_user(self, n: int, client: httpx.AsyncClient, rec: Recorder, deadline: float, seed: int) -> None:
+        rng = random.Random(seed + n)
+        user_id = f"loadtest-user-{n}"
+        kinds = [k for k, _ in self.mix]
+        weights = [w for _, w in self.mix]
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights=weights)[0]
+            if kind == "typeahead":
+                await self.typeahead(client, rec, rng)
+            elif kind == "detail":
+                await self.detail(client, rec, rng)
+            else:
+                await self.saved(client, rec, rng, user_id)
+            await asyncio.sleep(self.think * rng.uniform(0.5, 1.5))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args, port: int) -> subprocess.Popen:
+    env = dict(os.environ, LOADTEST_CATALOG_SIZE=str(args.catalog_size), LOADTEST_SEED=str(args.seed))
+    # Every virtual user shares one client address, so per-client rate limits would
+    # measure the limiter rather than the server; set the variable to test them
+    env.setdefault("RATE_LIMIT_PER_SECOND", "0")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.load_app:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", "1",
+         "--log-level", "warning", "--no-access-log"],
+        cwd=SERVER_DIR, env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+
+
+def build_report(rec: Recorder, duration: float, slos: Dict[str, float]) -> Dict:
+    routes = {}
+    for route in sorted(set(rec.latencies) | set(rec.errors)):
+        values = sorted(rec.latencies.get(route, []))
+        p99_ms = _percentile(values, 99) * 1e3
+        slo = slos.get(route)
+        routes[route] = {
+            "requests": len(values),
+            "errors": rec.errors.get(route, 0),
+            "statuses": dict(rec.statuses.get(route, {})),
+            "throughput_rps": round(len(values) / duration, 2),
+            "p50_ms": round(_percentile(values, 50) * 1e3, 2),
+            "p95_ms": round(_percentile(values, 95) * 1e3, 2),
+            "p99_ms": round(p99_ms, 2),
+            "max_ms": round(values[-1] * 1e3, 2) if values else 0.0,
+            "slo_p99_ms": slo,
+            "slo_met": None if slo is None else p99_ms <= slo,
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "total_requests": total,
+        "total_throughput_rps": round(total / duration, 2),
+        "slo_met": all(r["slo_met"] is not False for r in routes.values()),
+        "routes": routes,
+    }
+
+
+def print_report(report: Dict) -> None:
+    header = f"{'route':<42}{'req':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}  SLO"
+    print(header, file=sys.stderr)
+    print("-" * len(header), file=sys.stderr)
+    for route, r in report["routes"].items():
+        slo = "-" if r["slo_met"] is None else ("ok" if r["slo_met"] else f"MISS (<{r['slo_p99_ms']:.0f}ms)")
+        print(f"{route:<42}{r['requests']:>8}{r['errors']:>6}{r['throughput_rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}  {slo}", file=sys.stderr)
+    print(f"\nTotal: {report['total_requests']} requests, {report['total_throughput_rps']} req/s", file=sys.stderr)
+
+
+async def run(args) -> Dict:
+    base_url = args.url
+    server = None
+    if not base_url:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(args, port)
+
+    try:
+        await wait_ready(base_url, timeout=args.startup_timeout)
+        workload = Workload(args)
+        rec = Recorder()
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            # Warm-up (loads the search cache), not recorded
+            warmup_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(
+                workload.virtual_user(n, client, rec, warmup_deadline, args.seed)
+                for n in range(min(args.users, 4))
+            ))
+
+            rec.recording = True
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                workload.virtual_user(n, client, rec, deadline, args.seed) for n in range(args.users)
+            ))
+            elapsed = time.perf_counter() - started
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    slos = dict(DEFAULT_SLOS)
+    for item in args.slo:
+        route, _, ms = item.rpartition("=")
+        slos[route] = float(ms)
+
+    report = build_report(rec, elapsed, slos)
+    report["config"] = {
+        "users": args.users,
+        "duration_s": args.duration,
+        "catalog_size": args.catalog_size,
+        "think_ms": args.think_ms,
+        "mix": {"typeahead": args.typeahead_weight, "detail": args.detail_weight, "saved": args.saved_weight},
+        "target": args.url or "local uvicorn worker (benchmarks.load_app:app)",
+        "commit": _git_commit(),
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test one uvicorn worker")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--catalog-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--think-ms", type=float, default=500.0, help="Mean pause between actions")
+    parser.add_argument("--typeahead-weight", type=float, default=6)
+    parser.add_argument("--detail-weight", type=float, default=3)
+    parser.add_argument("--saved-weight", type=float, default=1)
+    parser.add_argument("--slo", action="append", default=[],
+                        help='p99 SLO override, e.g. --slo "GET /api/players/search=200"')
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+    sys.exit(0 if report["slo_met"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+In-memory stand-in for the Firestore client.
+
+Implements the subset of the google-cloud-firestore API the services use
+(collections, documents, subcollections, get/set/update/delete/stream, select,
+get_all, write batches) so hot paths
+can be benchmarked without network access or credentials.
+
+`LocalFirestore.inject(...)` adds latency and errors to those calls, to
+exercise the storage resilience layer (timeouts, retries, circuit breaker).
+"""
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+class LocalStoreUnavailable(Exception):
+    """Injected failure, standing in for a Firestore ServiceUnavailable/DeadlineExceeded"""
+
+
+class FaultPlan:
+    """
+    Latency and errors applied to LocalFirestore calls.
+    Each call sleeps `latency` seconds (plus `slow_latency` with probability
+    `slow_rate`, a latency tail) and then fails with probability `error_rate`.
+    `operations` limits the plan to some calls ("get", "set", "update",
+    "delete", "stream", "get_all", "commit").
+    """
+
+    def __init__(self, latency: float = 0.0, slow_rate: float = 0.0, slow_latency: float = 0.0,
+                 error_rate: float = 0.0, operations: Optional[List[str]] = None, seed: Optional[int] = None):
+        self.latency = latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.operations = set(operations) if operations is not None else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self, operation: str) -> None:
+        if self.operations is not None and operation not in self.operations:
+            return
+        with self._lock:
+            slow = self._rng.random() < self.slow_rate
+            fail = self._rng.random() < self.error_rate
+        delay = self.latency + (self.slow_latency if slow else 0.0)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise LocalStoreUnavailable(f"Injected failure in {operation}")
+
+
+def _merge(target: Dict, data: Dict) -> None:
+    """Deep-merge `data` into `target` the way set(..., merge=True) merges nested maps"""
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = _copy(value)
+
+
+def _copy(value):
+    """Copy nested dicts/lists the way a Firestore read returns fresh objects"""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _project(data: Dict, field_paths: List[str]) -> Dict:
+    """Keep only the given (possibly dotted) field paths, as a Firestore projection does"""
+    projected: Dict = {}
+    for path in field_paths:
+        value = data
+        for part in path.split("."):
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            _set_path(projected, path, value)
+    return projected
+
+
+def _set_path(target: Dict, path: str, value) -> None:
+    """Set a dotted field path, creating intermediate maps (update() semantics)"""
+    *parents, leaf = path.split(".")
+    for part in parents:
+        child = target.get(part)
+        if not isinstance(child, dict):
+            child = target[part] = {}
+        target = child
+    target[leaf] = _copy(value)
+
+
+class LocalDocumentSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict]):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict]:
+        return _copy(self._data) if self._data is not None else None
+
+
+class LocalDocumentReference:
+    def __init__(self, store: "LocalFirestore", parent: str, doc_id: str):
+        self._store = store
+        self._parent = parent
+        self.id = doc_id
+
+    def _docs(self) -> Dict[str, Dict]:
+        return self._store._collections.setdefault(self._parent, {})
+
+    def collection(self, name: str) -> "LocalCollectionReference":
+        return LocalCollectionReference(self._store, f"{self._parent}/{self.id}/{name}")
+
+    def get(self) -> LocalDocumentSnapshot:
+        self._store._fault("get")
+        return LocalDocumentSnapshot(self.id, self._docs().get(self.id))
+
+    def set(self, data: Dict, merge: bool = False) -> None:
+        self._store._fault("set")
+        self._set(data, merge)
+
+    def _set(self, data: Dict, merge: bool) -> None:
+        docs = self._docs()
+        if merge and self.id in docs:
+            _merge(docs[self.id], data)
+        else:
+            docs[self.id] = _copy(data)
+
+    def update(self, field_updates: Dict) -> None:
+        """Field-level write; keys are dotted field paths and the document must exist"""
+        self._store._fault("update")
+        self._update(field_updates)
+
+    def _update(self, field_updates: Dict) -> None:
+        docs = self._docs()
+        if self.id not in docs:
+            raise KeyError(f"No document to update: {self._parent}/{self.id}")
+        for path, value in field_updates.items():
+            _set_path(docs[self.id], path, value)
+
+    def delete(self) -> None:
+        self._store._fault("delete")
+        self._delete()
+
+    def _delete(self) -> None:
+        self._docs().pop(self.id, None)
+
+
+class LocalWriteBatch:
+    """Buffered writes applied together on commit()"""
+
+    def __init__(self, store: "LocalFirestore"):
+        self._store = store
+        self._writes = []
+
+    def set(self, reference: LocalDocumentReference, data: Dict, merge: bool = False) -> None:
+        self._writes.append(lambda: reference._set(data, merge))
+
+    def update(self, reference: LocalDocumentReference, field_updates: Dict) -> None:
+        self._writes.append(lambda: reference._update(field_updates))
+
+    def delete(self, reference: LocalDocumentReference) -> None:
+        self._writes.append(reference._delete)
+
+    def commit(self) -> None:
+        # One fault check for the whole batch; the buffered writes then apply together
+        self._store._fault("commit")
+        for write in self._writes:
+            write()
+        self._writes = []
+
+
+class LocalCollectionReference:
+    def __init__(self, store: "LocalFirestore", path: str):
+        self._store = store
+        self._path = path
+
+    def document(self, doc_id: str) -> LocalDocumentReference:
+        return LocalDocumentReference(self._store, self._path, doc_id)
+
+    def select(self, field_paths: List[str]) -> "LocalQuery":
+        return LocalQuery(self._store, self._path, field_paths)
+
+    def stream(self) -> Iterator[LocalDocumentSnapshot]:
+        return LocalQuery(self._store, self._path).stream()
+
+
+class LocalQuery:
+    """Query over one collection; supports field projections (dotted paths included)"""
+
+    def __init__(self, store: "LocalFirestore", path: str, field_paths: Optional[List[str]] = None):
+        self._store = store
+        self._path = path
+        self._fields = list(field_paths) if field_paths is not None else None
+
+    def select(self, field_paths: List[str]) -> "LocalQuery":
+        return LocalQuery(self._store, self._path, field_paths)
+
+    def stream(self) -> Iterator[LocalDocumentSnapshot]:
+        self._store._fault("stream")
+        docs = self._store._collections.get(self._path, {})
+        for doc_id, data in list(docs.items()):
+            if self._fields is not None:
+                data = _project(data, self._fields)
+            yield LocalDocumentSnapshot(doc_id, data)
+
+
+class LocalFirestore:
+    """Dictionary-backed Firestore client keyed by collection path, then document id"""
+
+    def __init__(self):
+        self._collections: Dict[str, Dict[str, Dict]] = {}
+        self.faults: Optional[FaultPlan] = None
+
+    def inject(self, **plan) -> FaultPlan:
+        """Apply a FaultPlan (see its arguments) to every following call"""
+        self.faults = FaultPlan(**plan)
+        return self.faults
+
+    def clear_faults(self) -> None:
+        self.faults = None
+
+    def _fault(self, operation: str) -> None:
+        if self.faults is not None:
+            self.faults.apply(operation)
+
+    def collection(self, name: str) -> LocalCollectionReference:
+        return LocalCollectionReference(self, name)
+
+    def get_all(self, references, field_paths: Optional[List[str]] = None) -> Iterator[LocalDocumentSnapshot]:
+        """Batch read; like Firestore, only documents that exist are returned"""
+        self._fault("get_all")
+        for ref in references:
+            data = ref._docs().get(ref.id)
+            if data is None:
+                continue
+            if field_paths is not None:
+                data = _project(data, field_paths)
+            yield LocalDocumentSnapshot(ref.id, data)
+
+    def batch(self) -> LocalWriteBatch:
+        return LocalWriteBatch(self)
+
+    def load_players(self, players) -> int:
+        """Seed the `players` collection from an iterable of player documents"""
+        docs = self._collections.setdefault("players", {})
+        count = 0
+        for player in players:
+            docs[str(player["mlbam_id"])] = player
+            count += 1
+        return count
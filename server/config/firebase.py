@@ -1,27 +1,95 @@
-import firebase_admin
-from firebase_admin import credentials, firestore, auth
+import logging
+import threading
 from .settings import settings
 
+logger = logging.getLogger(__name__)
+
 class FirebaseService:
+    """
+    Firebase Admin SDK clients, created on first use.
+    Importing this module does not import firebase_admin (about a third of the
+    app's import time) or read credentials; the first access to `db` or `auth`
+    does, once, under a lock. The app's lifespan warms it in a worker thread.
+    """
     def __init__(self):
-        self.db = None
-        self.auth = auth
-        self._initialize()
-    
-    def _initialize(self):
-        """Initialize Firebase Admin SDK"""
-        try:
-            if not firebase_admin._apps:
-                cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
-                firebase_admin.initialize_app(cred)
-            self.db = firestore.client()
-        except Exception as e:
-            print(f"Warning: Firebase initialization failed: {e}")
-            print("Make sure to set up your Firebase credentials before running the server.")
-    
+        self._db = None
+        self._auth = None
+        self._app = None
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def initialize(self) -> None:
+        """Initialize Firebase Admin SDK (no-op after the first call)"""
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            try:
+                import firebase_admin
+                from firebase_admin import credentials, firestore, auth
+                self._auth = auth
+                if not firebase_admin._apps:
+                    cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
+                    self._app = firebase_admin.initialize_app(cred)
+                if self._db is None:
+                    self._db = firestore.client()
+            except Exception as e:
+                logger.warning(
+                    "Firebase initialization failed: %s. "
+                    "Make sure to set up your Firebase credentials before running the server.", e
+                )
+            self._initialized = True
+
+    @property
+    def db(self):
+        """Firestore client, or None when Firebase is not configured"""
+        self.initialize()
+        return self._db
+
+    @property
+    def auth(self):
+        """The firebase_admin.auth module, or None when it could not be imported"""
+        self.initialize()
+        return self._auth
+
+    def use(self, db) -> None:
+        """Serve `db` (e.g. an in-memory stand-in) instead of initializing Firestore"""
+        self._db = db
+        self._initialized = True
+
+    def close(self) -> None:
+        """Release the Firebase app created by initialize(), if any (a store set by use() is kept)"""
+        with self._lock:
+            if self._app is None:
+                return
+            import firebase_admin
+            firebase_admin.delete_app(self._app)
+            self._app = None
+            self._db = None
+            self._initialized = False
+
     def is_connected(self) -> bool:
         """Check if Firebase is connected"""
         return self.db is not None
 
-firebase_service = FirebaseService()
 
+class LazyDatabase:
+    """
+    Class attribute for services: resolves to `firebase_service.db` when first
+    read instead of when the service is constructed at import. Assigning
+    `service.db = ...` still overrides it per instance (benchmarks do this).
+    """
+    def __set_name__(self, owner, name):
+        self._name = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        override = instance.__dict__.get(self._name)
+        return override if override is not None else firebase_service.db
+
+    def __set__(self, instance, value):
+        instance.__dict__[self._name] = value
+
+firebase_service = FirebaseService()
@@ -11,8 +11,81 @@ class Settings:
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", 8000))
     
+    # Production serving: worker processes share a memory-mapped player index
+    WORKERS = int(os.getenv("WORKERS", 1))
+    PLAYER_INDEX_PATH = os.getenv("PLAYER_INDEX_PATH")
+    PLAYER_INDEX_CHECK_SECONDS = float(os.getenv("PLAYER_INDEX_CHECK_SECONDS", 30))
+    # Single-process mode: rebuild the in-memory index from Firestore this often (0: only on a forced refresh)
+    PLAYER_INDEX_TTL_SECONDS = float(os.getenv("PLAYER_INDEX_TTL_SECONDS", 3600))
+    
+    # Player detail documents (full season stats) cached per player after first read
+    PLAYER_DETAIL_CACHE_SIZE = int(os.getenv("PLAYER_DETAIL_CACHE_SIZE", 2048))
+    PLAYER_DETAIL_CACHE_TTL = float(os.getenv("PLAYER_DETAIL_CACHE_TTL", 300))
+    
+    # Players fetched (and encoded) per step of a streaming export
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 200))
+    
+    # How often per-season stat tables (percentile ranks) are checked for changes
+    SEASON_TABLES_REFRESH_SECONDS = float(os.getenv("SEASON_TABLES_REFRESH_SECONDS", 600))
+    
+    # Storage resilience: request budget, per-call deadline, retries, circuit breaker, hedging
+    REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", 5.0))
+    STORAGE_CALL_TIMEOUT = float(os.getenv("STORAGE_CALL_TIMEOUT", 2.0))
+    STORAGE_RETRIES = int(os.getenv("STORAGE_RETRIES", 2))  # Extra attempts for idempotent reads
+    STORAGE_RETRY_BACKOFF = float(os.getenv("STORAGE_RETRY_BACKOFF", 0.05))
+    STORAGE_RETRY_BACKOFF_MAX = float(os.getenv("STORAGE_RETRY_BACKOFF_MAX", 0.5))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 10))
+    PLAYER_DETAIL_HEDGE_AFTER = float(os.getenv("PLAYER_DETAIL_HEDGE_AFTER", 0))  # 0 disables hedged detail reads
+    # Per-attempt deadline for the collection scans behind the search index and season tables
+    STORAGE_BULK_TIMEOUT = float(os.getenv("STORAGE_BULK_TIMEOUT", 60))
+    
+    # Scheduled incremental ingest of the current season (run by one API process or scripts/incremental_ingest.py --loop)
+    INGEST_SCHEDULE_ENABLED = os.getenv("INGEST_SCHEDULE_ENABLED", "false").lower() == "true"
+    INGEST_INTERVAL_SECONDS = float(os.getenv("INGEST_INTERVAL_SECONDS", 86400))
+    INGEST_SEASON = int(os.getenv("INGEST_SEASON", 0)) or None  # Default: the active season
+    
+    # Date-partitioned Statcast pitches written by scripts/statcast.py (unset: no Statcast endpoints)
+    STATCAST_DIR = os.getenv("STATCAST_DIR")
+    
+    # Saved-player update streams (SSE)
+    PLAYER_UPDATES_MAX_SUBSCRIBERS = int(os.getenv("PLAYER_UPDATES_MAX_SUBSCRIBERS", 10000))
+    PLAYER_UPDATES_QUEUE_SIZE = int(os.getenv("PLAYER_UPDATES_QUEUE_SIZE", 16))  # Events buffered per connection
+    PLAYER_UPDATES_POLL_SECONDS = float(os.getenv("PLAYER_UPDATES_POLL_SECONDS", 30))  # Refresh check while anyone is subscribed
+    PLAYER_UPDATES_HEARTBEAT_SECONDS = float(os.getenv("PLAYER_UPDATES_HEARTBEAT_SECONDS", 15))
+    
     # CORS
     CORS_ORIGINS = ["http://localhost:3000"]
     
+    # Logging
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_ACCESS = os.getenv("LOG_ACCESS", "true").lower() == "true"
+    
+    # Admission control: per-client rate limits on public endpoints and a global
+    # concurrency limit with a bounded queue (RATE_LIMIT_PER_SECOND=0 disables rate limiting)
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", 64))
+    ADMISSION_RESERVED_PRIORITY = int(os.getenv("ADMISSION_RESERVED_PRIORITY", 8))
+    # Bearer tokens that passed verification within this many seconds get the priority lane
+    AUTH_VERIFIED_CACHE_TTL = float(os.getenv("AUTH_VERIFIED_CACHE_TTL", 300))
+    AUTH_VERIFIED_CACHE_SIZE = int(os.getenv("AUTH_VERIFIED_CACHE_SIZE", 10000))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 128))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 2.0))
+    ADMISSION_RETRY_AFTER = float(os.getenv("ADMISSION_RETRY_AFTER", 1))
+    RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", 10))
+    RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", 30))
+    RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", 100000))
+    TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+    
+    # Metrics
+    EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", 0.5))
+    
+    # Request profiling (disabled unless a token or sample rate is set)
+    PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0.0))
+    PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", 5))
+    PROFILING_MAX_PROFILES = int(os.getenv("PROFILING_MAX_PROFILES", 20))
+    
 settings = Settings()
 
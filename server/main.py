@@ -1,25 +1,122 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from config.firebase import firebase_service
 from config.settings import settings
-from routes import auth_router, health_router, players_router
+from middleware import AdmissionMiddleware, MetricsMiddleware, ProfilingMiddleware, RequestContextMiddleware
+from routes import auth_router, health_router, players_router, metrics_router, profiles_router, teams_router
+from services.ingest_service import ingest_service
+from services.profiling_service import profiling_service
+from utils.logger import setup_logging
+from utils.metrics import monitor_event_loop_lag
 
-# Initialize FastAPI app
-app = FastAPI(title="Cybermetrics API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work and open clients on startup; stop and close them on shutdown"""
+    loop_lag_monitor = asyncio.create_task(monitor_event_loop_lag(settings.EVENT_LOOP_LAG_INTERVAL))
+    
+    # Firebase is initialized lazily; do it here, off the event loop, so the first request doesn't pay for it
+    await asyncio.to_thread(firebase_service.initialize)
+    
+    # Enable in one process only; with --workers, run scripts/incremental_ingest.py --loop instead
+    if settings.INGEST_SCHEDULE_ENABLED:
+        ingest_service.start()
+    try:
+        yield
+    finally:
+        if settings.INGEST_SCHEDULE_ENABLED:
+            await ingest_service.stop()
+        loop_lag_monitor.cancel()
+        firebase_service.close()
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def create_app() -> FastAPI:
+    """
+    Build the API. Importing this module only wires routes and middleware;
+    Firebase clients are created in the lifespan, and heavy libraries
+    (firebase_admin, rapidfuzz, jwt) are imported on first use.
+    """
+    # Structured, non-blocking logging
+    setup_logging()
+    
+    app = FastAPI(title="Cybermetrics API", lifespan=lifespan)
+    
+    # On-demand request profiling (only installed when enabled, so zero overhead otherwise)
+    if profiling_service.enabled:
+        app.add_middleware(ProfilingMiddleware)
+    
+    # Load shedding: rate limits and a bounded concurrency queue, ahead of any route work
+    if settings.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionMiddleware)
+    
+    # Configure CORS (outside admission, so 429/503 rejections carry CORS headers and browsers can read them)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Request ids and structured access logs
+    app.add_middleware(RequestContextMiddleware)
+    
+    # Request latency metrics (outermost, so it times the whole stack)
+    app.add_middleware(MetricsMiddleware)
+    
+    # Include routers
+    app.include_router(health_router)
+    app.include_router(auth_router)
+    app.include_router(players_router)
+    app.include_router(teams_router)
+    app.include_router(metrics_router)
+    app.include_router(profiles_router)
+    
+    return app
 
-# Include routers
-app.include_router(health_router)
-app.include_router(auth_router)
-app.include_router(players_router)
+# `uvicorn main:app` (and every worker in production mode) serves this instance
+app = create_app()
+
+def serve_production(workers: int) -> None:
+    """
+    Run N uvicorn workers that share one player index.
+    The index is built here once, written to a memory-mappable file, and every
+    worker maps that file read-only instead of loading the catalog itself.
+    Everything else in memory is per worker: /metrics, captured profiles and the
+    update streams' follow lists (see "Per-worker state" in the README).
+    """
+    import os
+    import uvicorn
+    from scripts.build_player_index import DEFAULT_INDEX_PATH, build_player_index
+    
+    index_path = settings.PLAYER_INDEX_PATH or DEFAULT_INDEX_PATH
+    try:
+        count = build_player_index(index_path)
+        logging.getLogger(__name__).info("Built shared player index with %d players", count, extra={"path": index_path})
+    except Exception:
+        logging.getLogger(__name__).exception("Could not build shared player index; workers will load it themselves")
+    
+    logging.getLogger(__name__).warning(
+        "Starting %d workers: /metrics, /api/admin/profiles and saved-player update streams are per worker",
+        workers,
+    )
+    
+    # Workers are spawned fresh and read PLAYER_INDEX_PATH from the environment
+    os.environ["PLAYER_INDEX_PATH"] = index_path
+    uvicorn.run("main:app", host=settings.HOST, port=settings.PORT, workers=workers, access_log=False)
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run("main:app", host=settings.HOST, port=settings.PORT, reload=True)
+    
+    parser = argparse.ArgumentParser(description="Run the Cybermetrics API")
+    parser.add_argument("--workers", type=int, default=settings.WORKERS,
+                        help="Worker processes; more than 1 enables production mode (no reload)")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        serve_production(args.workers)
+    else:
+        # Access logs come from RequestContextMiddleware through the logging queue
+        uvicorn.run("main:app", host=settings.HOST, port=settings.PORT, reload=True, access_log=False)
@@ -1,5 +1,9 @@
 from .error_handler import validation_exception_handler, general_exception_handler
 from .auth import get_current_user
+from .admission import AdmissionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .request_context import RequestContextMiddleware
 
-__all__ = ["validation_exception_handler", "general_exception_handler", "get_current_user"]
+__all__ = ["validation_exception_handler", "general_exception_handler", "get_current_user", "AdmissionMiddleware", "MetricsMiddleware", "ProfilingMiddleware", "RequestContextMiddleware"]
 
@@ -0,0 +1,136 @@
+import json
+import math
+import re
+import time
+from typing import Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+from config.settings import settings
+from services.auth_service import auth_service
+from utils.admission import ConcurrencyLimiter, TokenBucketLimiter
+from utils.metrics import metrics
+
+admission_rejections = metrics.counter(
+    "admission_rejections_total",
+    "Requests shed before reaching a route, by reason and request class",
+    ["reason", "request_class"],
+)
+admission_queue_wait = metrics.histogram(
+    "admission_queue_wait_seconds",
+    "Time admitted requests spent waiting for a concurrency slot",
+    ["request_class"],
+)
+admission_in_flight = metrics.gauge(
+    "admission_in_flight",
+    "Requests currently holding a concurrency slot",
+)
+admission_queued = metrics.gauge(
+    "admission_queued",
+    "Requests waiting for a concurrency slot",
+)
+
+# Public, unauthenticated endpoints that get per-client rate limits
+RATE_LIMITED_PATHS = re.compile(
+    r"^/api/(players/(search(/.*)?|export|leaderboard|\d+/(detail|percentiles|statcast))|teams(/[^/]+)?)$"
+)
+# Authenticated endpoints that are admitted ahead of public traffic
+PRIORITY_PATHS = re.compile(r"^/api/players/saved(/.*)?$")
+# Admin endpoints bypass admission so operators can still inspect an overloaded server;
+# long-lived update streams would pin a concurrency slot each and are capped by
+# PLAYER_UPDATES_MAX_SUBSCRIBERS instead
+EXEMPT_PATHS = re.compile(r"^/api/(admin/|players/saved/updates$)")
+
+AUTHORIZATION_HEADER = b"authorization"
+FORWARDED_FOR_HEADER = b"x-forwarded-for"
+
+class AdmissionMiddleware:
+    """
+    Shed load before it reaches the routes.
+    Public search/detail requests are rate limited per client (token bucket);
+    every /api request then needs a slot from a global concurrency limiter with
+    a bounded queue. Saved-player requests with a recently verified token use
+    slots reserved for them and jump the queue. Rejections are immediate 429/503s with Retry-After,
+    so an overloaded server answers quickly instead of queueing without bound.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.rate_limiter: Optional[TokenBucketLimiter] = None
+        if settings.RATE_LIMIT_PER_SECOND > 0:
+            self.rate_limiter = TokenBucketLimiter(
+                settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST, settings.RATE_LIMIT_MAX_CLIENTS
+            )
+        self.limiter = ConcurrencyLimiter(
+            settings.ADMISSION_MAX_CONCURRENCY,
+            settings.ADMISSION_RESERVED_PRIORITY,
+            settings.ADMISSION_MAX_QUEUE,
+            settings.ADMISSION_QUEUE_TIMEOUT,
+        )
+        admission_in_flight.set_callback(lambda: self.limiter.active)
+        admission_queued.set_callback(self.limiter.queued)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith("/api/") or EXEMPT_PATHS.match(path):
+            await self.app(scope, receive, send)
+            return
+
+        priority = bool(PRIORITY_PATHS.match(path)) and self._verified_bearer(scope)
+        request_class = "priority" if priority else "public"
+
+        if self.rate_limiter is not None and RATE_LIMITED_PATHS.match(path):
+            retry_after = self.rate_limiter.take(self._client(scope))
+            if retry_after:
+                admission_rejections.inc(reason="rate_limited", request_class=request_class)
+                await self._reject(send, 429, "Rate limit exceeded", retry_after)
+                return
+
+        start = time.perf_counter()
+        outcome = await self.limiter.acquire(priority)
+        if outcome != "ok":
+            admission_rejections.inc(reason=outcome, request_class=request_class)
+            await self._reject(send, 503, "Server is busy, please retry", settings.ADMISSION_RETRY_AFTER)
+            return
+        admission_queue_wait.observe(time.perf_counter() - start, request_class=request_class)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+    @staticmethod
+    def _verified_bearer(scope: Scope) -> bool:
+        """
+        Whether the request carries a bearer token that recently passed verify_token.
+        Tokens are only verified in the route, after admission, and verifying here would
+        put an auth call in front of load shedding. So a made-up Authorization header is
+        treated as public traffic and cannot take the reserved slots. The trade-off: a
+        signed-in user's first request (or the first after AUTH_VERIFIED_CACHE_TTL) is
+        admitted as public, and later ones get the priority lane.
+        """
+        for name, value in scope["headers"]:
+            if name == AUTHORIZATION_HEADER:
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                return scheme.lower() == "bearer" and bool(token) and auth_service.recently_verified(token.strip())
+        return False
+
+    @staticmethod
+    def _client(scope: Scope) -> str:
+        if settings.TRUST_FORWARDED_FOR:
+            for name, value in scope["headers"]:
+                if name == FORWARDED_FOR_HEADER:
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _reject(send: Send, status_code: int, detail: str, retry_after: float) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 async def validation_exception_handler(request: Request,exc: RequestValidationError):
     """Handle validation errors"""
-    logger.error(f"Validation error: {exc.errors()}")
+    logger.error("Validation error: %s", exc.errors())
     return JSONResponse(
         status_code = status.HTTP_422_UNPROCESSABLE_ENTITY,
         content = {
@@ -18,7 +18,7 @@ async def validation_exception_handler(request: Request,exc: RequestValidationEr
 
 async def general_exception_handler(request: Request,exc: Exception):
     """Handle general exceptions"""
-    logger.error(f"Unexpected error: {str(exc)}")
+    logger.error("Unexpected error: %s", exc, exc_info=exc)
     return JSONResponse(
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
         content = {"detail":"Internal server error"}
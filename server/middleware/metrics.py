@@ -0,0 +1,37 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.metrics import http_request_duration
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template and status.
+    Uses the matched route's path ("/api/players/{player_id}/detail") rather than the
+    raw URL so label cardinality stays bounded.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status_code),
+            )
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services.profiling_service import profiling_service
+from utils.profiler import RequestProfile, RequestSampler, tracking_request_tasks
+from typing import Dict
+
+PROFILE_HEADER = b"x-profile-token"
+
+class ProfilingMiddleware:
+    """
+    Capture a sampling profile for requests that carry the admin profiling header
+    or are picked by the configured sample rate.
+    Only added to the app when profiling is enabled, so it costs nothing otherwise.
+    Counts in-flight requests so each profile records how many shared the event loop.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._in_flight = 0
+        self._recording: Dict[int, RequestProfile] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self._in_flight += 1
+        for profile in self._recording.values():
+            profile.concurrent_requests = max(profile.concurrent_requests, self._in_flight)
+        try:
+            await self._handle(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["path"].startswith("/api/admin/profiles"):
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                token = value.decode("latin-1")
+                break
+
+        if not profiling_service.should_profile(token):
+            await self.app(scope, receive, send)
+            return
+
+        profile = profiling_service.store.new_profile(
+            scope["method"], scope["path"], profiling_service.interval_ms
+        )
+        profile.concurrent_requests = self._in_flight
+        sampler = RequestSampler(profile, threading.get_ident(), asyncio.get_running_loop())
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile.id).encode())
+                ]
+            await send(message)
+
+        self._recording[profile.id] = profile
+        sampler.start()
+        try:
+            with tracking_request_tasks(profile):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            self._recording.pop(profile.id, None)
+            profiling_service.store.add(sampler.stop())
@@ -0,0 +1,68 @@
+import logging
+import time
+import uuid
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config.settings import settings
+from utils.request_context import accept_var, deadline_var, request_id_var
+
+logger = logging.getLogger("access")
+
+REQUEST_ID_HEADER = b"x-request-id"
+ACCEPT_HEADER = b"accept"
+
+class RequestContextMiddleware:
+    """
+    Assign each request an id (reusing an incoming X-Request-ID), expose it to logging
+    through a context variable, echo it on the response and emit a structured access log.
+    Also publishes the Accept header for response content negotiation and the
+    request's deadline (REQUEST_BUDGET_SECONDS from now) for storage timeouts.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = accept = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:128]
+            elif name == ACCEPT_HEADER:
+                accept = value.decode("latin-1")
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        accept_token = accept_var.set(accept)
+        deadline_token = deadline_var.set(time.monotonic() + settings.REQUEST_BUDGET_SECONDS)
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if settings.LOG_ACCESS:
+                route = scope.get("route")
+                logger.info(
+                    "%s %s %d", scope["method"], scope["path"], status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": getattr(route, "path", None),
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    },
+                )
+            request_id_var.reset(token)
+            accept_var.reset(accept_token)
+            deadline_var.reset(deadline_token)
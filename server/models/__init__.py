@@ -1,11 +1,21 @@
 from .auth import LoginRequest, LoginResponse, SignupRequest, SignupResponse
 from .players import (
     PlayerSearchResult,
+    SearchFilters,
+    BatchSearchRequest,
+    BatchSearchResult,
     AddPlayerResponse,
     DeletePlayerResponse,
     SavedPlayer,
-    PlayerDetail
+    HydratedSavedPlayer,
+    PlayerDetail,
+    PlayerPercentiles,
+    Projection,
+    LeaderboardEntry,
+    StatcastAggregate,
+    StatcastSplits
 )
+from .teams import ScoreDistribution, TeamAggregate
 
 __all__ = [
     "LoginRequest",
@@ -13,9 +23,20 @@ __all__ = [
     "SignupRequest",
     "SignupResponse",
     "PlayerSearchResult",
+    "SearchFilters",
+    "BatchSearchRequest",
+    "BatchSearchResult",
     "AddPlayerResponse",
     "DeletePlayerResponse",
     "SavedPlayer",
-    "PlayerDetail"
+    "HydratedSavedPlayer",
+    "PlayerDetail",
+    "PlayerPercentiles",
+    "Projection",
+    "LeaderboardEntry",
+    "StatcastAggregate",
+    "StatcastSplits",
+    "ScoreDistribution",
+    "TeamAggregate"
 ]
 
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional, Dict
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import Optional, Dict, List
 
 class PlayerSearchResult(BaseModel):
     """Player search result from the index"""
@@ -9,6 +10,25 @@ class PlayerSearchResult(BaseModel):
     image_url: str
     years_active: str
 
+class SearchFilters(BaseModel):
+    """Optional restrictions applied before fuzzy matching"""
+    team_abbrev: Optional[str] = None
+    season: Optional[int] = None  # Played in this season
+    min_career_pa: Optional[int] = Field(None, ge=0)
+    min_overall_score: Optional[float] = None
+
+class BatchSearchRequest(BaseModel):
+    """Many names to resolve in one request (e.g. a pasted roster)"""
+    queries: List[str] = Field(..., min_length=1, max_length=100)
+    limit: int = Field(3, ge=1, le=10)
+    score_cutoff: float = Field(60, ge=0, le=100)
+    filters: Optional[SearchFilters] = None
+
+class BatchSearchResult(BaseModel):
+    """Best matches for one query of a batch search"""
+    query: str
+    matches: List[PlayerSearchResult]
+
 class AddPlayerResponse(BaseModel):
     """Response after adding a player"""
     message: str
@@ -73,12 +93,106 @@ class SeasonStats(BaseModel):
     avg_exit_velocity: Optional[float] = None
     avg_launch_angle: Optional[float] = None
     
+    age: Optional[int] = None  # Age during the season
+    
     # Team
     team_abbrev: Optional[str] = None
     
     class Config:
         extra = "allow"
 
+class CareerStats(SeasonStats):
+    """Career totals and rate stats, materialized at ingest"""
+    seasons: int = 0
+
+class RollingStats(BaseModel):
+    """wOBA / wRC+ over a season and the two before it, weighted 5/4/3 x PA"""
+    woba: Optional[float] = None
+    wrc_plus: Optional[float] = None
+    plate_appearances: int = 0
+
+class HydratedSavedPlayer(SavedPlayer):
+    """Saved player joined with the server's current stats"""
+    overall_score: Optional[float] = None
+    team_abbrev: Optional[str] = None
+    latest_season: Optional[int] = None
+    latest_stats: Optional[SeasonStats] = None  # Most recent season line on record
+
+class Projection(BaseModel):
+    """Marcel next-season projection (scripts/projections.py)"""
+    season: int
+    age: Optional[int] = None
+    plate_appearances: int = 0
+    at_bats: int = 0
+    hits: int = 0
+    singles: int = 0
+    doubles: int = 0
+    triples: int = 0
+    home_runs: int = 0
+    runs: int = 0
+    rbi: int = 0
+    walks: int = 0
+    strikeouts: int = 0
+    stolen_bases: int = 0
+    caught_stealing: int = 0
+    batting_average: float = 0.0
+    on_base_percentage: float = 0.0
+    slugging_percentage: float = 0.0
+    ops: float = 0.0
+    isolated_power: float = 0.0
+    woba: float = 0.0
+    wrc_plus: float = 0.0
+    war: float = 0.0
+    reliability: float = 0.0  # Share of the projection from the player's own seasons (0-1)
+
+class LeaderboardEntry(BaseModel):
+    """One ranked player on a leaderboard"""
+    rank: int
+    id: int
+    name: str
+    image_url: str
+    years_active: str
+    team_abbrev: Optional[str] = None
+    overall_score: float
+    projected_score: Optional[float] = None
+
+class StatcastAggregate(BaseModel):
+    """Pitch-level Statcast totals and rates for one batter and split value"""
+    split: Optional[str] = None  # None when the range is not split
+    pitches: int = 0
+    plate_appearances: int = 0
+    hits: int = 0
+    home_runs: int = 0
+    walks: int = 0
+    strikeouts: int = 0
+    batted_balls: int = 0
+    walk_rate: Optional[float] = None
+    strikeout_rate: Optional[float] = None
+    woba: Optional[float] = None
+    xwoba: Optional[float] = None
+    hard_hit_rate: Optional[float] = None
+    barrel_rate: Optional[float] = None
+    avg_exit_velocity: Optional[float] = None
+    avg_launch_angle: Optional[float] = None
+    whiff_rate: Optional[float] = None
+
+class StatcastSplits(BaseModel):
+    """A batter's Statcast aggregates over a date range, optionally split"""
+    mlbam_id: int
+    start_date: Optional[date] = None  # None: from the first staged date
+    end_date: Optional[date] = None    # None: through the last staged date
+    split: Optional[str] = None
+    splits: List[StatcastAggregate]
+
+class PlayerPercentiles(BaseModel):
+    """A player's percentile ranks among qualified hitters for one season"""
+    mlbam_id: int
+    season: int
+    plate_appearances: int
+    qualified: bool
+    qualifying_pa: int
+    percentiles: Dict[str, int]  # Stat -> 0-99, higher is better
+
 class PlayerDetail(BaseModel):
     """Detailed player information with all seasons stats"""
     mlbam_id: int
@@ -88,7 +202,12 @@ class PlayerDetail(BaseModel):
     years_active: str
     team_abbrev: Optional[str] = None
     overall_score: float = 0.0
+    projected_score: Optional[float] = None  # Projected next-season wRC+
+    projection: Optional[Projection] = None  # None for players without a recent season
     seasons: Dict[str, SeasonStats]  # Year -> Stats mapping
+    career: Optional[CareerStats] = None  # None until the ingest pipeline has computed it
+    rolling: Dict[str, RollingStats] = {}  # Year -> 3-year weighted rates ending that year
+    percentiles: Optional[Dict[str, Dict[str, int]]] = None  # Year -> stat -> percentile, when requested
     
     class Config:
         extra = "allow"
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class ProfileSummary(BaseModel):
+    """Metadata for a captured request profile"""
+    id: int
+    method: str
+    path: str
+    status_code: Optional[int] = None
+    started_at: float
+    duration_ms: float
+    cpu_ms: Optional[float] = None
+    interval_ms: float
+    samples: int
+    concurrent_requests: int
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class ScoreDistribution(BaseModel):
+    """Distribution of a roster's offensive player scores ((1 - K%) + BB% + OBP + ISO + BsR)"""
+    players: int = 0  # Players with every score component
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    p25: Optional[float] = None
+    median: Optional[float] = None
+    p75: Optional[float] = None
+    max: Optional[float] = None
+
+class TeamAggregate(BaseModel):
+    """One team's offense for a season, aggregated over its player lines"""
+    team_abbrev: str
+    season: int
+    players: int
+    plate_appearances: int
+    on_base_percentage: Optional[float] = None  # PA-weighted
+    isolated_power: Optional[float] = None      # PA-weighted
+    woba: Optional[float] = None                # PA-weighted
+    war: Optional[float] = None                 # Total
+    offensive_player_score: ScoreDistribution
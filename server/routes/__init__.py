@@ -1,6 +1,9 @@
 from .auth import router as auth_router
 from .health import router as health_router
 from .players import router as players_router
+from .metrics import router as metrics_router
+from .profiles import router as profiles_router
+from .teams import router as teams_router
 
-__all__ = ["auth_router", "health_router", "players_router"]
+__all__ = ["auth_router", "health_router", "players_router", "metrics_router", "profiles_router", "teams_router"]
 
@@ -1,32 +1,143 @@
 from fastapi import APIRouter, Query, status, Depends
-from models.players import PlayerSearchResult, AddPlayerResponse, DeletePlayerResponse, SavedPlayer, PlayerDetail
+from fastapi.responses import StreamingResponse
+from models.players import PlayerSearchResult, SearchFilters, PlayerPercentiles, BatchSearchRequest, BatchSearchResult, AddPlayerResponse, DeletePlayerResponse, SavedPlayer, HydratedSavedPlayer, PlayerDetail, LeaderboardEntry, StatcastSplits
 from services.player_search_service import player_search_service
 from services.saved_players_service import saved_players_service
+from services.export_service import export_service
+from services.player_updates_service import player_updates_service
+from services.statcast_service import statcast_service
 from middleware.auth import get_current_user
-from typing import List
+from utils.negotiation import NegotiatedResponse
+from datetime import date
+from typing import List, Optional
 
-router = APIRouter(prefix="/api/players", tags=["players"])
+# JSON by default; MessagePack / Arrow IPC when the Accept header asks for them
+router = APIRouter(prefix="/api/players", tags=["players"], default_response_class=NegotiatedResponse)
 
 @router.get("/search", response_model=List[PlayerSearchResult], tags=["search"])
-async def search_players(q: str = Query(..., description="Search query for player name")):
-    """Search for players by name using fuzzy matching (public - no auth required)"""
-    return await player_search_service.search(q)
+async def search_players(
+    q: str = Query(..., description="Search query for player name"),
+    team_abbrev: Optional[str] = Query(None, description="Only players on this team"),
+    season: Optional[int] = Query(None, description="Only players who played this season"),
+    min_career_pa: Optional[int] = Query(None, ge=0, description="Minimum career plate appearances"),
+    min_overall_score: Optional[float] = Query(None, description="Minimum overall score"),
+):
+    """Search for players by name using fuzzy matching, optionally filtered (public - no auth required)"""
+    filters = SearchFilters(
+        team_abbrev=team_abbrev, season=season,
+        min_career_pa=min_career_pa, min_overall_score=min_overall_score,
+    )
+    return await player_search_service.search(q, filters=filters)
+
+@router.post("/search/batch", response_model=List[BatchSearchResult], tags=["search"])
+async def search_players_batch(request: BatchSearchRequest):
+    """Resolve many player names in one request, e.g. a pasted roster (public - no auth required)"""
+    return await player_search_service.search_batch(
+        request.queries, request.limit, request.score_cutoff, request.filters
+    )
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry], tags=["search"])
+async def get_leaderboard(
+    stat: str = Query("projected_score", pattern="^(projected_score|overall_score)$",
+                      description="projected_score (projected next-season wRC+) or overall_score"),
+    limit: int = Query(25, ge=1, le=500, description="Number of players"),
+    team_abbrev: Optional[str] = Query(None, description="Only players on this team"),
+    season: Optional[int] = Query(None, description="Only players who played this season"),
+    min_career_pa: Optional[int] = Query(None, ge=0, description="Minimum career plate appearances"),
+):
+    """Top players by projected or current score (public - no auth required)"""
+    filters = SearchFilters(team_abbrev=team_abbrev, season=season, min_career_pa=min_career_pa)
+    return await player_search_service.leaderboard(stat, limit, filters)
+
+@router.get("/export", response_class=StreamingResponse, tags=["export"])
+async def export_players(
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$", description="csv, parquet or arrow (IPC stream)"),
+    team_abbrev: Optional[str] = Query(None, description="Only players on this team"),
+    season: Optional[int] = Query(None, description="Only players who played this season"),
+    min_career_pa: Optional[int] = Query(None, ge=0, description="Minimum career plate appearances"),
+    min_overall_score: Optional[float] = Query(None, description="Minimum overall score"),
+):
+    """Stream season stats for a filtered set of players (public - no auth required)"""
+    filters = SearchFilters(
+        team_abbrev=team_abbrev, season=season,
+        min_career_pa=min_career_pa, min_overall_score=min_overall_score,
+    )
+    chunks = await export_service.export_players(filters, format)
+    return StreamingResponse(
+        chunks,
+        media_type=export_service.media_type(format),
+        headers={"Content-Disposition": f'attachment; filename="{export_service.filename("players", format)}"'},
+    )
 
 @router.get("/{player_id}/detail", response_model=PlayerDetail, tags=["search"])
-async def get_player_detail(player_id: int):
+async def get_player_detail(
+    player_id: int,
+    include_percentiles: bool = Query(False, description="Add per-season percentile ranks"),
+):
     """Get detailed information for a specific player (public - no auth required)"""
-    return await player_search_service.get_player_detail(player_id)
+    return await player_search_service.get_player_detail(player_id, include_percentiles)
+
+@router.get("/{player_id}/percentiles", response_model=PlayerPercentiles, tags=["search"])
+async def get_player_percentiles(
+    player_id: int,
+    season: Optional[int] = Query(None, description="Season (defaults to the player's latest)"),
+):
+    """Get a player's percentile ranks among qualified hitters (public - no auth required)"""
+    return await player_search_service.get_player_percentiles(player_id, season)
+
+@router.get("/{player_id}/statcast", response_model=StatcastSplits, tags=["search"])
+async def get_player_statcast(
+    player_id: int,
+    start_date: Optional[date] = Query(None, description="First game date (default: the first staged date)"),
+    end_date: Optional[date] = Query(None, description="Last game date (default: the last staged date)"),
+    split: Optional[str] = Query(None, description="pitcher_hand, batter_side, home_away, month or pitch_type"),
+):
+    """Get a batter's pitch-level Statcast aggregates over a date range (public - no auth required)"""
+    return await statcast_service.batter_splits(player_id, start_date, end_date, split)
 
 @router.post("/saved", response_model=AddPlayerResponse, status_code=status.HTTP_201_CREATED, tags=["saved"])
 async def add_saved_player(player_info: dict, current_user: str = Depends(get_current_user)):
     """Add a player to the current user's saved players collection"""
-    return await saved_players_service.add_player(current_user, player_info)
+    response = await saved_players_service.add_player(current_user, player_info)
+    player_updates_service.follow(current_user, response.player_id)
+    return response
 
 @router.get("/saved", response_model=List[SavedPlayer], tags=["saved"])
 async def get_saved_players(current_user: str = Depends(get_current_user)):
     """Get all saved players for the current user"""
     return await saved_players_service.get_all_players(current_user)
 
+@router.get("/saved/hydrated", response_model=List[HydratedSavedPlayer], tags=["saved"])
+async def get_hydrated_saved_players(current_user: str = Depends(get_current_user)):
+    """Get the current user's saved players with current stats and overall score"""
+    return await saved_players_service.get_hydrated_players(current_user)
+
+@router.get("/saved/export", response_class=StreamingResponse, tags=["saved", "export"])
+async def export_saved_players(
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$", description="csv, parquet or arrow (IPC stream)"),
+    current_user: str = Depends(get_current_user),
+):
+    """Stream season stats for the current user's saved players"""
+    chunks = await export_service.export_saved_players(current_user, format)
+    return StreamingResponse(
+        chunks,
+        media_type=export_service.media_type(format),
+        headers={"Content-Disposition": f'attachment; filename="{export_service.filename("saved_players", format)}"'},
+    )
+
+@router.get("/saved/updates", response_class=StreamingResponse, tags=["saved"])
+async def saved_player_updates(current_user: str = Depends(get_current_user)):
+    """
+    Server-sent events for the current user's saved players: `ready` on connect,
+    then `players` whenever a refresh changes any of them (`resync` if the client fell behind)
+    """
+    subscription = await player_updates_service.subscribe(current_user)
+    return StreamingResponse(
+        player_updates_service.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/saved/{player_id}", response_model=SavedPlayer, tags=["saved"])
 async def get_saved_player(player_id: str, current_user: str = Depends(get_current_user)):
     """Get a specific saved player for the current user"""
@@ -35,4 +146,6 @@ async def get_saved_player(player_id: str, current_user: str = Depends(get_curre
 @router.delete("/saved/{player_id}", response_model=DeletePlayerResponse, tags=["saved"])
 async def delete_saved_player(player_id: str, current_user: str = Depends(get_current_user)):
     """Delete a player from the current user's saved players collection"""
-    return await saved_players_service.delete_player(current_user, player_id)
+    response = await saved_players_service.delete_player(current_user, player_id)
+    player_updates_service.unfollow(current_user, player_id)
+    return response
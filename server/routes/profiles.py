@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from models.profiles import ProfileSummary
+from services.profiling_service import profiling_service
+from typing import List
+
+router = APIRouter(prefix="/api/admin/profiles", tags=["admin"])
+
+async def require_profiling_admin(x_profile_token: str = Header(None)) -> None:
+    """Dependency that only lets the profiling admin token through"""
+    if not profiling_service.is_admin(x_profile_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Profiling admin token required"
+        )
+
+@router.get("", response_model=List[ProfileSummary], dependencies=[Depends(require_profiling_admin)])
+async def list_profiles():
+    """List the most recent request profiles"""
+    return await profiling_service.list_profiles()
+
+@router.get("/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(require_profiling_admin)])
+async def download_profile(profile_id: int, kind: str = Query("wall", pattern="^(wall|cpu)$")):
+    """Download a profile as folded stacks (flamegraph.pl / speedscope input)"""
+    folded = await profiling_service.get_folded(profile_id, kind)
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}-{kind}.folded"'}
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Query
+from models.teams import TeamAggregate
+from services.team_service import team_service
+from utils.negotiation import NegotiatedResponse
+from typing import List, Optional
+
+# JSON by default; MessagePack / Arrow IPC when the Accept header asks for them
+router = APIRouter(prefix="/api/teams", tags=["teams"], default_response_class=NegotiatedResponse)
+
+@router.get("", response_model=List[TeamAggregate])
+async def list_teams(
+    season: Optional[int] = Query(None, description="Season (defaults to the latest)"),
+):
+    """Offensive aggregates for every team in a season (public - no auth required)"""
+    return await team_service.list_teams(season)
+
+@router.get("/{team_abbrev}", response_model=TeamAggregate)
+async def get_team(
+    team_abbrev: str,
+    season: Optional[int] = Query(None, description="Season (defaults to the team's latest)"),
+):
+    """Offensive aggregates for one team, e.g. NYY (public - no auth required)"""
+    return await team_service.get_team(team_abbrev, season)
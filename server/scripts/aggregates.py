@@ -0,0 +1,266 @@
+"""
+Materialized career and rolling aggregates for player documents.
+
+Computed at ingest and stored on each `players` document so the API serves
+them without recomputation:
+
+    career          counting totals and rate stats over every season
+    career_rate_pa  plate appearances behind each PA-weighted career rate
+    career_sums     unrounded PA-weighted rate sums and value totals; with
+                    career_rate_pa they let a single season be swapped in or
+                    out later without compounding `career`'s rounding
+    rolling         per season: wOBA / wRC+ over that season and the two
+                    before it, weighted 5/4/3 (most recent first) times PA
+
+AVG, SLG, ISO, OPS and BB/K are derived from the counting totals; the other
+rates are PA-weighted means of the season values.
+
+Also builds the columnar `season_stats/{year}` documents that back
+per-season percentile ranks (utils/season_table.py).
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+COUNTING_STATS = [
+    "games", "plate_appearances", "at_bats", "hits", "singles", "doubles", "triples",
+    "home_runs", "runs", "rbi", "walks", "strikeouts", "stolen_bases", "caught_stealing",
+]
+VALUE_STATS = ["war", "off", "def", "base_running"]  # Summed like counting stats, but fractional
+WEIGHTED_RATE_STATS = [
+    "on_base_percentage", "babip", "walk_rate", "strikeout_rate", "woba", "wrc_plus",
+    "hard_hit_rate", "barrel_rate", "avg_exit_velocity", "avg_launch_angle",
+]
+SEASON_TABLE_STATS = COUNTING_STATS + VALUE_STATS + [
+    "batting_average", "on_base_percentage", "slugging_percentage", "ops", "isolated_power", "babip",
+    "walk_rate", "strikeout_rate", "bb_k_ratio", "woba", "wrc_plus",
+    "hard_hit_rate", "barrel_rate", "avg_exit_velocity", "avg_launch_angle",
+]
+ROLLING_STATS = ["woba", "wrc_plus"]
+ROLLING_WEIGHTS = (5, 4, 3)  # Current season, one year back, two years back
+
+_TOTAL_STATS = COUNTING_STATS + VALUE_STATS
+_SUM_STATS = VALUE_STATS + WEIGHTED_RATE_STATS
+_PRECISION = 4
+
+
+def _value(stats: Dict, stat: str) -> Optional[float]:
+    value = stats.get(stat)
+    return None if value is None else float(value)
+
+
+def _season_arrays(seasons_by_player: List[Dict[str, Dict]], years: List[int]):
+    """Dense (player, year, stat) arrays; missing seasons are zero PA, missing rates NaN"""
+    year_pos = {year: i for i, year in enumerate(years)}
+    shape = (len(seasons_by_player), len(years))
+    totals = np.zeros(shape + (len(_TOTAL_STATS),))
+    rates = np.full(shape + (len(WEIGHTED_RATE_STATS),), np.nan)
+    for p, seasons in enumerate(seasons_by_player):
+        for year, stats in (seasons or {}).items():
+            y = year_pos[int(year)]
+            totals[p, y] = [_value(stats, stat) or 0.0 for stat in _TOTAL_STATS]
+            rates[p, y] = [np.nan if _value(stats, stat) is None else _value(stats, stat)
+                           for stat in WEIGHTED_RATE_STATS]
+    return totals, rates
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return round(numerator / denominator, _PRECISION) if denominator else 0.0
+
+
+def _career(totals: Dict[str, float], rates: Dict[str, Optional[float]], seasons: int) -> Dict:
+    """Career stats from counting totals and PA-weighted rates"""
+    career = {stat: int(round(totals[stat])) for stat in COUNTING_STATS}
+    career.update({stat: round(totals[stat], _PRECISION) for stat in VALUE_STATS})
+    career.update({stat: None if value is None else round(value, _PRECISION) for stat, value in rates.items()})
+
+    total_bases = totals["singles"] + 2 * totals["doubles"] + 3 * totals["triples"] + 4 * totals["home_runs"]
+    career["batting_average"] = _ratio(totals["hits"], totals["at_bats"])
+    career["slugging_percentage"] = _ratio(total_bases, totals["at_bats"])
+    career["isolated_power"] = round(career["slugging_percentage"] - career["batting_average"], _PRECISION)
+    career["ops"] = round((career["on_base_percentage"] or 0.0) + career["slugging_percentage"], _PRECISION)
+    career["bb_k_ratio"] = _ratio(totals["walks"], totals["strikeouts"])
+    career["seasons"] = seasons
+    return career
+
+
+def compute_aggregates(seasons_by_player: List[Dict[str, Dict]]) -> List[Dict]:
+    """
+    Aggregates for many players at once. Returns one dict per input with the
+    `career`, `career_rate_pa` and `rolling` fields to store on the document.
+    """
+    years_seen = {int(year) for seasons in seasons_by_player for year in (seasons or {})}
+    if not years_seen:
+        return [{"career": _career(dict.fromkeys(_TOTAL_STATS, 0.0), dict.fromkeys(WEIGHTED_RATE_STATS), 0),
+                 "career_rate_pa": dict.fromkeys(WEIGHTED_RATE_STATS, 0),
+                 "career_sums": dict.fromkeys(_SUM_STATS, 0.0), "rolling": {}}
+                for _ in seasons_by_player]
+    years = list(range(min(years_seen), max(years_seen) + 1))
+    totals, rates = _season_arrays(seasons_by_player, years)
+    pa = totals[:, :, _TOTAL_STATS.index("plate_appearances")]
+    has_rate = ~np.isnan(rates)
+    rate_values = np.nan_to_num(rates)
+
+    # Career: sums over the year axis
+    career_totals = totals.sum(axis=1)
+    rate_pa = (pa[:, :, None] * has_rate).sum(axis=1)
+    weighted = (pa[:, :, None] * rate_values).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        career_rates = np.where(rate_pa > 0, weighted / rate_pa, np.nan)
+    played = pa > 0
+
+    # Rolling: add each lagged season's weighted contribution to every year at once
+    rolling_idx = [WEIGHTED_RATE_STATS.index(stat) for stat in ROLLING_STATS]
+    roll_num = np.zeros(pa.shape + (len(ROLLING_STATS),))
+    roll_den = np.zeros_like(roll_num)
+    roll_pa = np.zeros(pa.shape)
+    n_years = len(years)
+    for lag, weight in enumerate(ROLLING_WEIGHTS):
+        if lag >= n_years:
+            break
+        w = weight * pa[:, :n_years - lag, None]
+        roll_num[:, lag:] += w * rate_values[:, :n_years - lag, rolling_idx]
+        roll_den[:, lag:] += w * has_rate[:, :n_years - lag, rolling_idx]
+        roll_pa[:, lag:] += pa[:, :n_years - lag]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rolling = np.where(roll_den > 0, roll_num / roll_den, np.nan)
+
+    results = []
+    for p in range(len(seasons_by_player)):
+        career = _career(
+            dict(zip(_TOTAL_STATS, career_totals[p].tolist())),
+            {stat: None if np.isnan(v) else float(v) for stat, v in zip(WEIGHTED_RATE_STATS, career_rates[p])},
+            int(played[p].sum()),
+        )
+        player_rolling = {}
+        for y in np.flatnonzero(played[p]):
+            player_rolling[str(years[y])] = {
+                **{stat: None if np.isnan(v) else round(float(v), _PRECISION)
+                   for stat, v in zip(ROLLING_STATS, rolling[p, y])},
+                "plate_appearances": int(roll_pa[p, y]),
+            }
+        results.append({
+            "career": career,
+            "career_rate_pa": {stat: int(v) for stat, v in zip(WEIGHTED_RATE_STATS, rate_pa[p])},
+            "career_sums": {
+                **{stat: float(career_totals[p, _TOTAL_STATS.index(stat)]) for stat in VALUE_STATS},
+                **{stat: float(v) for stat, v in zip(WEIGHTED_RATE_STATS, weighted[p])},
+            },
+            "rolling": player_rolling,
+        })
+    return results
+
+
+def _rolling_entry(seasons: Dict[str, Dict], year: int) -> Dict:
+    """Rolling aggregate for one season, from that season and the two before it"""
+    entry = {"plate_appearances": 0}
+    nums = dict.fromkeys(ROLLING_STATS, 0.0)
+    dens = dict.fromkeys(ROLLING_STATS, 0.0)
+    for lag, weight in enumerate(ROLLING_WEIGHTS):
+        stats = seasons.get(str(year - lag))
+        if not stats:
+            continue
+        pa = float(stats.get("plate_appearances") or 0)
+        entry["plate_appearances"] += int(pa)
+        for stat in ROLLING_STATS:
+            value = _value(stats, stat)
+            if value is not None:
+                nums[stat] += weight * pa * value
+                dens[stat] += weight * pa
+    for stat in ROLLING_STATS:
+        entry[stat] = round(nums[stat] / dens[stat], _PRECISION) if dens[stat] else None
+    return entry
+
+
+def update_season(doc: Dict, year: int, stats: Dict) -> Dict:
+    """
+    Swap one season's stats into a player's stored aggregates without touching
+    the other seasons. Returns the fields to merge into the document.
+    `doc` needs `career`, `career_rate_pa`, `career_sums`, `season_years` and seasons year-2..year+2;
+    documents without stored aggregates need every season and are computed from scratch.
+    """
+    seasons = dict(doc.get("seasons") or {})
+    old = seasons.get(str(year)) or {}
+    seasons[str(year)] = stats
+    # `doc` may be a projection holding only the seasons near `year`; season_years lists them all
+    season_years = sorted(set(doc.get("season_years") or []) | {int(y) for y in seasons})
+    fields = {
+        "seasons": {str(year): stats},
+        "season_years": season_years,
+    }
+
+    if "career" not in doc or "career_rate_pa" not in doc:
+        aggregates = compute_aggregates([seasons])[0]
+        fields.update(aggregates)
+        fields["career_pa"] = aggregates["career"]["plate_appearances"]
+        return fields
+
+    career, rate_pa = doc["career"], doc["career_rate_pa"]
+    # Documents written before career_sums existed start from the rounded career values, once
+    sums = doc.get("career_sums") or {
+        **{stat: float(career.get(stat) or 0) for stat in VALUE_STATS},
+        **{stat: (career.get(stat) or 0.0) * float(rate_pa.get(stat) or 0) for stat in WEIGHTED_RATE_STATS},
+    }
+    totals = {stat: float(career.get(stat) or 0) - (_value(old, stat) or 0.0) + (_value(stats, stat) or 0.0)
+              for stat in COUNTING_STATS}
+    new_sums = {stat: float(sums.get(stat) or 0) - (_value(old, stat) or 0.0) + (_value(stats, stat) or 0.0)
+                for stat in VALUE_STATS}
+    totals.update(new_sums)
+    old_pa = _value(old, "plate_appearances") or 0.0
+    new_pa = _value(stats, "plate_appearances") or 0.0
+    rates, new_rate_pa = {}, {}
+    for stat in WEIGHTED_RATE_STATS:
+        weight = float(rate_pa.get(stat) or 0)
+        numerator = float(sums.get(stat) or 0)
+        if _value(old, stat) is not None:
+            numerator -= _value(old, stat) * old_pa
+            weight -= old_pa
+        if _value(stats, stat) is not None:
+            numerator += _value(stats, stat) * new_pa
+            weight += new_pa
+        if weight <= 0:
+            numerator = 0.0  # Drop the float residue of the last season removed
+        rates[stat] = numerator / weight if weight > 0 else None
+        new_rate_pa[stat] = int(weight)
+        new_sums[stat] = numerator
+    # Seasons with plate appearances, as compute_aggregates counts them
+    seasons_played = int(career.get("seasons") or 0) - (old_pa > 0) + (new_pa > 0)
+
+    fields["career"] = _career(totals, rates, seasons_played)
+    fields["career_rate_pa"] = new_rate_pa
+    fields["career_sums"] = new_sums
+    fields["career_pa"] = fields["career"]["plate_appearances"]
+    # Only this season's window (and the next two, if stored) involve the changed season;
+    # like compute_aggregates, seasons without plate appearances get no rolling entry
+    fields["rolling"] = {
+        str(y): _rolling_entry(seasons, y) for y in (year, year + 1, year + 2)
+        if y in season_years and _value(seasons.get(str(y)) or {}, "plate_appearances")
+    }
+    return fields
+
+
+def build_season_tables(players: Iterable[Dict], seasons: Optional[Iterable[int]] = None) -> Dict[str, Dict]:
+    """
+    Transpose player documents into one columnar document per season:
+    {"season", "updated_at", "mlbam_id": [...], "team_abbrev": [...], <stat>: [...]}.
+    Pass `seasons` to build only those years.
+    """
+    wanted = {str(year) for year in seasons} if seasons is not None else None
+    updated_at = datetime.now(timezone.utc).isoformat()
+    tables: Dict[str, Dict] = {}
+    for player in players:
+        for year, stats in (player.get("seasons") or {}).items():
+            if wanted is not None and year not in wanted:
+                continue
+            table = tables.get(year)
+            if table is None:
+                table = tables[year] = {
+                    "season": int(year), "updated_at": updated_at, "mlbam_id": [], "team_abbrev": [],
+                    **{stat: [] for stat in SEASON_TABLE_STATS},
+                }
+            table["mlbam_id"].append(int(player["mlbam_id"]))
+            table["team_abbrev"].append(stats.get("team_abbrev"))
+            for stat in SEASON_TABLE_STATS:
+                table[stat].append(stats.get(stat))
+    return tables
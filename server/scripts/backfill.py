@@ -0,0 +1,314 @@
+"""
+Memory-bounded backfill of every season from 1871 to the present.
+
+get_players.py holds every season's batting_stats frame and every player
+document in memory before uploading, which limits it to recent seasons.
+This backfill instead goes through an on-disk intermediate in four steps:
+
+    stage       fetch seasons `--chunk-years` at a time and write each one to
+                `seasons/season=<year>.parquet` (season lines, one row per hitter)
+    ids         one FanGraphs -> MLBAM lookup for every staged hitter (`ids.parquet`)
+    partition   per season: upload its `season_stats` table, and split its rows
+                into `players/bucket=<n>/season=<year>.parquet` by FanGraphs id
+    upload      per bucket: group rows into player documents (seasons, aggregates,
+                overall_score) and write them in batches of WRITE_BATCH_SIZE;
+                then project the next season (scripts/projections.py)
+
+Only one chunk of seasons, one season, or one bucket is in memory at a time.
+The bucket count is derived from the staged row count (`--rows-per-bucket`),
+so peak RSS does not grow with the number of decades ingested.
+
+    python scripts/backfill.py                                  # 1871 to the current season
+    python scripts/backfill.py --start-year 1990 --work-dir /data/backfill
+    python scripts/backfill.py --stage-only                     # fetch and stage, no writes
+
+Staged seasons are kept, so an interrupted run resumes without re-fetching
+them; pass `--refetch` to fetch every season again.
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import logging
+import math
+import os
+import resource
+import shutil
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from scripts.aggregates import COUNTING_STATS, build_season_tables, compute_aggregates
+from scripts.incremental_ingest import WRITE_BATCH_SIZE
+from scripts.projections import run_projections
+
+logger = logging.getLogger(__name__)
+
+FIRST_SEASON = 1871
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "cybermetrics-backfill")
+
+# Season line fields that are whole numbers; every other stat is stored as a nullable double
+_INT_FIELDS = set(COUNTING_STATS) | {"age"}
+
+
+def fetch_seasons(first: int, last: int):
+    """FanGraphs batting tables for seasons first..last, one row per hitter-season"""
+    from pybaseball import batting_stats
+    return batting_stats(first, last, qual=0, ind=1)
+
+
+def lookup_mlbam_ids(fangraphs_ids: List[int]) -> Dict[int, int]:
+    """FanGraphs id -> MLBAM id, in one register lookup"""
+    from pybaseball import playerid_reverse_lookup
+    ids = playerid_reverse_lookup(fangraphs_ids, key_type="fangraphs")
+    return {
+        int(row["key_fangraphs"]): int(row["key_mlbam"])
+        for _, row in ids.iterrows()
+        if str(row["key_mlbam"]) != "nan" and str(row["key_fangraphs"]) != "nan"
+    }
+
+
+def _schema():
+    import pyarrow as pa
+    from scripts.get_players import season_stats_from_row
+    # The field order of a season line, taken from an empty row so it always matches the ingest
+    stats = [key for key in season_stats_from_row({"PA": 50, "Team": ""}) if key != "team_abbrev"]
+    return pa.schema(
+        [("fangraphs_id", pa.int64()), ("name", pa.string()), ("team_abbrev", pa.string())]
+        + [(stat, pa.int64() if stat in _INT_FIELDS else pa.float64()) for stat in stats]
+    )
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Backfill:
+    """Stage, partition and upload a range of seasons through Parquet files in `work_dir`"""
+
+    def __init__(self, db, work_dir: str, start_year: int, end_year: int, chunk_years: int = 5,
+                 rows_per_bucket: int = 20_000,
+                 fetch: Callable = fetch_seasons, lookup: Callable = lookup_mlbam_ids):
+        self.db = db
+        self.work_dir = Path(work_dir)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.chunk_years = chunk_years
+        self.rows_per_bucket = rows_per_bucket
+        self.fetch = fetch
+        self.lookup = lookup
+        self.schema = _schema()
+
+    def _season_path(self, year: int) -> Path:
+        return self.work_dir / "seasons" / f"season={year}.parquet"
+
+    def _years(self) -> range:
+        return range(self.start_year, self.end_year + 1)
+
+    def run(self, stage_only: bool = False, refetch: bool = False, project: bool = True) -> Dict:
+        """Run every step; returns a summary with row counts and peak RSS"""
+        start = time.perf_counter()
+        summary = {"seasons": self.stage(refetch)}
+        if not stage_only:
+            ids = self.map_ids()
+            summary["hitters"] = len(ids)
+            summary["buckets"], summary["season_tables"] = self.partition(ids)
+            summary["players"] = self.upload()
+            if project and self.db is not None:
+                # Needs league averages over every recent hitter, so it runs once all buckets are written
+                summary["projected"] = run_projections(self.db, self.end_year + 1)["projected"]
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        summary["peak_rss_mb"] = _peak_rss_mb()
+        logger.info("Backfill finished", extra=summary)
+        return summary
+
+    def stage(self, refetch: bool = False) -> int:
+        """Fetch missing seasons chunk by chunk and write one Parquet file per season"""
+        missing = [year for year in self._years() if refetch or not self._season_path(year).exists()]
+        for i in range(0, len(missing), self.chunk_years):
+            chunk = missing[i:i + self.chunk_years]
+            frame = self.fetch(chunk[0], chunk[-1])
+            by_season = frame.groupby("Season") if len(frame) else ()
+            staged = set()
+            for season, rows in by_season:
+                if int(season) in chunk:
+                    self._write_season(int(season), rows)
+                    staged.add(int(season))
+            # Seasons without hitters (or outside the feed) still get a file, so resumes skip them
+            for year in set(chunk) - staged:
+                self._write_season(year, frame.iloc[0:0])
+            print(f"Staged {chunk[0]}-{chunk[-1]} ({len(frame)} rows)")
+            del frame, by_season
+        return len(self._years())
+
+    def _write_season(self, year: int, rows) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from scripts.get_players import season_stats_from_row
+
+        records, seen = [], set()
+        for _, row in rows.iterrows():
+            stats = season_stats_from_row(row)
+            fangraphs_id = int(row["IDfg"])
+            if stats and fangraphs_id not in seen:
+                seen.add(fangraphs_id)
+                records.append({"fangraphs_id": fangraphs_id, "name": row["Name"], **stats})
+        path = self._season_path(year)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so an interrupted write is never taken as staged
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(pa.Table.from_pylist(records, schema=self.schema), tmp)
+        os.replace(tmp, path)
+
+    def _read_season(self, year: int, columns: Optional[List[str]] = None):
+        import pyarrow.parquet as pq
+        return pq.read_table(self._season_path(year), columns=columns)
+
+    def map_ids(self) -> Dict[int, int]:
+        """MLBAM ids for every staged hitter, looked up once and cached in `ids.parquet`"""
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        fangraphs_ids = set()
+        for year in self._years():
+            fangraphs_ids.update(self._read_season(year, ["fangraphs_id"]).column(0).to_pylist())
+
+        path = self.work_dir / "ids.parquet"
+        known: Dict[int, int] = {}
+        if path.exists():
+            table = pq.read_table(path)
+            known = dict(zip(table["fangraphs_id"].to_pylist(), table["mlbam_id"].to_pylist()))
+        missing = sorted(fangraphs_ids - set(known))
+        if missing:
+            known.update(self.lookup(missing))
+            pq.write_table(pa.table({
+                "fangraphs_id": np.fromiter(known.keys(), dtype=np.int64, count=len(known)),
+                "mlbam_id": np.fromiter(known.values(), dtype=np.int64, count=len(known)),
+            }), path)
+        return {fangraphs_id: known[fangraphs_id] for fangraphs_id in fangraphs_ids if fangraphs_id in known}
+
+    def partition(self, ids: Dict[int, int]):
+        """Upload each season's table and split its rows into player buckets; returns (buckets, tables)"""
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = sum(pq.ParquetFile(self._season_path(year)).metadata.num_rows for year in self._years())
+        buckets = max(1, math.ceil(rows / self.rows_per_bucket))
+        players_dir = self.work_dir / "players"
+        shutil.rmtree(players_dir, ignore_errors=True)
+
+        tables = 0
+        for year in self._years():
+            season = self._read_season(year)
+            fangraphs_ids = season["fangraphs_id"].to_numpy()
+            mlbam = np.array([ids.get(int(i), -1) for i in fangraphs_ids], dtype=np.int64)
+            season = season.append_column("mlbam_id", pa.array(mlbam)).filter(pa.array(mlbam >= 0))
+            if season.num_rows == 0:
+                continue
+
+            lines = season.drop(["fangraphs_id", "name"]).to_pylist()
+            entries = [{"mlbam_id": line.pop("mlbam_id"), "seasons": {str(year): line}} for line in lines]
+            if self.db is not None:
+                table = build_season_tables(entries, seasons=[year]).get(str(year))
+                if table:
+                    self.db.collection("season_stats").document(str(year)).set(table)
+                    tables += 1
+            del lines, entries
+
+            bucket_of = season["fangraphs_id"].to_numpy() % buckets
+            for bucket in np.unique(bucket_of):
+                path = players_dir / f"bucket={bucket:05d}" / f"season={year}.parquet"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pq.write_table(season.filter(pa.array(bucket_of == bucket)), path)
+        return buckets, tables
+
+    def _bucket_players(self, bucket_dir: Path) -> Iterator[List[Dict]]:
+        """
+        Player documents for one bucket (every season of each player), yielded in
+        WRITE_BATCH_SIZE batches. A player's seasons are spread over every season
+        file, so the whole bucket is assembled first; rows_per_bucket bounds it.
+        """
+        import pyarrow.parquet as pq
+
+        players: Dict[int, Dict] = {}
+        for path in sorted(bucket_dir.glob("season=*.parquet")):
+            year = path.stem.split("=", 1)[1]
+            for line in pq.read_table(path).to_pylist():
+                fangraphs_id = line.pop("fangraphs_id")
+                player = players.setdefault(fangraphs_id, {
+                    "mlbam_id": line["mlbam_id"], "fangraphs_id": fangraphs_id, "seasons": {},
+                })
+                # Seasons are read in order, so the name and team end up as the latest season's
+                player["name"] = line.pop("name")
+                del line["mlbam_id"]
+                player["seasons"][year] = line
+
+        batch = list(players.values())
+        del players
+        for i in range(0, len(batch), WRITE_BATCH_SIZE):
+            yield batch[i:i + WRITE_BATCH_SIZE]
+
+    def upload(self) -> int:
+        """Build and write every player document, one bucket and one write batch at a time"""
+        uploaded = 0
+        for bucket_dir in sorted((self.work_dir / "players").glob("bucket=*")):
+            for players in self._bucket_players(bucket_dir):
+                for player, aggregates in zip(players, compute_aggregates([p["seasons"] for p in players])):
+                    latest = player["seasons"][max(player["seasons"], key=int)]
+                    player.update({
+                        "team_abbrev": latest.get("team_abbrev"),
+                        "overall_score": latest.get("wrc_plus", 0),
+                        "season_years": sorted(int(year) for year in player["seasons"]),
+                        "career_pa": sum(stats.get("plate_appearances", 0) for stats in player["seasons"].values()),
+                    })
+                    player.update(aggregates)
+                if self.db is not None:
+                    batch = self.db.batch()
+                    for player in players:
+                        batch.set(self.db.collection("players").document(str(player["mlbam_id"])), player)
+                    batch.commit()
+                uploaded += len(players)
+            print(f"Uploaded {bucket_dir.name} ({uploaded} players so far)")
+        return uploaded
+
+
+def run_backfill(start_year: int = FIRST_SEASON, end_year: Optional[int] = None, work_dir: str = DEFAULT_WORK_DIR,
+                 chunk_years: int = 5, rows_per_bucket: int = 20_000, stage_only: bool = False,
+                 refetch: bool = False, db=None) -> Optional[Dict]:
+    """Backfill start_year..end_year (default: the current season) into the configured Firestore (or `db`)"""
+    from scripts.get_players import current_season
+    if db is None and not stage_only:
+        from config.firebase import firebase_service
+        db = firebase_service.db
+        if not db:
+            print("Firebase not configured")
+            return None
+    backfill = Backfill(db, work_dir, start_year, end_year or current_season, chunk_years, rows_per_bucket)
+    summary = backfill.run(stage_only=stage_only, refetch=refetch)
+    print(
+        f"{start_year}-{backfill.end_year}: {summary.get('players', 0)} players, "
+        f"{summary.get('season_tables', 0)} season tables in {summary['seconds']}s "
+        f"(peak RSS {summary['peak_rss_mb']} MB)"
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill every season through a Parquet intermediate")
+    parser.add_argument("--start-year", type=int, default=FIRST_SEASON)
+    parser.add_argument("--end-year", type=int, help="Last season (default: the current season)")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="Where staged Parquet files are kept")
+    parser.add_argument("--chunk-years", type=int, default=5, help="Seasons fetched per request")
+    parser.add_argument("--rows-per-bucket", type=int, default=20_000,
+                        help="Hitter-season rows per upload bucket (bounds memory)")
+    parser.add_argument("--stage-only", action="store_true", help="Fetch and stage seasons without writing")
+    parser.add_argument("--refetch", action="store_true", help="Fetch already staged seasons again")
+    args = parser.parse_args()
+
+    run_backfill(args.start_year, args.end_year, args.work_dir, args.chunk_years, args.rows_per_bucket,
+                 args.stage_only, args.refetch)
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import os
+import tempfile
+from config.settings import settings
+from services.player_search_service import player_search_service
+
+DEFAULT_INDEX_PATH = os.path.join(tempfile.gettempdir(), "cybermetrics-player-index.bin")
+
+
+def build_player_index(path: str) -> int:
+    """
+    Stream the players collection once and write the memory-mappable search index.
+    Workers started with PLAYER_INDEX_PATH=path map this file instead of loading
+    the catalog from Firestore themselves; re-running this replaces it atomically
+    and workers pick the new file up within PLAYER_INDEX_CHECK_SECONDS.
+    """
+    if not player_search_service.db:
+        raise RuntimeError("Firebase not configured")
+
+    index = player_search_service.build_index()
+    index.save(path)
+    return len(index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the shared player search index file")
+    parser.add_argument("--path", default=settings.PLAYER_INDEX_PATH or DEFAULT_INDEX_PATH)
+    args = parser.parse_args()
+
+    count = build_player_index(args.path)
+    print(f"Wrote {count} players to {args.path}")
@@ -0,0 +1,72 @@
+"""
+Import-time budget for the API module.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter (best of
+--runs), and fails if the cumulative import time of `main` exceeds the budget
+or if a module that should only load on first use (LAZY_MODULES) was imported.
+CI runs this so a new top-level import of a heavy library shows up as a
+failure instead of slower worker spawns and reloads.
+
+    python scripts/check_import_time.py --budget-ms 1200
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import os
+import re
+import subprocess
+from typing import Dict, Tuple
+
+SERVER_DIR = Path(__file__).parent.parent
+
+# Imported by the code paths that need them, never by `import main`
+LAZY_MODULES = ["firebase_admin", "google.cloud.firestore", "rapidfuzz", "jwt", "pybaseball", "pandas"]
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str = "main") -> Tuple[float, Dict[str, int]]:
+    """Cumulative import time of `module` in ms, and every imported module's cumulative time in us"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": str(SERVER_DIR)},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    imported = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            imported[match.group(4)] = int(match.group(2))
+    return imported[module] / 1000, imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if importing the API is slower than the budget")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", 1200)))
+    parser.add_argument("--runs", type=int, default=3, help="Take the fastest of this many imports")
+    parser.add_argument("--module", default="main")
+    args = parser.parse_args()
+
+    timings = [measure(args.module) for _ in range(args.runs)]
+    elapsed, imported = min(timings, key=lambda timing: timing[0])
+    slowest = sorted(
+        ((us, name) for name, us in imported.items() if "." not in name and name != args.module), reverse=True
+    )[:5]
+
+    print(f"import {args.module}: {elapsed:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for us, name in slowest:
+        print(f"  {name}: {us / 1000:.0f} ms")
+
+    failures = []
+    if elapsed > args.budget_ms:
+        failures.append(f"import {args.module} took {elapsed:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    for name in LAZY_MODULES:
+        if name in imported:
+            failures.append(f"{name} is imported by `import {args.module}`; import it where it is used")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
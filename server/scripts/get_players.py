@@ -2,13 +2,25 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
+import argparse
+import os
+from datetime import date
 from typing import Optional, Dict, List
 from config.firebase import firebase_service  
+from scripts.aggregates import build_season_tables, compute_aggregates
+from scripts.projections import project_players
 from pybaseball import playerid_reverse_lookup, batting_stats
 import requests
 
-current_season = 2024
-start_year = 2015  # Fetch stats from 2015 onwards
+
+def active_season(today: Optional[date] = None) -> int:
+    """The season in progress, or the last one played before spring training (March)"""
+    today = today or date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+current_season = int(os.getenv("CURRENT_SEASON") or active_season())
+start_year = 2015  # Fetch stats from 2015 onwards (scripts/backfill.py loads full history)
 
 
 def get_fangraphs_id(mlbam_id: int) -> Optional[int]:
@@ -32,8 +44,11 @@ def get_player_stats_for_year(fangraphs_id: int, year: int, batting_stats_df) ->
 
     if player_stat.empty:
         return None
-    player_stat_row = player_stat.iloc[0]
+    return season_stats_from_row(player_stat.iloc[0])
 
+
+def season_stats_from_row(player_stat_row) -> Optional[Dict]:
+    """One batting_stats row as a season entry, or None below the PA threshold"""
     # Filter out players with minimal plate appearances (likely pitchers)
     # Require at least 50 PA to have meaningful stats
     plate_appearances = player_stat_row.get('PA', 0)
@@ -101,6 +116,9 @@ def get_player_stats_for_year(fangraphs_id: int, year: int, batting_stats_df) ->
         "avg_exit_velocity": safe_float('EV') if 'EV' in player_stat_row else None,
         "avg_launch_angle": safe_float('LA') if 'LA' in player_stat_row else None,
         
+        # Age during the season (used by the projection age adjustment)
+        "age": safe_int('Age', None),
+        
         # Team
         "team_abbrev": team if team != "- - -" else None
     }
@@ -213,12 +231,25 @@ def upload_all_players() -> None:
             "name": player_name,
             "team_abbrev": team_abbrev,
             "overall_score": overall_score,
+            # Denormalized so search can load the index with a field projection
+            "season_years": sorted(int(year) for year in all_seasons),
+            "career_pa": sum(stats.get("plate_appearances", 0) for stats in all_seasons.values()),
             "seasons": all_seasons
         }
         
         all_players.append(player_data)
         print(f"  ✓ Added: {player_name} - Team: {team_abbrev or 'Free Agent'} - wRC+: {overall_score} - Seasons: {len(all_seasons)}")
     
+    # Career and rolling aggregates for every player in one vectorized pass
+    print(f"\nComputing career and rolling aggregates for {len(all_players)} players...")
+    for player, aggregates in zip(all_players, compute_aggregates([p["seasons"] for p in all_players])):
+        player.update(aggregates)
+    
+    # Next-season projections, stored next to overall_score
+    for player, projection in zip(all_players, project_players([p["seasons"] for p in all_players], current_season + 1)):
+        player["projection"] = projection
+        player["projected_score"] = projection["wrc_plus"] if projection else None
+    
     print(f"\n{'='*60}")
     print(f"Uploading {len(all_players)} players to Firebase...")
     print(f"{'='*60}\n")
@@ -229,10 +260,34 @@ def upload_all_players() -> None:
         db.collection("players").document(player_id).set(player)
         print(f"[{i}/{len(all_players)}] Uploaded {player['name']}")
     
+    # Columnar per-season tables for percentile ranks
+    for year, table in build_season_tables(all_players).items():
+        db.collection("season_stats").document(year).set(table)
+        print(f"Uploaded {year} season table ({len(table['mlbam_id'])} players)")
+    
     print(f"\n{'='*60}")
     print(f"Successfully uploaded {len(all_players)} players!")
     print(f"{'='*60}")
 
 
+def update_current_season() -> None:
+    """Refresh only the current season, writing just the players whose line changed"""
+    from scripts.incremental_ingest import run_incremental_ingest
+    run_incremental_ingest(current_season)
+
+
 if __name__ == "__main__":
-    upload_all_players()
+    parser = argparse.ArgumentParser(description="Load player stats into Firestore")
+    parser.add_argument("--current-season-only", action="store_true",
+                        help=f"Only refresh {current_season} stats and update aggregates incrementally")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Load every season since 1871 through an on-disk intermediate (bounded memory)")
+    args = parser.parse_args()
+    
+    if args.current_season_only:
+        update_current_season()
+    elif args.backfill:
+        from scripts.backfill import run_backfill
+        run_backfill()
+    else:
+        upload_all_players()
@@ -0,0 +1,222 @@
+"""
+Incremental ingest of one season (by default the current one).
+
+Instead of re-fetching every season and re-uploading every player like
+get_players.py, this pulls a single season's batting_stats frame, compares
+it against the stored season entries, and writes only the players whose
+line changed, as field-level updates (`seasons.<year>`, aggregates and
+`overall_score`) grouped into batched commits. The season's columnar
+table is rewritten only if something changed, and for the current season
+the changed players' next-season projections are refreshed against league
+averages from the season tables (scripts/projections.py).
+
+    python scripts/incremental_ingest.py                  # once, current season
+    python scripts/incremental_ingest.py --season 2024
+    python scripts/incremental_ingest.py --loop           # worker: every INGEST_INTERVAL_SECONDS
+
+The API can run the same job in-process (INGEST_SCHEDULE_ENABLED).
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scripts.aggregates import build_season_tables, compute_aggregates, update_season
+
+logger = logging.getLogger(__name__)
+
+# Firestore accepts at most 500 writes per batch
+WRITE_BATCH_SIZE = 400
+
+# Stored fields needed to swap one season into a player's aggregates (and to skip unchanged projections)
+PLAYER_FIELDS = [
+    "mlbam_id", "fangraphs_id", "name", "season_years", "career", "career_rate_pa", "career_sums", "projection",
+]
+
+
+def fetch_season_frame(season: int):
+    """The season's FanGraphs batting table (every hitter, no PA minimum)"""
+    from pybaseball import batting_stats
+    return batting_stats(season, qual=0)
+
+
+def season_lines(frame) -> Tuple[Dict[int, Dict], Dict[int, str]]:
+    """FanGraphs id -> season entry (and -> name), in one pass over the frame"""
+    from scripts.get_players import season_stats_from_row
+    lines, names = {}, {}
+    for _, row in frame.iterrows():
+        stats = season_stats_from_row(row)
+        if stats and int(row["IDfg"]) not in lines:
+            lines[int(row["IDfg"])] = stats
+            names[int(row["IDfg"])] = row["Name"]
+    return lines, names
+
+
+def _field_updates(fields: Dict, season: int, partial_rolling: bool) -> Dict:
+    """update_season() output as Firestore field paths, so untouched seasons and windows are not rewritten"""
+    updates = {}
+    for key, value in fields.items():
+        if key == "seasons":
+            updates[f"seasons.{season}"] = value[str(season)]
+        elif key == "rolling" and partial_rolling:
+            for year, entry in value.items():
+                updates[f"rolling.{year}"] = entry
+        else:
+            updates[key] = value
+    return updates
+
+
+class IncrementalIngest:
+    """Bring one season up to date with field-level writes for changed players only"""
+
+    def __init__(self, db, season: int):
+        self.db = db
+        self.season = season
+
+    def _stream_players(self) -> Iterable:
+        # Neighbouring seasons cover every rolling window the changed season is part of
+        nearby = [f"seasons.{year}" for year in range(self.season - 2, self.season + 3)]
+        return self.db.collection("players").select(PLAYER_FIELDS + nearby).stream()
+
+    def run(self, frame=None) -> Dict:
+        """Apply a season frame (fetched when not given); returns a summary of what was written"""
+        from scripts.get_players import current_season
+        from scripts.projections import update_projections
+
+        start = time.perf_counter()
+        lines, names = season_lines(frame if frame is not None else fetch_season_frame(self.season))
+        key = str(self.season)
+
+        batch, pending = self.db.batch(), 0
+        summary = {"season": self.season, "checked": 0, "updated": 0, "added": 0, "unchanged": 0}
+        table_players: List[Dict] = []
+        changed: Dict[str, Dict] = {}
+
+        def write(apply) -> None:
+            nonlocal batch, pending
+            apply(batch)
+            pending += 1
+            if pending >= WRITE_BATCH_SIZE:
+                batch.commit()
+                batch, pending = self.db.batch(), 0
+
+        for doc in self._stream_players():
+            player = doc.to_dict()
+            summary["checked"] += 1
+            fangraphs_id = player.get("fangraphs_id")
+            stats = lines.pop(int(fangraphs_id), None) if fangraphs_id is not None else None
+            stored = (player.get("seasons") or {}).get(key)
+
+            if stats is None or stats == stored:
+                summary["unchanged"] += 1
+            else:
+                partial = "career" in player and "career_rate_pa" in player
+                if not partial:
+                    # No stored aggregates to update: recompute from the full document
+                    player = self.db.collection("players").document(doc.id).get().to_dict()
+                fields = update_season(player, self.season, stats)
+                if self.season >= max(fields["season_years"]):
+                    fields["overall_score"] = stats.get("wrc_plus", 0)
+                    fields["team_abbrev"] = stats.get("team_abbrev")
+                updates = _field_updates(fields, self.season, partial_rolling=partial)
+                ref = self.db.collection("players").document(doc.id)
+                write(lambda b, ref=ref, updates=updates: b.update(ref, updates))
+                player.setdefault("seasons", {})[key] = stats
+                changed[doc.id] = player
+                summary["updated"] += 1
+
+            if (player.get("seasons") or {}).get(key):
+                table_players.append(player)
+
+        # Hitters with a line this season but no document yet (call-ups, returning veterans)
+        for player in self._new_players(lines, names):
+            ref = self.db.collection("players").document(str(player["mlbam_id"]))
+            write(lambda b, ref=ref, player=player: b.set(ref, player))
+            table_players.append(player)
+            changed[ref.id] = player
+            summary["added"] += 1
+
+        if pending:
+            batch.commit()
+        if summary["updated"] or summary["added"]:
+            table = build_season_tables(table_players, seasons=[self.season]).get(key)
+            if table:
+                self.db.collection("season_stats").document(key).set(table)
+            if self.season >= current_season:
+                # Next season's projections read this season; earlier seasons would project into the past
+                tables = {key: table} if table else {}
+                summary["projections_written"] = update_projections(
+                    self.db, self.season + 1, changed, tables)["written"]
+
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        logger.info("Incremental ingest finished", extra=summary)
+        return summary
+
+    def _new_players(self, lines: Dict[int, Dict], names: Dict[int, str]) -> List[Dict]:
+        """Documents for unmatched FanGraphs ids; only this season is filled (a full run backfills history)"""
+        if not lines:
+            return []
+        from pybaseball import playerid_reverse_lookup
+        ids = playerid_reverse_lookup(list(lines), key_type="fangraphs")
+        players = []
+        for _, row in ids.iterrows():
+            if str(row["key_mlbam"]) == "nan" or int(row["key_fangraphs"]) not in lines:
+                continue
+            fangraphs_id = int(row["key_fangraphs"])
+            stats = lines[fangraphs_id]
+            seasons = {str(self.season): stats}
+            player = {
+                "mlbam_id": int(row["key_mlbam"]),
+                "fangraphs_id": fangraphs_id,
+                "name": names[fangraphs_id],
+                "team_abbrev": stats.get("team_abbrev"),
+                "overall_score": stats.get("wrc_plus", 0),
+                "season_years": [self.season],
+                "career_pa": stats.get("plate_appearances", 0),
+                "seasons": seasons,
+            }
+            player.update(compute_aggregates([seasons])[0])
+            players.append(player)
+        return players
+
+
+def run_incremental_ingest(season: Optional[int] = None, db=None) -> Optional[Dict]:
+    """One incremental run against the configured Firestore (or `db`)"""
+    from scripts.get_players import current_season
+    if db is None:
+        from config.firebase import firebase_service
+        db = firebase_service.db
+    if not db:
+        print("Firebase not configured")
+        return None
+    summary = IncrementalIngest(db, season or current_season).run()
+    print(
+        f"{summary['season']}: {summary['updated']} updated, {summary['added']} added, "
+        f"{summary['unchanged']} unchanged in {summary['seconds']}s"
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Re-ingest one season and write only what changed")
+    parser.add_argument("--season", type=int, help="Season to refresh (default: the current season)")
+    parser.add_argument("--loop", action="store_true", help="Keep running every --interval seconds")
+    parser.add_argument("--interval", type=float, default=settings.INGEST_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    while True:
+        try:
+            run_incremental_ingest(args.season)
+        except Exception:
+            logger.exception("Incremental ingest failed")
+            if not args.loop:
+                raise
+        if not args.loop:
+            break
+        time.sleep(args.interval)
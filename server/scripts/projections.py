@@ -0,0 +1,317 @@
+"""
+Next-season projections (Marcel) for every hitter.
+
+Marcel weights the last three seasons 5/4/3, adds REGRESSION_PA plate
+appearances of league-average production, and applies an age adjustment
+toward a peak at PEAK_AGE:
+
+    rate      = (sum of w * stat + REGRESSION_PA * league rate) / (sum of w * PA + REGRESSION_PA)
+    PA        = 0.5 * PA(last season) + 0.1 * PA(season before) + 200
+    age       = +0.6% per year younger than PEAK_AGE, -0.3% per year older
+
+The league rate a player regresses toward is the league average of the same
+three seasons, weighted by that player's own PA in each. Counting stats are
+projected per PA and scaled by projected PA; AVG, SLG, ISO and OPS are then
+derived from the projected counts. OBP, wOBA and wRC+ are PA-weighted
+rates. Every hitter with a line in the three seasons before the target is
+projected in one pass over dense (player, season, stat) arrays.
+
+A nightly incremental ingest re-projects only the players whose line
+changed (update_projections), taking league averages from the columnar
+`season_stats` tables instead of re-reading every player. The other
+players keep projections made against the previous night's averages until
+the next full run of this script.
+
+The projection is stored on the player document as `projection`, with
+`projected_score` (projected wRC+) next to `overall_score` for the index.
+
+    python scripts/projections.py                # project the season after the current one
+    python scripts/projections.py --season 2025  # project 2025 from 2022-2024
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MARCEL_WEIGHTS = (5, 4, 3)  # One, two and three seasons before the target
+REGRESSION_PA = 1200
+PA_WEIGHTS = (0.5, 0.1)  # Projected PA from the last two seasons...
+BASE_PA = 200            # ...plus this many
+PEAK_AGE = 29
+YOUNG_AGE_RATE = 0.006   # Per year younger than PEAK_AGE
+OLD_AGE_RATE = 0.003     # Per year older
+
+# Projected per PA, then scaled by projected PA
+COUNT_STATS = [
+    "at_bats", "singles", "doubles", "triples", "home_runs", "runs", "rbi",
+    "walks", "strikeouts", "stolen_bases", "caught_stealing", "war",
+]
+# PA-weighted rates, projected directly
+RATE_STATS = ["on_base_percentage", "woba", "wrc_plus"]
+# The age adjustment lowers these when it raises everything else
+LOWER_IS_BETTER = {"strikeouts", "caught_stealing"}
+# Share of plate appearances, not production: no age adjustment
+AGE_NEUTRAL = {"at_bats"}
+
+_PRECISION = 3
+
+
+def _window(target_season: int) -> List[int]:
+    """Seasons feeding a projection, most recent first (aligned with MARCEL_WEIGHTS)"""
+    return [target_season - lag for lag in range(1, len(MARCEL_WEIGHTS) + 1)]
+
+
+def _arrays(seasons_by_player: List[Dict[str, Dict]], years: List[int]):
+    """PA, counting stats, rates and ages as (player, season[, stat]) arrays; missing values are 0 PA / NaN"""
+    shape = (len(seasons_by_player), len(years))
+    pa = np.zeros(shape)
+    counts = np.zeros(shape + (len(COUNT_STATS),))
+    rates = np.full(shape + (len(RATE_STATS),), np.nan)
+    ages = np.full(shape, np.nan)
+    for p, seasons in enumerate(seasons_by_player):
+        for y, year in enumerate(years):
+            stats = (seasons or {}).get(str(year))
+            if not stats:
+                continue
+            pa[p, y] = float(stats.get("plate_appearances") or 0)
+            counts[p, y] = [float(stats.get(stat) or 0) for stat in COUNT_STATS]
+            rates[p, y] = [np.nan if stats.get(stat) is None else float(stats[stat]) for stat in RATE_STATS]
+            if stats.get("age"):
+                ages[p, y] = float(stats["age"])
+    return pa, counts, rates, ages
+
+
+def league_rates(pa: np.ndarray, counts: np.ndarray, rates: np.ndarray):
+    """Per-season league averages: counting stats per PA, and PA-weighted rates"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        league_pa = pa.sum(axis=0)
+        count_rates = counts.sum(axis=0) / league_pa[:, None]
+        has_rate = ~np.isnan(rates)
+        rate_pa = (pa[:, :, None] * has_rate).sum(axis=0)
+        rate_means = (pa[:, :, None] * np.nan_to_num(rates)).sum(axis=0) / rate_pa
+    return np.nan_to_num(count_rates), np.nan_to_num(rate_means)
+
+
+def league_from_tables(tables: List[Optional[Dict]]):
+    """
+    league_rates() from `season_stats/{year}` documents, one per window season
+    (most recent first). A missing table means no hitters that season.
+    """
+    count_rates = np.zeros((len(tables), len(COUNT_STATS)))
+    rate_means = np.zeros((len(tables), len(RATE_STATS)))
+    for y, table in enumerate(tables):
+        if not table or not table.get("plate_appearances"):
+            continue
+        pa = np.asarray([float(value or 0) for value in table["plate_appearances"]])[:, None]
+        counts = np.asarray([[float(value or 0) for value in table[stat]] for stat in COUNT_STATS]).T
+        rates = np.asarray([[np.nan if value is None else float(value) for value in table[stat]]
+                            for stat in RATE_STATS]).T
+        season_counts, season_means = league_rates(pa, counts[:, None, :], rates[:, None, :])
+        count_rates[y], rate_means[y] = season_counts[0], season_means[0]
+    return count_rates, rate_means
+
+
+def age_factor(ages: np.ndarray) -> np.ndarray:
+    """Marcel age multiplier for each projected age; 1 where the age is unknown"""
+    factor = np.where(
+        ages < PEAK_AGE,
+        1 + (PEAK_AGE - ages) * YOUNG_AGE_RATE,
+        1 + (PEAK_AGE - ages) * OLD_AGE_RATE,
+    )
+    return np.where(np.isnan(ages), 1.0, factor)
+
+
+def project_players(seasons_by_player: List[Dict[str, Dict]], target_season: int,
+                    league=None) -> List[Optional[Dict]]:
+    """
+    Projections for `target_season`, one per input: a dict shaped like a season
+    line (plus `season`, `age` and `reliability`), or None for players without
+    a line in the three seasons before it. League averages come from the same
+    input, so pass the whole catalog (or at least every recent hitter), or
+    pass `league` (league_from_tables()) to project any subset.
+    """
+    years = _window(target_season)
+    pa, counts, rates, ages = _arrays(seasons_by_player, years)
+    projected = pa.sum(axis=1) > 0
+    if not projected.any():
+        return [None] * len(seasons_by_player)
+    league_counts, league_means = league if league is not None else league_rates(pa, counts, rates)
+
+    weights = np.asarray(MARCEL_WEIGHTS, dtype=np.float64)
+    weighted_pa = pa * weights                                    # (player, season)
+    total_pa = weighted_pa.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # The league rate each player regresses toward: their own seasons, weighted by their PA
+        share = np.where(total_pa[:, None] > 0, weighted_pa / total_pa[:, None], 0.0)
+        count_target = share @ league_counts                      # (player, stat)
+        count_rate = ((weights[None, :, None] * counts).sum(axis=1) + REGRESSION_PA * count_target) \
+            / (total_pa[:, None] + REGRESSION_PA)
+
+        has_rate = ~np.isnan(rates)
+        rate_pa = (weighted_pa[:, :, None] * has_rate).sum(axis=1)
+        rate_share = np.where(rate_pa[:, None, :] > 0, weighted_pa[:, :, None] * has_rate / rate_pa[:, None, :], 0.0)
+        rate_target = (rate_share * league_means[None, :, :]).sum(axis=1)
+        rate_value = ((weighted_pa[:, :, None] * np.nan_to_num(rates)).sum(axis=1) + REGRESSION_PA * rate_target) \
+            / (rate_pa + REGRESSION_PA)
+
+    # Age in the target season, from the most recent season with a known age
+    known = ~np.isnan(ages)
+    latest = np.argmax(known, axis=1)
+    lag = np.asarray([target_season - year for year in years])[latest]
+    target_age = np.where(known.any(axis=1), ages[np.arange(len(ages)), latest] + lag, np.nan)
+    factor = age_factor(target_age)[:, None]
+    count_factor = np.ones(len(COUNT_STATS))
+    for s, stat in enumerate(COUNT_STATS):
+        if stat in LOWER_IS_BETTER:
+            count_factor[s] = -1
+        elif stat in AGE_NEUTRAL:
+            count_factor[s] = 0
+    # factor ** 1 raises, ** -1 lowers, ** 0 leaves a stat alone
+    count_rate = count_rate * factor ** count_factor[None, :]
+    rate_value = rate_value * factor
+
+    projected_pa = PA_WEIGHTS[0] * pa[:, 0] + PA_WEIGHTS[1] * pa[:, 1] + BASE_PA
+    totals = count_rate * projected_pa[:, None]
+    reliability = total_pa / (total_pa + REGRESSION_PA)
+
+    at_bats = totals[:, COUNT_STATS.index("at_bats")]
+    singles, doubles, triples, home_runs = (totals[:, COUNT_STATS.index(stat)]
+                                            for stat in ("singles", "doubles", "triples", "home_runs"))
+    hits = singles + doubles + triples + home_runs
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average = np.where(at_bats > 0, hits / at_bats, 0.0)
+        slugging = np.where(at_bats > 0, (singles + 2 * doubles + 3 * triples + 4 * home_runs) / at_bats, 0.0)
+
+    results: List[Optional[Dict]] = []
+    for p in range(len(seasons_by_player)):
+        if not projected[p]:
+            results.append(None)
+            continue
+        projection = {
+            "season": target_season,
+            "age": None if np.isnan(target_age[p]) else int(target_age[p]),
+            "plate_appearances": int(round(projected_pa[p])),
+            "hits": int(round(hits[p])),
+        }
+        for s, stat in enumerate(COUNT_STATS):
+            projection[stat] = round(float(totals[p, s]), 1) if stat == "war" else int(round(totals[p, s]))
+        for s, stat in enumerate(RATE_STATS):
+            projection[stat] = round(float(rate_value[p, s]), 1 if stat == "wrc_plus" else _PRECISION)
+        projection["batting_average"] = round(float(average[p]), _PRECISION)
+        projection["slugging_percentage"] = round(float(slugging[p]), _PRECISION)
+        projection["isolated_power"] = round(float(slugging[p] - average[p]), _PRECISION)
+        projection["ops"] = round(projection["on_base_percentage"] + projection["slugging_percentage"], _PRECISION)
+        projection["reliability"] = round(float(reliability[p]), _PRECISION)
+        results.append(projection)
+    return results
+
+
+def run_projections(db, target_season: Optional[int] = None) -> Dict:
+    """
+    Project every recent hitter in the `players` collection and write the
+    projections that changed. Only the target's three prior seasons are read
+    (a field projection), and only players with one of them are kept in memory.
+    """
+    if target_season is None:
+        from scripts.get_players import active_season
+        target_season = active_season() + 1
+
+    start = time.perf_counter()
+    years = _window(target_season)
+    fields = ["mlbam_id", "season_years", "projection"] + [f"seasons.{year}" for year in years]
+    ids, seasons_by_player, stored = [], [], []
+    stale = []
+    for doc in db.collection("players").select(fields).stream():
+        player = doc.to_dict()
+        if set(player.get("season_years") or []) & set(years):
+            ids.append(doc.id)
+            seasons_by_player.append(player.get("seasons") or {})
+            stored.append(player.get("projection"))
+        elif player.get("projection"):
+            stale.append(doc.id)  # Projected before, but no longer has a recent season
+
+    summary = {"season": target_season, "projected": 0, "written": 0, "cleared": 0}
+    updates = _changed(ids, project_players(seasons_by_player, target_season), stored) \
+        + [(doc_id, {"projection": None, "projected_score": None}) for doc_id in stale]
+    _write(db, updates)
+
+    summary["projected"] = len(ids)
+    summary["written"] = len(updates) - len(stale)
+    summary["cleared"] = len(stale)
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info("Projections finished", extra=summary)
+    return summary
+
+
+def update_projections(db, target_season: int, players: Dict[str, Dict], tables: Dict[str, Dict]) -> Dict:
+    """
+    Re-project only `players` (document id -> player with `seasons` and the
+    stored `projection`) and write the projections that changed. League
+    averages come from `tables` (season -> `season_stats` document); window
+    seasons missing from it are read from the `season_stats` collection.
+    """
+    start = time.perf_counter()
+    years = _window(target_season)
+    window_tables = []
+    for year in years:
+        table = tables.get(str(year))
+        if table is None:
+            doc = db.collection("season_stats").document(str(year)).get()
+            table = doc.to_dict() if doc.exists else None
+        window_tables.append(table)
+
+    ids = list(players)
+    projections = project_players([players[doc_id].get("seasons") or {} for doc_id in ids], target_season,
+                                  league=league_from_tables(window_tables))
+    updates = _changed(ids, projections, [players[doc_id].get("projection") for doc_id in ids])
+    _write(db, updates)
+
+    summary = {"season": target_season, "projected": sum(p is not None for p in projections),
+               "written": len(updates), "seconds": round(time.perf_counter() - start, 3)}
+    logger.info("Projections updated", extra=summary)
+    return summary
+
+
+def _changed(ids: List[str], projections: List[Optional[Dict]], stored: List[Optional[Dict]]) -> List[Tuple[str, Dict]]:
+    """Field updates for the projections that differ from the stored ones"""
+    return [
+        (doc_id, {"projection": projection, "projected_score": projection and projection["wrc_plus"]})
+        for doc_id, projection, old in zip(ids, projections, stored)
+        if projection != old
+    ]
+
+
+def _write(db, updates: List[Tuple[str, Dict]]) -> None:
+    """Apply field updates to `players` in batched commits"""
+    from scripts.incremental_ingest import WRITE_BATCH_SIZE
+    batch, pending = db.batch(), 0
+    for doc_id, update in updates:
+        batch.update(db.collection("players").document(doc_id), update)
+        pending += 1
+        if pending >= WRITE_BATCH_SIZE:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write Marcel next-season projections for every recent hitter")
+    parser.add_argument("--season", type=int, help="Season to project (default: the one after the current season)")
+    args = parser.parse_args()
+
+    from config.firebase import firebase_service
+    if not firebase_service.db:
+        print("Firebase not configured")
+    else:
+        summary = run_projections(firebase_service.db, args.season)
+        print(f"{summary['season']}: {summary['projected']} projected, {summary['written']} written, "
+              f"{summary['cleared']} cleared in {summary['seconds']}s")
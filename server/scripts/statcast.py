@@ -0,0 +1,148 @@
+"""
+Pitch-level Statcast ingest into date-partitioned Parquet.
+
+Fetches pitches with pybaseball's `statcast` `--chunk-days` at a time and
+writes one file per game date under the store root (utils/statcast.py), keeping
+only the columns aggregates need. A chunk is about 4,000 pitches per game day,
+so memory stays flat however long the range is.
+
+    python scripts/statcast.py --start 2024-03-20 --end 2024-09-30
+    python scripts/statcast.py                  # this season through yesterday
+
+Dates already staged are skipped, so a run resumes where an interrupted one
+stopped and a daily run only fetches the new days. The last `--recent-days`
+are fetched again every run, because Statcast still corrects pitches for a
+day or two after the games. Days without games get an empty file so they are
+not fetched again; pass `--refetch` to fetch every date again.
+
+The API serves aggregates from the same directory (STATCAST_DIR).
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from config.settings import settings
+from utils.statcast import StatcastStore, pitch_schema
+
+logger = logging.getLogger(__name__)
+
+FIRST_STATCAST_SEASON = 2008  # Pitch tracking starts here; batted-ball data in 2015
+DEFAULT_STATCAST_DIR = os.path.join(tempfile.gettempdir(), "cybermetrics-statcast")
+
+
+def fetch_pitches(start: date, end: date):
+    """Every pitch thrown from start to end (inclusive), one row per pitch"""
+    from pybaseball import statcast
+    return statcast(start_dt=start.isoformat(), end_dt=end.isoformat(), verbose=False)
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def _runs(days: List[date], size: int) -> List[List[date]]:
+    """Consecutive dates split into chunks of at most `size`, never spanning a gap"""
+    chunks: List[List[date]] = []
+    for day in days:
+        if chunks and len(chunks[-1]) < size and day - chunks[-1][-1] == timedelta(days=1):
+            chunks[-1].append(day)
+        else:
+            chunks.append([day])
+    return chunks
+
+
+def to_pitch_table(frame):
+    """A statcast frame as a PITCH_COLUMNS table; columns missing from older seasons are null"""
+    import pyarrow as pa
+
+    schema = pitch_schema()
+    columns = {}
+    for field in schema:
+        if field.name not in frame.columns:
+            columns[field.name] = pa.nulls(len(frame), field.type)
+        elif field.name == "game_date":
+            columns[field.name] = pa.array(frame[field.name].astype("datetime64[ns]").dt.date, field.type)
+        else:
+            columns[field.name] = pa.array(frame[field.name], from_pandas=True).cast(field.type)
+    return pa.table(columns, schema=schema)
+
+
+class StatcastIngest:
+    """Fetch missing game dates in chunks and stage one Parquet file per date"""
+
+    def __init__(self, store: StatcastStore, chunk_days: int = 7, recent_days: int = 3,
+                 fetch: Callable = fetch_pitches):
+        self.store = store
+        self.chunk_days = chunk_days
+        self.recent_days = recent_days
+        self.fetch = fetch
+
+    def missing(self, start: date, end: date, refetch: bool = False) -> List[date]:
+        """Dates to fetch: unstaged ones, plus the last `recent_days` before end"""
+        staged = set(self.store.dates(start, end))
+        recent = end - timedelta(days=self.recent_days)
+        return [day for day in _days(start, end) if refetch or day > recent or day not in staged]
+
+    def run(self, start: date, end: date, refetch: bool = False) -> Dict:
+        """Stage start..end; returns a summary with day and pitch counts"""
+        import pyarrow.compute as pc
+        from scripts.backfill import _peak_rss_mb
+
+        began = time.perf_counter()
+        start = max(start, date(FIRST_STATCAST_SEASON, 1, 1))
+        missing = self.missing(start, end, refetch)
+        summary = {"start": start.isoformat(), "end": end.isoformat(), "fetched_days": len(missing),
+                   "game_days": 0, "pitches": 0}
+        # Each fetch covers consecutive missing dates only, so staged days between them are not pulled again
+        for chunk in _runs(missing, self.chunk_days):
+            table = to_pitch_table(self.fetch(chunk[0], chunk[-1]))
+            dates = table.column("game_date")
+            for day in chunk:
+                rows = table.filter(pc.equal(dates, day))
+                # Off days are staged empty too, so resumes skip them
+                self.store.write_day(day, rows)
+                if rows.num_rows:
+                    summary["game_days"] += 1
+                    summary["pitches"] += rows.num_rows
+            print(f"Staged {chunk[0]} to {chunk[-1]} ({table.num_rows} pitches)")
+            del table, dates
+        summary["seconds"] = round(time.perf_counter() - began, 3)
+        summary["peak_rss_mb"] = _peak_rss_mb()
+        logger.info("Statcast ingest finished", extra=summary)
+        return summary
+
+
+def run_statcast_ingest(start: Optional[date] = None, end: Optional[date] = None,
+                        root: str = DEFAULT_STATCAST_DIR, chunk_days: int = 7, recent_days: int = 3,
+                        refetch: bool = False) -> Dict:
+    """Stage start..end (default: January 1 of end's year through yesterday) under `root`"""
+    end = end or date.today() - timedelta(days=1)
+    start = start or date(end.year, 1, 1)
+    summary = StatcastIngest(StatcastStore(root), chunk_days, recent_days).run(start, end, refetch)
+    print(
+        f"{summary['start']} to {summary['end']}: {summary['pitches']} pitches over "
+        f"{summary['game_days']} game days in {summary['seconds']}s (peak RSS {summary['peak_rss_mb']} MB)"
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage pitch-level Statcast data as date-partitioned Parquet")
+    parser.add_argument("--start", type=date.fromisoformat, help="First game date (default: January 1)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last game date (default: yesterday)")
+    parser.add_argument("--dir", default=settings.STATCAST_DIR or DEFAULT_STATCAST_DIR,
+                        help="Store root (the API reads STATCAST_DIR)")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Game dates fetched per request")
+    parser.add_argument("--recent-days", type=int, default=3, help="Trailing dates always fetched again")
+    parser.add_argument("--refetch", action="store_true", help="Fetch already staged dates again")
+    args = parser.parse_args()
+
+    run_statcast_ingest(args.start, args.end, args.dir, args.chunk_days, args.recent_days, args.refetch)
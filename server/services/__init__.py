@@ -1,6 +1,11 @@
 from .auth_service import auth_service
 from .player_search_service import player_search_service
 from .saved_players_service import saved_players_service
+from .export_service import export_service
+from .player_updates_service import player_updates_service
+from .ingest_service import ingest_service
+from .statcast_service import statcast_service
+from .team_service import team_service
 
-__all__ = ["auth_service", "player_search_service", "saved_players_service"]
+__all__ = ["auth_service", "player_search_service", "saved_players_service", "export_service", "player_updates_service", "ingest_service", "statcast_service", "team_service"]
 
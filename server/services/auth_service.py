@@ -1,12 +1,27 @@
-from firebase_admin import auth, firestore
 from fastapi import HTTPException, status
-from config.firebase import firebase_service
+from config.firebase import LazyDatabase, firebase_service
+from config.settings import settings
 from models.auth import LoginRequest, LoginResponse, SignupRequest, SignupResponse
+from utils.resilience import DeadlineExceeded, StorageUnavailable, auth_guard, firestore_guard
+from utils.ttl_cache import TTLCache
+import hashlib
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
 
 class AuthService:
+    db = LazyDatabase()
+
     def __init__(self):
-        self.db = firebase_service.db
-        self.auth = firebase_service.auth
+        # Digests of tokens that recently passed verify_token; admission control trusts only these
+        self._verified: TTLCache[bool] = TTLCache(settings.AUTH_VERIFIED_CACHE_SIZE, settings.AUTH_VERIFIED_CACHE_TTL)
+
+    @property
+    def auth(self):
+        # firebase_admin.auth, imported when Firebase is first initialized
+        return firebase_service.auth
     
     async def signup(self, signup_data: SignupRequest) -> SignupResponse:
         """Create a new user account"""
@@ -16,21 +31,27 @@ class AuthService:
                 detail="Firebase is not configured"
             )
         
+        from firebase_admin.firestore import SERVER_TIMESTAMP
+        
         try:
-            # Create user in Firebase Authentication
-            user = auth.create_user(
-                email=signup_data.email,
-                password=signup_data.password,
-                display_name=signup_data.display_name
+            # Create user in Firebase Authentication (not retried: it is not idempotent)
+            user = await auth_guard.call(
+                "create_user",
+                lambda: self.auth.create_user(
+                    email=signup_data.email,
+                    password=signup_data.password,
+                    display_name=signup_data.display_name
+                ),
+                passthrough=(self.auth.EmailAlreadyExistsError,),
             )
             
             # Store additional user data in Firestore
             user_ref = self.db.collection('users').document(user.uid)
-            user_ref.set({
+            await firestore_guard.call("users.set", lambda: user_ref.set({
                 'email': signup_data.email,
                 'display_name': signup_data.display_name,
-                'created_at': firestore.SERVER_TIMESTAMP,
-            })
+                'created_at': SERVER_TIMESTAMP,
+            }))
             
             return SignupResponse(
                 message="User created successfully",
@@ -38,11 +59,13 @@ class AuthService:
                 email=user.email
             )
         
-        except auth.EmailAlreadyExistsError:
+        except self.auth.EmailAlreadyExistsError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already exists"
             )
+        except (StorageUnavailable, DeadlineExceeded):
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -59,13 +82,20 @@ class AuthService:
         
         try:
             # Get user by email
-            user = auth.get_user_by_email(login_data.email)
+            user = await auth_guard.call(
+                "get_user_by_email", lambda: self.auth.get_user_by_email(login_data.email),
+                idempotent=True, passthrough=(self.auth.UserNotFoundError,),
+            )
             
-            # Generate a custom token for the user
-            custom_token = auth.create_custom_token(user.uid)
+            # Generate a custom token for the user (signing may call the IAM API)
+            custom_token = await auth_guard.call(
+                "create_custom_token", lambda: self.auth.create_custom_token(user.uid), idempotent=True
+            )
             
             # Get user data from Firestore
-            user_doc = self.db.collection('users').document(user.uid).get()
+            user_doc = await firestore_guard.call(
+                "users.get", self.db.collection('users').document(user.uid).get, idempotent=True
+            )
             
             return LoginResponse(
                 message="Login successful",
@@ -74,17 +104,27 @@ class AuthService:
                 token=custom_token.decode('utf-8')
             )
         
-        except auth.UserNotFoundError:
+        except self.auth.UserNotFoundError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
+        except (StorageUnavailable, DeadlineExceeded):
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Login failed: {str(e)}"
             )
     
+    def remember_verified(self, token: str) -> None:
+        """Record that `token` authenticated a request (the admission priority lane checks this)"""
+        self._verified.set(_token_digest(token), True)
+    
+    def recently_verified(self, token: str) -> bool:
+        """Whether `token` passed verification within AUTH_VERIFIED_CACHE_TTL"""
+        return self._verified.get(_token_digest(token)) is not None
+    
     async def verify_token(self, token: str) -> dict:
         """Verify a custom token by decoding it and checking if user exists"""
         if not self.db:
@@ -110,19 +150,26 @@ class AuthService:
                     detail="Invalid token format"
                 )
             
-            # Verify the user still exists in Firebase
-            user = auth.get_user(uid)
+            # Verify the user still exists in Firebase: off the loop, with a deadline and breaker
+            user = await auth_guard.call(
+                "get_user", lambda: self.auth.get_user(uid),
+                idempotent=True, passthrough=(self.auth.UserNotFoundError,),
+            )
             
+            self.remember_verified(token)
             return {
                 "message": "Token is valid",
                 "user_id": user.uid,
                 "email": user.email
             }
-        except auth.UserNotFoundError:
+        except self.auth.UserNotFoundError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
+        except HTTPException:
+            # Malformed tokens (401), and Firebase Auth unavailable (503) or too slow (504)
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,217 @@
+from fastapi import HTTPException, status
+from config.firebase import LazyDatabase
+from config.settings import settings
+from models.players import SeasonStats, SearchFilters
+from services.player_search_service import player_search_service
+from services.saved_players_service import saved_players_service
+from utils.resilience import firestore_guard
+from typing import AsyncIterator, Dict, List, Optional
+import csv
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+# One row per player-season: identity columns, then every SeasonStats field
+STAT_COLUMNS = [
+    ("def" if name == "def_" else name, field.annotation)
+    for name, field in SeasonStats.model_fields.items() if name != "team_abbrev"
+]
+COLUMNS = ["mlbam_id", "name", "season", "team_abbrev"] + [name for name, _ in STAT_COLUMNS]
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Service for streaming bulk stat exports (CSV, Parquet, Arrow IPC)"""
+    db = LazyDatabase()
+
+    def media_type(self, fmt: str) -> str:
+        return EXPORT_FORMATS[fmt][0]
+
+    def filename(self, name: str, fmt: str) -> str:
+        return f"{name}.{EXPORT_FORMATS[fmt][1]}"
+
+    def _check(self, fmt: str) -> None:
+        if not self.db:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Firebase is not configured"
+            )
+        if fmt not in EXPORT_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported export format: {fmt}"
+            )
+        if fmt in ("parquet", "arrow"):
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise HTTPException(
+                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail=f"{fmt} export requires pyarrow to be installed"
+                )
+
+    async def export_saved_players(self, user_id: str, fmt: str) -> AsyncIterator[bytes]:
+        """Season stats for a user's saved players"""
+        self._check(fmt)
+        saved = await saved_players_service.get_all_players(user_id)
+        return self._stream([player.id for player in saved], fmt)
+
+    async def export_players(self, filters: Optional[SearchFilters], fmt: str) -> AsyncIterator[bytes]:
+        """Season stats for every player matching the filters (the whole catalog without filters)"""
+        self._check(fmt)
+        player_ids = await player_search_service.filtered_player_ids(filters)
+        return self._stream(player_ids, fmt)
+
+    def _fetch_batch(self, player_ids: List[int]) -> List[Dict]:
+        refs = [self.db.collection('players').document(str(player_id)) for player_id in player_ids]
+        docs = {
+            doc.id: doc.to_dict()
+            for doc in self.db.get_all(refs, field_paths=["mlbam_id", "name", "seasons"])
+            if doc.exists
+        }
+        # get_all does not preserve order
+        return [docs[str(player_id)] for player_id in player_ids if str(player_id) in docs]
+
+    @staticmethod
+    def _rows(players: List[Dict]) -> Dict[str, list]:
+        """Player documents -> columns with one entry per player-season"""
+        columns = {name: [] for name in COLUMNS}
+        for player in players:
+            for season, stats in sorted((player.get("seasons") or {}).items()):
+                columns["mlbam_id"].append(player.get("mlbam_id"))
+                columns["name"].append(player.get("name"))
+                columns["season"].append(int(season))
+                columns["team_abbrev"].append(stats.get("team_abbrev"))
+                for name, _ in STAT_COLUMNS:
+                    columns[name].append(stats.get(name))
+        return columns
+
+    async def _stream(self, player_ids: List[int], fmt: str) -> AsyncIterator[bytes]:
+        """
+        Fetch players EXPORT_BATCH_SIZE at a time and encode each batch as soon
+        as it arrives, so memory stays bounded by one batch whatever the export size.
+        """
+        encoder = {"csv": _CsvEncoder, "parquet": _ParquetEncoder, "arrow": _ArrowEncoder}[fmt]()
+        batch_size = settings.EXPORT_BATCH_SIZE
+        try:
+            yield encoder.header()
+            for start in range(0, len(player_ids), batch_size):
+                batch = player_ids[start:start + batch_size]
+                # A long export outlives the request budget; each batch still gets the per-call timeout
+                players = await firestore_guard.call(
+                    "players.get_all", lambda: self._fetch_batch(batch), idempotent=True, use_budget=False
+                )
+                chunk = encoder.encode(self._rows(players))
+                if chunk:
+                    yield chunk
+            yield encoder.finish()
+        except Exception:
+            # Headers are already sent; all we can do is cut the stream short
+            logger.exception("Export failed", extra={"format": fmt, "players": len(player_ids)})
+            raise
+
+
+class _CsvEncoder:
+    def header(self) -> bytes:
+        return self._write([COLUMNS])
+
+    def encode(self, columns: Dict[str, list]) -> bytes:
+        return self._write(zip(*(columns[name] for name in COLUMNS)))
+
+    def finish(self) -> bytes:
+        return b""
+
+    @staticmethod
+    def _write(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+
+class _ArrowEncoder:
+    """Arrow IPC stream: schema message, then one record batch per fetched batch"""
+    def __init__(self):
+        import pyarrow as pa
+        self.pa = pa
+        self.schema = _arrow_schema(pa)
+        self.sink = _ChunkSink()
+        self.writer = self._open_writer()
+
+    def _open_writer(self):
+        return self.pa.ipc.new_stream(self.sink, self.schema)
+
+    def header(self) -> bytes:
+        return self.sink.drain()
+
+    def encode(self, columns: Dict[str, list]) -> bytes:
+        if not columns["mlbam_id"]:
+            return b""
+        self._write(self.pa.table(columns, schema=self.schema))
+        return self.sink.drain()
+
+    def _write(self, table) -> None:
+        self.writer.write_table(table)
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+class _ParquetEncoder(_ArrowEncoder):
+    """Parquet file written one row group per fetched batch; the footer goes out last"""
+    def _open_writer(self):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.sink, self.schema, compression="zstd")
+
+    def _write(self, table) -> None:
+        self.writer.write_table(table, row_group_size=len(table))
+
+
+def _arrow_schema(pa):
+    def arrow_type(annotation):
+        return pa.int64() if annotation is int else pa.float64()
+    return pa.schema(
+        [("mlbam_id", pa.int64()), ("name", pa.string()), ("season", pa.int16()), ("team_abbrev", pa.string())]
+        + [(name, arrow_type(annotation)) for name, annotation in STAT_COLUMNS]
+    )
+
+
+# Singleton instance
+export_service = ExportService()
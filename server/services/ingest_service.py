@@ -0,0 +1,81 @@
+from config.firebase import LazyDatabase
+from config.settings import settings
+from services.player_search_service import player_search_service
+from utils.metrics import metrics
+from typing import Dict, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+ingest_runs = metrics.counter(
+    "ingest_runs_total",
+    "Scheduled incremental ingest runs by outcome",
+    ["outcome"],
+)
+ingest_players_written = metrics.counter(
+    "ingest_players_written_total",
+    "Player documents written by incremental ingest (updated or added)",
+    ["kind"],
+)
+
+
+class IngestService:
+    """
+    Runs the incremental ingest of the active season on a schedule inside the
+    API process (INGEST_SCHEDULE_ENABLED). The ingest itself lives in
+    scripts/incremental_ingest.py; pybaseball is only imported when a run starts.
+    """
+    db = LazyDatabase()
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_summary: Optional[Dict] = None
+    
+    async def run_once(self) -> Optional[Dict]:
+        """Ingest the season off the event loop, then refresh season tables so readers see it"""
+        if not self.db:
+            logger.warning("Skipping scheduled ingest: Firebase is not configured")
+            return None
+        from scripts.get_players import active_season
+        from scripts.incremental_ingest import IncrementalIngest
+        
+        season = settings.INGEST_SEASON or active_season()
+        try:
+            summary = await asyncio.to_thread(IncrementalIngest(self.db, season).run)
+        except Exception:
+            ingest_runs.inc(outcome="error")
+            raise
+        ingest_runs.inc(outcome="ok")
+        ingest_players_written.inc(summary["updated"], kind="updated")
+        ingest_players_written.inc(summary["added"], kind="added")
+        self.last_summary = summary
+        if summary["updated"] or summary["added"]:
+            # Rebuilds the changed season table now, which also notifies update subscribers
+            await player_search_service.refresh(force=True)
+        return summary
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Scheduled ingest failed")
+            await asyncio.sleep(settings.INGEST_INTERVAL_SECONDS)
+
+
+# Singleton instance
+ingest_service = IngestService()
@@ -1,26 +1,198 @@
-from rapidfuzz import process, fuzz
 from fastapi import HTTPException, status
-from models.players import PlayerSearchResult, PlayerDetail, SeasonStats
-from config.firebase import firebase_service
-from typing import List, Dict
+from models.players import (
+    PlayerSearchResult, SearchFilters, BatchSearchResult, PlayerDetail, PlayerPercentiles,
+    SeasonStats, CareerStats, RollingStats, Projection, LeaderboardEntry
+)
+from config.firebase import LazyDatabase
+from config.settings import settings
+from utils.player_index import INDEX_FIELDS, PlayerIndex, file_signature
+from utils.season_table import SeasonTable
+from utils.single_flight import SingleFlight
+from utils.ttl_cache import TTLCache
+from utils.metrics import track_backend, record_cache, player_index_size, player_index_age
+from utils.resilience import DeadlineExceeded, StorageUnavailable, firestore_guard, storage_fallbacks
+from typing import Callable, List, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Catalog rows scored per cdist call in batch search; bounds the score matrix to
+# queries x BATCH_SEARCH_CHUNK floats however large the catalog is
+BATCH_SEARCH_CHUNK = 100_000
+
+# Index columns a leaderboard can rank by
+LEADERBOARD_STATS = ("projected_score", "overall_score")
 
 class PlayerSearchService:
     """Service for searching baseball players from Firebase database"""
+    db = LazyDatabase()
+
     def __init__(self):
-        self.db = firebase_service.db
-        self._players_cache: List[Dict] = []
-        self._cache_loaded = False
+        self._index: Optional[PlayerIndex] = None
+        self._index_loaded_at: Optional[float] = None
+        self._index_signature = None
+        self._index_checked_at = 0.0
+        # Coalesce concurrent index loads and identical detail lookups
+        self._index_flight = SingleFlight("player_index_load")
+        self._detail_flight = SingleFlight("player_detail")
+        # Per-season stat tables backing percentile ranks, keyed by season
+        self._season_tables: Dict[int, SeasonTable] = {}
+        self._season_tables_checked_at: Optional[float] = None
+        self._season_flight = SingleFlight("season_tables_load")
+        # Called with {mlbam_id: change} after a refresh finds changed players
+        self._change_listeners: List[Callable[[Dict[int, Dict]], None]] = []
+        # Full season data is only fetched per player, on demand
+        self._detail_cache: TTLCache[PlayerDetail] = TTLCache(
+            settings.PLAYER_DETAIL_CACHE_SIZE, settings.PLAYER_DETAIL_CACHE_TTL
+        )
     
-    def _load_database(self):
-        """Load all players from Firebase into memory for fast searching"""
-        if not self._cache_loaded and self.db:
-            try:
+    def build_index(self) -> PlayerIndex:
+        """
+        Load the search index from Firebase, fetching only the fields search needs
+        (INDEX_FIELDS) rather than every season's stats.
+        """
+        start = time.perf_counter()
+        with track_backend("firestore", "players.select"):
+            players_ref = self.db.collection('players').select(INDEX_FIELDS).stream()
+            docs = [doc.to_dict() for doc in players_ref]
+        
+        if all("season_years" in doc and "career_pa" in doc for doc in docs):
+            index = PlayerIndex.from_documents(docs)
+        else:
+            # Documents written before the denormalized fields existed; re-run scripts/get_players.py to backfill
+            logger.warning("Players are missing season_years/career_pa; loading full documents for the search index")
+            del docs
+            with track_backend("firestore", "players.stream"):
                 players_ref = self.db.collection('players').stream()
-                self._players_cache = [doc.to_dict() for doc in players_ref]
-                self._cache_loaded = True
-                print(f"Loaded {len(self._players_cache)} players from Firebase")
-            except Exception as e:
-                print(f"Error loading players cache: {e}")
+                index = PlayerIndex.from_documents(doc.to_dict() for doc in players_ref)
+        logger.info(
+            "Loaded %d players from Firebase", len(index),
+            extra={"duration_ms": round((time.perf_counter() - start) * 1000, 3)},
+        )
+        return index
+    
+    def _set_index(self, index: PlayerIndex) -> None:
+        self._index = index
+        self._index_loaded_at = time.monotonic()
+    
+    def add_change_listener(self, listener: Callable[[Dict[int, Dict]], None]) -> None:
+        """Register a callback for players whose data changed in a refresh (runs on the event loop)"""
+        self._change_listeners.append(listener)
+    
+    def _notify(self, changes: Dict[int, Dict]) -> None:
+        if not changes:
+            return
+        for player_id in changes:
+            self._detail_cache.invalidate(player_id)
+        for listener in self._change_listeners:
+            try:
+                listener(changes)
+            except Exception:
+                logger.exception("Player change listener failed")
+    
+    async def refresh(self, force: bool = False) -> None:
+        """
+        Pick up a replaced index file or re-ingested seasons, subject to the usual
+        check intervals unless `force` (e.g. right after an ingest wrote new stats).
+        A forced refresh rebuilds the index from Firestore, and with a shared index
+        file it rewrites the file so the other workers re-map it too.
+        """
+        await self._ensure_index(force)
+        await self._ensure_season_tables(force)
+    
+    def _load_shared_index(self, changes: Dict[int, Dict]) -> bool:
+        """
+        Map the index file built by the production launcher, re-mapping it when it
+        has been replaced. Checks the file at most every PLAYER_INDEX_CHECK_SECONDS.
+        """
+        now = time.monotonic()
+        if self._index is not None and now - self._index_checked_at < settings.PLAYER_INDEX_CHECK_SECONDS:
+            return True
+        self._index_checked_at = now
+        
+        signature = file_signature(settings.PLAYER_INDEX_PATH)
+        if signature is None:
+            return self._index is not None
+        if signature != self._index_signature:
+            changes.update(self._install_index(PlayerIndex.load(settings.PLAYER_INDEX_PATH)))
+            self._index_signature = signature
+            logger.info(
+                "Mapped shared player index with %d players", len(self._index),
+                extra={"path": settings.PLAYER_INDEX_PATH},
+            )
+        return True
+    
+    async def _fetch_index(self) -> PlayerIndex:
+        """build_index under firestore_guard: one shared load, so no request budget applies"""
+        return await firestore_guard.call(
+            "players.index", self.build_index, idempotent=True,
+            use_budget=False, timeout=settings.STORAGE_BULK_TIMEOUT,
+        )
+    
+    def _install_index(self, index: PlayerIndex) -> Dict[int, Dict]:
+        """Swap in a freshly built index; returns the players whose score changed"""
+        previous = self._index
+        self._set_index(index)
+        changes: Dict[int, Dict] = {}
+        if previous is not None:
+            for player_id, score in index.changed_scores(previous).items():
+                changes.setdefault(player_id, {"mlbam_id": player_id})["overall_score"] = score
+        return changes
+    
+    async def _load_database(self, force: bool = False) -> Dict[int, Dict]:
+        """Load all players from Firebase into memory for fast searching"""
+        record_cache("player_index", hit=self._index is not None and not force)
+        changes: Dict[int, Dict] = {}
+        try:
+            if settings.PLAYER_INDEX_PATH:
+                if force and self.db:
+                    # Replaced atomically; this worker re-maps it now, the others within PLAYER_INDEX_CHECK_SECONDS
+                    index = await self._fetch_index()
+                    await asyncio.to_thread(index.save, settings.PLAYER_INDEX_PATH)
+                    self._index_checked_at = float("-inf")
+                if await asyncio.to_thread(self._load_shared_index, changes):
+                    return changes
+            if self.db and (force or not self._index_is_fresh()):
+                index = await self._fetch_index()
+                changes = await asyncio.to_thread(self._install_index, index)
+        except (StorageUnavailable, DeadlineExceeded):
+            # Searches keep using the last good index; the next check or forced refresh tries again
+            if self._index is None:
+                logger.error("Firestore unavailable; no player index loaded yet")
+            else:
+                logger.warning("Firestore unavailable; keeping the player index loaded %.0fs ago",
+                               time.monotonic() - self._index_loaded_at)
+                storage_fallbacks.inc(backend="firestore", operation="players.index")
+                self._index_checked_at = time.monotonic()
+        except Exception:
+            logger.exception("Error loading players cache")
+        return changes
+    
+    async def _reload_index(self, force: bool = False) -> None:
+        self._notify(await self._load_database(force))
+    
+    def _index_is_fresh(self) -> bool:
+        """True when the loaded index can be used without touching Firebase or the index file"""
+        if self._index is None:
+            return False
+        if not settings.PLAYER_INDEX_PATH:
+            # Picks up writes from ingest workers in other processes; 0 keeps the index until a forced refresh
+            # A failed rebuild is retried after PLAYER_INDEX_CHECK_SECONDS rather than on every search
+            now = time.monotonic()
+            ttl = settings.PLAYER_INDEX_TTL_SECONDS
+            return (not ttl or now - self._index_loaded_at < ttl
+                    or now - self._index_checked_at < settings.PLAYER_INDEX_CHECK_SECONDS)
+        return time.monotonic() - self._index_checked_at < settings.PLAYER_INDEX_CHECK_SECONDS
+    
+    async def _ensure_index(self, force: bool = False) -> None:
+        """Load the index off the event loop; concurrent cold-start searches share one load"""
+        if not force and self._index_is_fresh():
+            record_cache("player_index", hit=True)
+            return
+        await self._index_flight.do(("players", force), lambda: self._reload_index(force))
     
     def _get_player_image_url(self, player_id: int) -> str:
         """Generate MLB player headshot URL"""
@@ -43,9 +215,45 @@ class PlayerSearchService:
             return first_year
         return f"{first_year}-{last_year}"
     
-    async def search(self, query: str, limit: int = 5, score_cutoff: int = 60) -> List[PlayerSearchResult]:
+    def _eligible_rows(self, index: PlayerIndex, filters: Optional[SearchFilters]) -> Optional[np.ndarray]:
+        """Index rows passing the filters, or None to search the whole catalog"""
+        if filters is None:
+            return None
+        return index.filter_rows(
+            team_abbrev=filters.team_abbrev or None,
+            season=filters.season,
+            min_career_pa=filters.min_career_pa,
+            min_overall_score=filters.min_overall_score,
+        )
+    
+    async def filtered_player_ids(self, filters: Optional[SearchFilters] = None) -> List[int]:
+        """MLBAM ids of every indexed player matching the filters (all players without filters)"""
+        await self._ensure_index()
+        index = self._index
+        if index is None:
+            return []
+        rows = self._eligible_rows(index, filters)
+        ids = index.mlbam_ids if rows is None else index.mlbam_ids[rows]
+        return ids.tolist()
+    
+    @staticmethod
+    def _choices(index: PlayerIndex, rows: Optional[np.ndarray]) -> List[str]:
+        """Fuzzy-match choices: every name, or only the eligible rows' names"""
+        names = index.names_lower
+        if rows is None:
+            return names
+        return [names[row] for row in rows.tolist()]
+    
+    async def search(
+        self,
+        query: str,
+        limit: int = 5,
+        score_cutoff: int = 60,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[PlayerSearchResult]:
         """
         Search for players by name using fuzzy matching from Firebase.
+        Filters narrow the candidate rows first, so the scorer only sees eligible players.
         This is a public search - no authentication required.
         """
         if not self.db:
@@ -54,42 +262,340 @@ class PlayerSearchService:
                 detail="Firebase is not configured"
             )
         
-        self._load_database()
+        await self._ensure_index()
         
         q = (query or "").strip()
         if not q:
             return []
         
-        # Extract player names for fuzzy matching
-        player_names = [p.get("name", "") for p in self._players_cache]
-        player_names_lower = [n.lower() for n in player_names]
+        index = self._index
+        if index is None:
+            return []
+        
+        from rapidfuzz import process, fuzz
         
+        rows = self._eligible_rows(index, filters)
         q_lower = q.lower()
         matches = process.extract(
             q_lower,
-            player_names_lower,
+            self._choices(index, rows),
             limit=limit,
             scorer=fuzz.WRatio,
             score_cutoff=score_cutoff,
         )
 
+        return [
+            self._search_result(index, pos if rows is None else int(rows[pos]), score)
+            for _, score, pos in matches
+        ]
+    
+    def _search_result(self, index: PlayerIndex, row: int, score: float) -> PlayerSearchResult:
+        mlbam_id = int(index.mlbam_ids[row])
+        return PlayerSearchResult(
+            id=mlbam_id,
+            name=index.names[row],
+            score=score,
+            image_url=self._get_player_image_url(mlbam_id),
+            years_active=index.years_active(row)
+        )
+    
+    async def search_batch(
+        self,
+        queries: List[str],
+        limit: int = 3,
+        score_cutoff: float = 60,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[BatchSearchResult]:
+        """
+        Resolve many names at once (e.g. a pasted roster).
+        Scores every query against the catalog in one multithreaded rapidfuzz
+        call instead of one process.extract scan per name.
+        """
+        if not self.db:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Firebase is not configured"
+            )
+        
+        await self._ensure_index()
+        index = self._index
+        cleaned = [(q or "").strip().lower() for q in queries]
+        if index is None or len(index) == 0:
+            return [BatchSearchResult(query=q, matches=[]) for q in queries]
+        
+        # cdist releases the GIL and fans out over all cores; keep it off the event loop
+        rows = self._eligible_rows(index, filters)
+        top_rows, top_scores = await asyncio.to_thread(
+            self._batch_top_matches, index, cleaned, limit, score_cutoff, rows
+        )
+        
         results = []
-        for name, score, idx in matches:
-            player = self._players_cache[idx]
-            mlbam_id = player.get("mlbam_id")
-            seasons = player.get("seasons", {})
+        for i, query in enumerate(queries):
+            matches = []
+            if cleaned[i]:
+                for row, score in zip(top_rows[i], top_scores[i]):
+                    if score < score_cutoff or score == 0:
+                        break
+                    matches.append(self._search_result(index, int(row), float(score)))
+            results.append(BatchSearchResult(query=query, matches=matches))
+        return results
+    
+    @staticmethod
+    def _rank_key(scores: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        One int64 per candidate ordering by score, then lower row (process.extract's
+        tie-break). Non-negative float32 scores order the same as their bit patterns,
+        which fit in 31 bits; the pattern fills the high half and rows below 2**32
+        break ties in the low half, however close two scores are.
+        """
+        bits = np.ascontiguousarray(scores, dtype=np.float32).view(np.int32).astype(np.int64)
+        return (bits << 32) - rows
+    
+    @classmethod
+    def _batch_top_matches(cls, index: PlayerIndex, queries: List[str], limit: int, score_cutoff: float,
+                           rows: Optional[np.ndarray] = None):
+        """Top `limit` (rows, scores) per query, best first, merged across catalog chunks"""
+        from rapidfuzz import process, fuzz
+        
+        names = cls._choices(index, rows)
+        k = min(limit, len(names))
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        if k == 0:
+            return best_rows, best_scores
+        
+        for start in range(0, len(names), BATCH_SEARCH_CHUNK):
+            chunk = names[start:start + BATCH_SEARCH_CHUNK]
+            scores = process.cdist(
+                queries, chunk, scorer=fuzz.WRatio, score_cutoff=score_cutoff,
+                dtype=np.float32, workers=-1,
+            )
+            chunk_rows = np.arange(start, start + len(chunk), dtype=np.int64)
+            chunk_k = min(k, len(chunk))
+            top = np.argpartition(-cls._rank_key(scores, chunk_rows), chunk_k - 1, axis=1)[:, :chunk_k]
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
             
-            results.append(PlayerSearchResult(
-                id=mlbam_id,
-                name=player.get("name", ""),
-                score=score,
-                image_url=self._get_player_image_url(mlbam_id),
-                years_active=self._get_years_active(seasons)
-            ))
+            if best_rows.shape[1] > k:
+                keep = np.argpartition(-cls._rank_key(best_scores, best_rows), k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
         
-        return results
+        order = np.argsort(-cls._rank_key(best_scores, best_rows), axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        if rows is not None:
+            best_rows = rows[best_rows]  # positions among eligible rows -> index rows
+        return best_rows, np.take_along_axis(best_scores, order, axis=1)
+    
+    def _build_season_table(self, document: Dict, current: Optional[SeasonTable]) -> Tuple[SeasonTable, List[int]]:
+        """A season's table from its document, and the players whose line changed since `current`"""
+        table = SeasonTable.from_document(document)
+        # The first load is not a change; later rebuilds report the players that moved
+        if self._season_tables_checked_at is None:
+            return table, []
+        changed = table.changed_ids(current) if current is not None else table.columns["mlbam_id"]
+        return table, changed.tolist()
     
-    async def get_player_detail(self, player_id: int) -> PlayerDetail:
+    async def _refresh_season_tables(self) -> Dict[int, Dict]:
+        """
+        Reload season_stats documents whose updated_at changed since the last check.
+        Unchanged seasons keep their already-built table, so a refresh after the
+        current season is re-ingested only rebuilds that one season. If Firestore
+        is unavailable, the tables from the last good load stay in place.
+        Returns the players whose line changed in a rebuilt season.
+        """
+        changes: Dict[int, Dict] = {}
+        try:
+            collection = self.db.collection('season_stats')
+            stamps = await firestore_guard.call(
+                "season_stats.select",
+                lambda: {doc.id: (doc.to_dict() or {}).get("updated_at")
+                         for doc in collection.select(["updated_at"]).stream()},
+                idempotent=True, use_budget=False, timeout=settings.STORAGE_BULK_TIMEOUT,
+            )
+            
+            tables, rebuilt = {}, 0
+            for season_id, updated_at in stamps.items():
+                current = self._season_tables.get(int(season_id))
+                if current is not None and current.updated_at == updated_at:
+                    tables[current.season] = current
+                    continue
+                doc = await firestore_guard.call(
+                    "season_stats.get", collection.document(season_id).get,
+                    idempotent=True, use_budget=False, timeout=settings.STORAGE_BULK_TIMEOUT,
+                )
+                if doc.exists:
+                    table, changed = await asyncio.to_thread(self._build_season_table, doc.to_dict(), current)
+                    tables[table.season] = table
+                    rebuilt += 1
+                    for player_id in changed:
+                        changes.setdefault(player_id, {"mlbam_id": player_id, "seasons": []})["seasons"].append(table.season)
+            
+            self._season_tables = tables
+            if rebuilt:
+                logger.info("Built %d of %d season tables", rebuilt, len(tables))
+        except (StorageUnavailable, DeadlineExceeded):
+            # Percentiles, leaderboards and summaries keep using the last good tables until the next check
+            logger.warning("Firestore unavailable; keeping %d season tables", len(self._season_tables))
+            if self._season_tables:
+                storage_fallbacks.inc(backend="firestore", operation="season_stats")
+        except Exception:
+            logger.exception("Error loading season tables")
+        finally:
+            self._season_tables_checked_at = time.monotonic()
+        return changes
+    
+    async def _reload_season_tables(self) -> None:
+        self._notify(await self._refresh_season_tables())
+    
+    async def _ensure_season_tables(self, force: bool = False) -> None:
+        checked_at = self._season_tables_checked_at
+        if not force and checked_at is not None and time.monotonic() - checked_at < settings.SEASON_TABLES_REFRESH_SECONDS:
+            return
+        await self._season_flight.do("season_stats", self._reload_season_tables)
+    
+    def _percentiles_by_season(self, player_id: int) -> Dict[str, Dict[str, int]]:
+        result = {}
+        for season, table in sorted(self._season_tables.items()):
+            percentiles = table.percentiles(player_id)
+            if percentiles is not None:
+                result[str(season)] = percentiles
+        return result
+    
+    async def get_player_percentiles(self, player_id: int, season: Optional[int] = None) -> PlayerPercentiles:
+        """
+        Percentile ranks among qualified hitters for one season (default: the
+        player's latest). Each stat is a binary search in a presorted array.
+        """
+        if not self.db:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Firebase is not configured"
+            )
+        
+        await self._ensure_season_tables()
+        
+        tables = self._season_tables
+        if season is None:
+            season = next(
+                (year for year in sorted(tables, reverse=True) if tables[year].row(player_id) is not None),
+                None,
+            )
+        table = tables.get(season) if season is not None else None
+        row = table.row(player_id) if table is not None else None
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No season stats for player {player_id}" + (f" in {season}" if season else "")
+            )
+        
+        return PlayerPercentiles(
+            mlbam_id=player_id,
+            season=season,
+            plate_appearances=int(table.columns["plate_appearances"][row]),
+            qualified=bool(table.qualified[row]),
+            qualifying_pa=table.qualifying_pa,
+            percentiles=table.percentiles(player_id),
+        )
+    
+    async def season_tables(self) -> Dict[int, SeasonTable]:
+        """
+        Every season's table, after the same refresh checks as the index. A table
+        object is replaced only when its season is rebuilt, so callers can cache
+        anything derived from it by identity.
+        """
+        await self._ensure_index()
+        await self._ensure_season_tables()
+        return self._season_tables
+    
+    async def current_summaries(self, player_ids: List[int]) -> List[Optional[Dict]]:
+        """
+        Current catalog data for many players from memory only (index + season
+        tables): name, overall_score, team, and the latest season line.
+        None for ids that are not in the catalog. No Firestore reads per player.
+        """
+        await self._ensure_index()
+        await self._ensure_season_tables()
+        index = self._index
+        if index is None or not player_ids:
+            return [None] * len(player_ids)
+        
+        ids = np.asarray(player_ids, dtype=np.int64)
+        index_rows = index.rows(ids)
+        # Latest season line: walk seasons newest first, filling players not yet found
+        latest_season = np.zeros(len(ids), dtype=np.int64)
+        latest_row = np.full(len(ids), -1, dtype=np.int64)
+        for season in sorted(self._season_tables, reverse=True):
+            missing = latest_row < 0
+            if not missing.any():
+                break
+            rows = self._season_tables[season].rows(ids[missing])
+            latest_row[missing] = rows
+            latest_season[missing] = np.where(rows >= 0, season, 0)
+        
+        summaries = []
+        for i, player_id in enumerate(player_ids):
+            row = int(index_rows[i])
+            if row < 0:
+                summaries.append(None)
+                continue
+            summary = {
+                "id": int(player_id),
+                "name": index.names[row],
+                "image_url": self._get_player_image_url(int(player_id)),
+                "years_active": index.years_active(row),
+                "overall_score": float(index.overall_score[row]),
+                "team_abbrev": index.team_abbrev(row),
+                "latest_season": None,
+                "latest_stats": None,
+            }
+            if latest_row[i] >= 0:
+                summary["latest_season"] = int(latest_season[i])
+                summary["latest_stats"] = self._season_tables[int(latest_season[i])].line(int(latest_row[i]))
+            summaries.append(summary)
+        return summaries
+    
+    async def leaderboard(self, stat: str = "projected_score", limit: int = 25,
+                          filters: Optional[SearchFilters] = None) -> List[LeaderboardEntry]:
+        """
+        Top players by `overall_score` or `projected_score`, from the index only.
+        Players without the stat (no projection) are left out; ties go to the lower row.
+        """
+        if stat not in LEADERBOARD_STATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown leaderboard stat '{stat}'"
+            )
+        await self._ensure_index()
+        index = self._index
+        if index is None:
+            return []
+        
+        values = index.projected_score if stat == "projected_score" else index.overall_score
+        rows = self._eligible_rows(index, filters)
+        rows = np.arange(len(index)) if rows is None else rows
+        rows = rows[~np.isnan(values[rows])]
+        if len(rows) > limit:
+            # Only the top `limit` need sorting: partition first, O(n) over the catalog
+            rows = rows[np.argpartition(-values[rows], limit - 1)[:limit]]
+        rows = rows[np.lexsort((rows, -values[rows]))]
+        
+        projected = index.projected_score
+        return [
+            LeaderboardEntry(
+                rank=rank,
+                id=int(index.mlbam_ids[row]),
+                name=index.names[row],
+                image_url=self._get_player_image_url(int(index.mlbam_ids[row])),
+                years_active=index.years_active(row),
+                team_abbrev=index.team_abbrev(row),
+                overall_score=float(index.overall_score[row]),
+                projected_score=None if np.isnan(projected[row]) else float(projected[row]),
+            )
+            for rank, row in enumerate(rows.tolist(), 1)
+        ]
+    
+    async def get_player_detail(self, player_id: int, include_percentiles: bool = False) -> PlayerDetail:
         """
         Get detailed information for a specific player including all seasons stats.
         Returns the full player document from Firebase with all advanced stats.
@@ -100,8 +606,33 @@ class PlayerSearchService:
                 detail="Firebase is not configured"
             )
         
+        detail = self._detail_cache.get(player_id)
+        record_cache("player_detail", hit=detail is not None)
+        if detail is None:
+            try:
+                # Concurrent requests for the same player share one Firestore read and result
+                detail = await self._detail_flight.do(player_id, lambda: self._fetch_player_detail(player_id))
+            except (StorageUnavailable, DeadlineExceeded):
+                # Firestore is failing or its circuit is open: an expired cached copy beats an error
+                detail = self._detail_cache.get_stale(player_id)
+                if detail is None:
+                    raise
+                storage_fallbacks.inc(backend="firestore", operation="players.get")
+            else:
+                self._detail_cache.set(player_id, detail)
+        
+        if include_percentiles:
+            await self._ensure_season_tables()
+            detail = detail.model_copy(update={"percentiles": self._percentiles_by_season(player_id)})
+        return detail
+    
+    async def _fetch_player_detail(self, player_id: int) -> PlayerDetail:
         try:
-            player_doc = self.db.collection('players').document(str(player_id)).get()
+            player_ref = self.db.collection('players').document(str(player_id))
+            player_doc = await firestore_guard.call(
+                "players.get", player_ref.get, idempotent=True,
+                hedge_after=settings.PLAYER_DETAIL_HEDGE_AFTER or None,
+            )
             
             if not player_doc.exists:
                 raise HTTPException(
@@ -119,6 +650,15 @@ class PlayerSearchService:
                     stats["def_"] = stats.pop("def")
                 seasons_dict[year] = SeasonStats(**stats)
             
+            # Aggregates are materialized at ingest; serve them as stored
+            career = player_data.get("career")
+            if career is not None:
+                if "def" in career:
+                    career["def_"] = career.pop("def")
+                career = CareerStats(**career)
+            rolling = {year: RollingStats(**entry) for year, entry in (player_data.get("rolling") or {}).items()}
+            projection = player_data.get("projection")
+            
             # Build PlayerDetail response
             return PlayerDetail(
                 mlbam_id=player_data.get("mlbam_id"),
@@ -128,7 +668,11 @@ class PlayerSearchService:
                 years_active=self._get_years_active(player_data.get("seasons", {})),
                 team_abbrev=player_data.get("team_abbrev"),
                 overall_score=player_data.get("overall_score", 0.0),
-                seasons=seasons_dict
+                projected_score=player_data.get("projected_score"),
+                projection=Projection(**projection) if projection else None,
+                seasons=seasons_dict,
+                career=career,
+                rolling=rolling
             )
             
         except HTTPException:
@@ -138,7 +682,20 @@ class PlayerSearchService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to get player details: {str(e)}"
             )
+    
+    def index_size(self) -> int:
+        """Number of players in the search index"""
+        return len(self._index) if self._index is not None else 0
+    
+    def index_age_seconds(self) -> Optional[float]:
+        """Seconds since the search index was loaded, or None if not loaded yet"""
+        if self._index_loaded_at is None:
+            return None
+        return time.monotonic() - self._index_loaded_at
 
 
 # Singleton instance
 player_search_service = PlayerSearchService()
+
+player_index_size.set_callback(player_search_service.index_size)
+player_index_age.set_callback(player_search_service.index_age_seconds)
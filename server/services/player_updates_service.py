@@ -0,0 +1,171 @@
+from fastapi import HTTPException, status
+from config.settings import settings
+from services.player_search_service import player_search_service
+from services.saved_players_service import saved_players_service
+from utils.metrics import metrics
+from typing import AsyncIterator, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+player_updates_subscribers = metrics.gauge(
+    "player_updates_subscribers",
+    "Open saved-player update streams",
+)
+player_updates_events = metrics.counter(
+    "player_updates_events_total",
+    "Update events for subscribers; result=queued, or resync when a full queue was replaced",
+    ["result"],
+)
+
+
+class Subscription:
+    """One open update stream: the players it follows and a bounded event queue"""
+    def __init__(self, user_id: str, player_ids: Set[int]):
+        self.user_id = user_id
+        self.player_ids = player_ids
+        self.queue: asyncio.Queue = asyncio.Queue(settings.PLAYER_UPDATES_QUEUE_SIZE)
+
+    def offer(self, event: Dict) -> None:
+        """Queue an event without blocking; a client too slow to keep up gets one resync instead"""
+        try:
+            self.queue.put_nowait(event)
+            player_updates_events.inc(result="queued")
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"event": "resync", "data": {}})
+            player_updates_events.inc(result="resync")
+
+
+class PlayerUpdatesService:
+    """
+    Push stat changes for saved players to subscribed clients.
+    Changes come from the player search service's refresh path (index file
+    re-mapped, season tables rebuilt) and are routed only to the streams that
+    follow a changed player. An idle stream is a small queue and a waiting
+    coroutine; the refresh poller only runs while someone is subscribed.
+    """
+    def __init__(self):
+        self._by_player: Dict[int, Set[Subscription]] = {}
+        self._by_user: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+        self._poller: Optional[asyncio.Task] = None
+        player_search_service.add_change_listener(self.publish)
+
+    async def subscribe(self, user_id: str) -> Subscription:
+        """
+        Prepare a stream following the user's saved players. It is only registered
+        once stream() starts, and unregistered when that generator finishes, so a
+        response that is never sent (client gone, dropped by middleware) holds nothing.
+        """
+        if self._count >= settings.PLAYER_UPDATES_MAX_SUBSCRIBERS:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many update subscribers, please retry later"
+            )
+        saved = await saved_players_service.get_all_players(user_id)
+        return Subscription(user_id, {player.id for player in saved})
+
+    def _register(self, subscription: Subscription) -> None:
+        for player_id in subscription.player_ids:
+            self._by_player.setdefault(player_id, set()).add(subscription)
+        self._by_user.setdefault(subscription.user_id, set()).add(subscription)
+        self._count += 1
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for player_id in subscription.player_ids:
+            self._discard(self._by_player, player_id, subscription)
+        if self._discard(self._by_user, subscription.user_id, subscription):
+            self._count -= 1
+
+    @staticmethod
+    def _discard(registry: Dict, key, subscription: Subscription) -> bool:
+        subscriptions = registry.get(key)
+        if not subscriptions or subscription not in subscriptions:
+            return False
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del registry[key]
+        return True
+
+    def follow(self, user_id: str, player_id) -> None:
+        """Start routing a newly saved player to the user's open streams"""
+        player_id = _player_key(player_id)
+        if player_id is None:
+            return
+        for subscription in self._by_user.get(user_id, ()):
+            subscription.player_ids.add(player_id)
+            self._by_player.setdefault(player_id, set()).add(subscription)
+
+    def unfollow(self, user_id: str, player_id) -> None:
+        player_id = _player_key(player_id)
+        for subscription in self._by_user.get(user_id, ()):
+            subscription.player_ids.discard(player_id)
+            self._discard(self._by_player, player_id, subscription)
+
+    def publish(self, changes: Dict[int, Dict]) -> None:
+        """Route changed players to the streams following them: one event per stream per refresh"""
+        if len(changes) <= len(self._by_player):
+            followed = [player_id for player_id in changes if player_id in self._by_player]
+        else:
+            followed = [player_id for player_id in self._by_player if player_id in changes]
+
+        updates: Dict[Subscription, List[Dict]] = {}
+        for player_id in followed:
+            for subscription in self._by_player[player_id]:
+                updates.setdefault(subscription, []).append(changes[player_id])
+        for subscription, players in updates.items():
+            subscription.offer({"event": "players", "data": {"players": players}})
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[str]:
+        """Server-sent events for one subscription, with comment heartbeats while idle"""
+        # Registration and cleanup both belong to the generator: no finally, no registration
+        self._register(subscription)
+        try:
+            yield _sse("ready", {"players": sorted(subscription.player_ids)})
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.PLAYER_UPDATES_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event["event"], event["data"])
+        finally:
+            self.unsubscribe(subscription)
+
+    async def _poll(self) -> None:
+        """Drive the refresh path while anyone is listening (it is otherwise request-driven)"""
+        while self._count:
+            await asyncio.sleep(settings.PLAYER_UPDATES_POLL_SECONDS)
+            try:
+                await player_search_service.refresh()
+            except Exception:
+                logger.exception("Player update refresh failed")
+
+    def subscriber_count(self) -> int:
+        return self._count
+
+
+def _player_key(player_id) -> Optional[int]:
+    """Saved player ids arrive as path/body strings; the index keys on ints"""
+    try:
+        return int(player_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+# Singleton instance
+player_updates_service = PlayerUpdatesService()
+
+player_updates_subscribers.set_callback(player_updates_service.subscriber_count)
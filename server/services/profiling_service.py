@@ -0,0 +1,64 @@
+import hmac
+import random
+from fastapi import HTTPException, status
+from config.settings import settings
+from models.profiles import ProfileSummary
+from utils.profiler import ProfileStore, RequestProfile
+from typing import List, Optional
+
+class ProfilingService:
+    """Service for deciding which requests to profile and serving captured profiles"""
+    def __init__(self):
+        self.admin_token = settings.PROFILING_ADMIN_TOKEN
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval_ms = settings.PROFILING_INTERVAL_MS
+        self.store = ProfileStore(settings.PROFILING_MAX_PROFILES)
+    
+    @property
+    def enabled(self) -> bool:
+        """Profiling is only wired in when a token or sample rate is configured"""
+        return bool(self.admin_token) or self.sample_rate > 0
+    
+    def is_admin(self, token: Optional[str]) -> bool:
+        """Check a token against the configured admin token in constant time"""
+        if not self.admin_token or not token:
+            return False
+        return hmac.compare_digest(token.encode(), self.admin_token.encode())
+    
+    def should_profile(self, token: Optional[str]) -> bool:
+        """Profile when the admin header is present or the request is sampled"""
+        if token is not None and self.is_admin(token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    def _summary(self, profile: RequestProfile) -> ProfileSummary:
+        return ProfileSummary(
+            id=profile.id,
+            method=profile.method,
+            path=profile.path,
+            status_code=profile.status_code,
+            started_at=profile.started_at,
+            duration_ms=round(profile.duration_ms, 3),
+            cpu_ms=round(profile.cpu_ms, 3) if profile.cpu_ms is not None else None,
+            interval_ms=profile.interval_ms,
+            samples=profile.samples,
+            concurrent_requests=profile.concurrent_requests,
+        )
+    
+    async def list_profiles(self) -> List[ProfileSummary]:
+        """List stored profiles, newest first"""
+        return [self._summary(profile) for profile in self.store.list()]
+    
+    async def get_folded(self, profile_id: int, kind: str) -> str:
+        """Get a profile as folded stacks for flamegraph tools"""
+        profile = self.store.get(profile_id)
+        if profile is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Profile {profile_id} not found"
+            )
+        return profile.folded(kind)
+
+
+# Singleton instance
+profiling_service = ProfilingService()
@@ -1,12 +1,13 @@
 from fastapi import HTTPException, status
-from config.firebase import firebase_service
-from models.players import AddPlayerResponse, DeletePlayerResponse, SavedPlayer
+from config.firebase import LazyDatabase
+from models.players import AddPlayerResponse, DeletePlayerResponse, SavedPlayer, HydratedSavedPlayer, SeasonStats
+from services.player_search_service import player_search_service
+from utils.resilience import firestore_guard
 from typing import List
 
 class SavedPlayersService:
     """Service for managing user's saved players in Firestore"""
-    def __init__(self):
-        self.db = firebase_service.db
+    db = LazyDatabase()
     
     async def add_player(self, user_id: str, player_info: dict) -> AddPlayerResponse:
         """Add a player to user's saved players collection"""
@@ -25,7 +26,8 @@ class SavedPlayersService:
                 )
             
             # Save player to user's subcollection in Firestore
-            self.db.collection('users').document(user_id).collection('saved_players').document(player_id).set(player_info)
+            player_ref = self.db.collection('users').document(user_id).collection('saved_players').document(player_id)
+            await firestore_guard.call("saved_players.set", lambda: player_ref.set(player_info))
             
             return AddPlayerResponse(
                 message="Player data added successfully",
@@ -48,20 +50,48 @@ class SavedPlayersService:
             )
         
         try:
-            players_ref = self.db.collection('users').document(user_id).collection('saved_players').stream()
-            saved_players = []
+            players_ref = self.db.collection('users').document(user_id).collection('saved_players')
+            player_docs = await firestore_guard.call(
+                "saved_players.stream",
+                lambda: [player_doc.to_dict() for player_doc in players_ref.stream()],
+                idempotent=True,
+            )
             
-            for player_doc in players_ref:
-                player_data = player_doc.to_dict()
+            saved_players = []
+            for player_data in player_docs:
                 saved_players.append(SavedPlayer(**player_data))
             
             return saved_players
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to retrieve players: {str(e)}"
             )
     
+    async def get_hydrated_players(self, user_id: str) -> List[HydratedSavedPlayer]:
+        """
+        Saved players joined with current catalog stats in one pass.
+        One Firestore read for the saved list; everything else comes from the
+        in-memory index and season tables.
+        """
+        saved_players = await self.get_all_players(user_id)
+        summaries = await player_search_service.current_summaries([player.id for player in saved_players])
+        
+        hydrated = []
+        for saved, summary in zip(saved_players, summaries):
+            data = saved.model_dump()
+            if summary is not None:
+                stats = summary.pop("latest_stats")
+                if stats is not None:
+                    if "def" in stats:
+                        stats["def_"] = stats.pop("def")
+                    summary["latest_stats"] = SeasonStats(**stats)
+                data.update(summary)
+            hydrated.append(HydratedSavedPlayer(**data))
+        return hydrated
+    
     async def get_player(self, user_id: str, player_id: str) -> SavedPlayer:
         """Get a specific saved player for a user"""
         if not self.db:
@@ -72,7 +102,7 @@ class SavedPlayersService:
         
         try:
             player_ref = self.db.collection('users').document(user_id).collection('saved_players').document(player_id)
-            player_doc = player_ref.get()
+            player_doc = await firestore_guard.call("saved_players.get", player_ref.get, idempotent=True)
             
             if not player_doc.exists:
                 raise HTTPException(
@@ -100,7 +130,7 @@ class SavedPlayersService:
         try:
             # Check if player exists
             player_ref = self.db.collection('users').document(user_id).collection('saved_players').document(player_id)
-            player_doc = player_ref.get()
+            player_doc = await firestore_guard.call("saved_players.get", player_ref.get, idempotent=True)
             
             if not player_doc.exists:
                 raise HTTPException(
@@ -109,7 +139,7 @@ class SavedPlayersService:
                 )
             
             # Delete the player
-            player_ref.delete()
+            await firestore_guard.call("saved_players.delete", player_ref.delete)
             
             return DeletePlayerResponse(
                 message="Player deleted successfully"
@@ -0,0 +1,73 @@
+from fastapi import HTTPException, status
+from config.settings import settings
+from models.players import StatcastAggregate, StatcastSplits
+from utils.metrics import track_backend
+from utils.statcast import MAX_BATTER_ID, SPLITS, StatcastStore
+from datetime import date
+from typing import Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StatcastService:
+    """
+    Per-batter Statcast aggregates over date ranges and splits, computed from
+    the date-partitioned pitch store written by scripts/statcast.py (STATCAST_DIR)
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        root = root or settings.STATCAST_DIR
+        self.store: Optional[StatcastStore] = StatcastStore(root) if root else None
+    
+    async def batter_splits(self, player_id: int, start_date: Optional[date] = None,
+                            end_date: Optional[date] = None, split: Optional[str] = None) -> StatcastSplits:
+        """Aggregate one batter's pitches in [start_date, end_date], grouped by `split`"""
+        if self.store is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Statcast data is not configured"
+            )
+        if not 0 <= player_id <= MAX_BATTER_ID:
+            # Not a valid MLBAM id, so there is nothing staged for it
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No Statcast pitches for player {player_id}"
+            )
+        if split is not None and split not in SPLITS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown split '{split}'. Use one of: {', '.join(sorted(SPLITS))}"
+            )
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date must not be after end_date"
+            )
+        
+        try:
+            # Scans Parquet files, so it runs off the event loop
+            with track_backend("statcast", "aggregate"):
+                rows = await asyncio.to_thread(self.store.aggregate, start_date, end_date, [player_id], split)
+        except Exception as e:
+            logger.exception("Statcast aggregation failed", extra={"player_id": player_id})
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to aggregate Statcast data: {str(e)}"
+            )
+        
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No Statcast pitches for player {player_id} in this date range"
+            )
+        return StatcastSplits(
+            mlbam_id=player_id,
+            start_date=start_date,
+            end_date=end_date,
+            split=split,
+            splits=[StatcastAggregate(**row) for row in rows],
+        )
+
+# Singleton instance
+statcast_service = StatcastService()
@@ -0,0 +1,84 @@
+from fastapi import HTTPException, status
+from models.teams import TeamAggregate
+from services.player_search_service import player_search_service
+from utils.metrics import record_cache
+from utils.season_table import SeasonTable
+from utils.single_flight import SingleFlight
+from utils.team_stats import team_aggregates
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TeamService:
+    """
+    Team-season offensive aggregates (utils/team_stats.py), computed from the
+    player search service's season tables and kept in memory. A season's teams
+    are recomputed only when its table is rebuilt, so they refresh together
+    with the player index and season tables.
+    """
+    
+    def __init__(self):
+        # Season -> (the table the teams were computed from, team_abbrev -> aggregate)
+        self._teams: Dict[int, Tuple[SeasonTable, Dict[str, TeamAggregate]]] = {}
+        # Concurrent requests after a rebuild share one recomputation
+        self._flight = SingleFlight("team_aggregates")
+    
+    def _compute(self, tables: Dict[int, SeasonTable]) -> None:
+        """Recompute the seasons whose table changed; unchanged seasons keep their teams"""
+        teams, rebuilt = {}, 0
+        for season, table in tables.items():
+            cached = self._teams.get(season)
+            if cached is None or cached[0] is not table:
+                cached = (table, {row["team_abbrev"]: TeamAggregate(**row) for row in team_aggregates(table)})
+                rebuilt += 1
+            teams[season] = cached
+        self._teams = teams
+        logger.info("Computed team aggregates for %d of %d seasons", rebuilt, len(teams))
+    
+    async def _teams_by_season(self) -> Dict[int, Dict[str, TeamAggregate]]:
+        if not player_search_service.db:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Firebase is not configured"
+            )
+        
+        tables = await player_search_service.season_tables()
+        fresh = self._teams.keys() == tables.keys() and all(
+            self._teams[season][0] is table for season, table in tables.items()
+        )
+        record_cache("team_aggregates", hit=fresh)
+        if not fresh:
+            # A full history is ~1 ms per season, so the first computation runs off the event loop
+            await self._flight.do("teams", lambda: asyncio.to_thread(self._compute, tables))
+        return {season: by_team for season, (_, by_team) in self._teams.items()}
+    
+    async def list_teams(self, season: Optional[int] = None) -> List[TeamAggregate]:
+        """Every team's aggregates for a season (default: the latest), sorted by abbreviation"""
+        teams = await self._teams_by_season()
+        if season is None and teams:
+            season = max(teams)
+        if season not in teams:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No team stats for {season}" if season else "No team stats available"
+            )
+        return [teams[season][abbrev] for abbrev in sorted(teams[season])]
+    
+    async def get_team(self, team_abbrev: str, season: Optional[int] = None) -> TeamAggregate:
+        """One team's aggregates for a season (default: the team's latest)"""
+        teams = await self._teams_by_season()
+        team_abbrev = team_abbrev.upper()
+        if season is None:
+            season = next((year for year in sorted(teams, reverse=True) if team_abbrev in teams[year]), None)
+        team = teams.get(season, {}).get(team_abbrev) if season is not None else None
+        if team is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No team stats for {team_abbrev}" + (f" in {season}" if season else "")
+            )
+        return team
+
+# Singleton instance
+team_service = TeamService()
@@ -0,0 +1,36 @@
+"""
+Shared fixtures: the API wired to the in-memory Firestore stand-in.
+
+benchmarks/load_app.py seeds a synthetic catalog and accepts
+`Authorization: Bearer <user_id>`, so routes run without credentials.
+
+    cd server && python -m pytest -q
+"""
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# A small catalog keeps the session fixture fast
+os.environ.setdefault("LOADTEST_CATALOG_SIZE", "300")
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    from benchmarks.load_app import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def store(app):
+    from benchmarks.load_app import store
+    return store
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from middleware.admission import RATE_LIMITED_PATHS, AdmissionMiddleware
+
+PUBLIC_READS = [
+    "/api/players/search",
+    "/api/players/search/batch",
+    "/api/players/export",
+    "/api/players/leaderboard",
+    "/api/players/660271/detail",
+    "/api/players/660271/percentiles",
+    "/api/players/660271/statcast",
+    "/api/teams",
+    "/api/teams/NYY",
+]
+
+
+@pytest.mark.parametrize("path", PUBLIC_READS)
+def test_public_reads_are_rate_limited(path):
+    assert RATE_LIMITED_PATHS.match(path)
+
+
+@pytest.mark.parametrize("path", ["/api/players/saved", "/api/players/saved/660271", "/api/admin/profiles", "/api/teams/NYY/roster"])
+def test_private_and_admin_paths_are_not_rate_limited(path):
+    assert not RATE_LIMITED_PATHS.match(path)
+
+
+@pytest.fixture
+def limited_client(monkeypatch):
+    """An app behind AdmissionMiddleware with a burst of 2 requests per client"""
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_SECOND", 0.001)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 2)
+    app = FastAPI()
+
+    @app.get("/api/{path:path}")
+    async def echo(path: str):
+        return {"path": path}
+
+    app.add_middleware(AdmissionMiddleware)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", PUBLIC_READS)
+def test_rate_limit_rejects_after_burst(limited_client, path):
+    statuses = [limited_client.get(path).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def _scope(path: str, authorization: str = None) -> dict:
+    headers = [] if authorization is None else [(b"authorization", authorization.encode())]
+    return {"type": "http", "path": path, "headers": headers}
+
+
+@pytest.mark.parametrize("authorization", [None, "x", "Bearer", "Bearer not-a-verified-token"])
+def test_unverified_authorization_is_not_priority(authorization):
+    assert not AdmissionMiddleware._verified_bearer(_scope("/api/players/saved", authorization))
+
+
+def test_recently_verified_bearer_token_is_priority():
+    from services.auth_service import auth_service
+
+    auth_service.remember_verified("verified-token")
+    assert AdmissionMiddleware._verified_bearer(_scope("/api/players/saved", "Bearer verified-token"))
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from benchmarks.catalog import make_catalog
+from scripts.aggregates import compute_aggregates, update_season
+
+
+def _apply(doc, fields, year):
+    """Merge update_season() output the way incremental_ingest's field updates do"""
+    doc = dict(doc)
+    doc["seasons"] = {**doc["seasons"], str(year): fields["seasons"][str(year)]}
+    doc["rolling"] = {**doc.get("rolling", {}), **fields["rolling"]}
+    for key in ("season_years", "career", "career_rate_pa", "career_sums", "career_pa"):
+        doc[key] = fields[key]
+    return doc
+
+
+def _revise(stats, rng):
+    """A nightly revision of a season line: every stat nudged, as FanGraphs re-publishes it"""
+    revised = dict(stats)
+    for stat, value in stats.items():
+        if isinstance(value, float):
+            revised[stat] = value * rng.uniform(0.9, 1.1)
+        elif isinstance(value, int) and stat != "age":
+            revised[stat] = value + rng.randint(0, 3)
+    return revised
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_successive_updates_match_a_full_rebuild(seed):
+    rng = random.Random(seed)
+    player = next(p for p in make_catalog(50, seed=seed) if len(p["seasons"]) >= 4)
+    seasons = dict(player["seasons"])
+    year = max(int(y) for y in seasons)
+    doc = {"seasons": seasons, "season_years": sorted(int(y) for y in seasons), **compute_aggregates([seasons])[0]}
+
+    for night in range(40):
+        stats = _revise(seasons[str(year)], rng)
+        if night == 20:
+            stats["plate_appearances"] = 0  # A season with no plate appearances counts for nothing
+        doc = _apply(doc, update_season(doc, year, stats), year)
+        seasons = {**seasons, str(year): stats}
+
+    expected = compute_aggregates([seasons])[0]
+    assert doc["career"] == pytest.approx(expected["career"], abs=1e-9)
+    assert doc["career"]["seasons"] == expected["career"]["seasons"]
+    assert doc["career_rate_pa"] == expected["career_rate_pa"]
+    assert doc["career_sums"] == pytest.approx(expected["career_sums"], rel=1e-9)
+    assert doc["rolling"] == expected["rolling"]
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+import types
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from config.settings import settings
+from services.auth_service import AuthService
+from utils.resilience import CircuitBreaker, auth_guard
+
+
+class UserNotFoundError(Exception):
+    pass
+
+
+@pytest.fixture
+def fake_auth(monkeypatch, store):
+    """firebase_admin.auth stand-in whose get_user the test controls"""
+    auth = types.SimpleNamespace(UserNotFoundError=UserNotFoundError, EmailAlreadyExistsError=ValueError)
+    monkeypatch.setattr(AuthService, "auth", property(lambda self: auth))
+    monkeypatch.setattr(auth_guard, "breaker", CircuitBreaker("firebase_auth", 5, 10))
+    monkeypatch.setattr(settings, "STORAGE_CALL_TIMEOUT", 0.2)
+    monkeypatch.setattr(settings, "STORAGE_RETRY_BACKOFF", 0.001)
+    return auth
+
+
+def _verify(uid: str = "user-1"):
+    token = jwt.encode({"uid": uid}, "secret", algorithm="HS256")
+    return asyncio.run(AuthService().verify_token(token))
+
+
+def test_verify_token_runs_off_the_event_loop(fake_auth):
+    threads = []
+
+    def get_user(uid):
+        threads.append(threading.get_ident())
+        return types.SimpleNamespace(uid=uid, email=f"{uid}@example.com")
+
+    fake_auth.get_user = get_user
+    assert _verify()["user_id"] == "user-1"
+    assert threads and threads[0] != threading.get_ident()  # asyncio.run's loop is on this thread
+
+
+def test_unknown_user_is_401_and_not_a_backend_failure(fake_auth):
+    def get_user(uid):
+        raise UserNotFoundError(uid)
+
+    fake_auth.get_user = get_user
+    with pytest.raises(HTTPException) as error:
+        _verify()
+    assert error.value.status_code == 401
+    assert auth_guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_auth_backend_is_504(fake_auth):
+    fake_auth.get_user = lambda uid: time.sleep(1)
+    with pytest.raises(HTTPException) as error:
+        _verify()
+    assert error.value.status_code == 504
+
+
+def test_failing_auth_backend_is_503(fake_auth):
+    def get_user(uid):
+        raise ConnectionError("auth backend down")
+
+    fake_auth.get_user = get_user
+    with pytest.raises(HTTPException) as error:
+        _verify()
+    assert error.value.status_code == 503
@@ -0,0 +1,43 @@
+import pyarrow as pa
+
+from utils.negotiation import ARROW, JSON, _arrow_stream
+
+ARROW_ACCEPT = {"Accept": ARROW}
+
+
+def _read(body: bytes):
+    return pa.ipc.open_stream(body).read_all()
+
+
+def test_arrow_columns_are_the_union_of_row_keys():
+    table = _read(_arrow_stream([{"a": 1}, {"a": 2, "b": "x"}]))
+    assert table.column_names == ["a", "b"]
+    assert table.to_pylist() == [{"a": 1, "b": None}, {"a": 2, "b": "x"}]
+
+
+def test_arrow_stream_is_none_on_type_clash():
+    assert _arrow_stream([{"a": 1}, {"a": "x"}]) is None
+
+
+def test_saved_players_with_mixed_extra_fields_as_arrow(client):
+    headers = {"Authorization": "Bearer negotiation-mixed"}
+    client.post("/api/players/saved", json={"id": 1, "name": "First"}, headers=headers)
+    client.post("/api/players/saved", json={"id": 2, "name": "Second", "note": "lefty bat"}, headers=headers)
+
+    response = client.get("/api/players/saved", headers={**headers, **ARROW_ACCEPT})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW
+    rows = {row["id"]: row for row in _read(response.content).to_pylist()}
+    assert rows[1]["note"] is None
+    assert rows[2]["note"] == "lefty bat"
+
+
+def test_saved_players_with_clashing_extra_fields_fall_back_to_json(client):
+    headers = {"Authorization": "Bearer negotiation-clash"}
+    client.post("/api/players/saved", json={"id": 1, "name": "First", "rank": 3}, headers=headers)
+    client.post("/api/players/saved", json={"id": 2, "name": "Second", "rank": "top"}, headers=headers)
+
+    response = client.get("/api/players/saved", headers={**headers, **ARROW_ACCEPT})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(JSON)
+    assert {row["rank"] for row in response.json()} == {3, "top"}
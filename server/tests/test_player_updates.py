@@ -0,0 +1,37 @@
+import asyncio
+
+from services.player_updates_service import PlayerUpdatesService
+
+
+def _run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def test_abandoned_stream_holds_no_subscription(client):
+    updates = PlayerUpdatesService()
+
+    async def abandon():
+        subscription = await updates.subscribe("updates-abandoned")
+        updates.stream(subscription)  # Response dropped before its body was iterated
+        return subscription
+
+    subscription = _run(abandon())
+    updates.publish({player_id: {"mlbam_id": player_id} for player_id in range(10)})
+    assert updates.subscriber_count() == 0
+    assert subscription.queue.empty()
+
+
+def test_closed_stream_unregisters(client):
+    updates = PlayerUpdatesService()
+
+    async def open_and_close():
+        headers = {"Authorization": "Bearer updates-closed"}
+        client.post("/api/players/saved", json={"id": 7, "name": "Seven"}, headers=headers)
+        stream = updates.stream(await updates.subscribe("updates-closed"))
+        assert (await stream.__anext__()).startswith("event: ready")
+        assert updates.subscriber_count() == 1
+        await stream.aclose()
+
+    _run(open_and_close())
+    assert updates.subscriber_count() == 0
+    assert updates._by_player == {} and updates._by_user == {}
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+import scripts.get_players
+import scripts.incremental_ingest
+from benchmarks.catalog import make_catalog
+from benchmarks.local_store import LocalFirestore
+from scripts.aggregates import build_season_tables
+from scripts.incremental_ingest import IncrementalIngest
+from scripts.projections import (
+    _arrays, _window, league_from_tables, league_rates, project_players, run_projections,
+)
+
+SEASON = 2024
+
+
+@pytest.fixture
+def catalog():
+    return make_catalog(300, seed=3)
+
+
+def test_league_from_tables_matches_the_player_pass(catalog):
+    years = _window(SEASON + 1)
+    tables = build_season_tables(catalog)
+    expected = league_rates(*_arrays([player["seasons"] for player in catalog], years)[:3])
+    actual = league_from_tables([tables.get(str(year)) for year in years])
+    for want, got in zip(expected, actual):
+        assert got == pytest.approx(want, rel=1e-12)
+
+
+def test_incremental_ingest_reprojects_only_changed_players(catalog, monkeypatch):
+    store = LocalFirestore()
+    store.load_players(catalog)
+    for year, table in build_season_tables(catalog).items():
+        store.collection("season_stats").document(year).set(table)
+    run_projections(store, SEASON + 1)
+    before = {doc.id: doc.to_dict().get("projection") for doc in store.collection("players").stream()}
+
+    rng = random.Random(0)
+    recent = [player for player in catalog if str(SEASON) in player["seasons"]]
+    lines = {}
+    for player in rng.sample(recent, 20):
+        stats = dict(player["seasons"][str(SEASON)])
+        stats["plate_appearances"] += 40
+        stats["home_runs"] += 3
+        stats["wrc_plus"] = round(stats["wrc_plus"] * 1.1, 1)
+        lines[player["fangraphs_id"]] = stats
+    monkeypatch.setattr(scripts.get_players, "current_season", SEASON)
+    monkeypatch.setattr(scripts.incremental_ingest, "season_lines", lambda frame: (dict(lines), {}))
+
+    summary = IncrementalIngest(store, SEASON).run(frame=object())
+
+    assert summary["updated"] == 20
+    assert 0 < summary["projections_written"] <= 20
+    players = {doc.id: doc.to_dict() for doc in store.collection("players").stream()}
+    ids = list(players)
+    expected = dict(zip(ids, project_players([players[doc_id]["seasons"] for doc_id in ids], SEASON + 1)))
+    changed = {str(player["mlbam_id"]) for player in catalog if player["fangraphs_id"] in lines}
+    for doc_id, player in players.items():
+        if doc_id in changed:
+            assert player["projection"] == expected[doc_id]
+        else:
+            assert player.get("projection") == before[doc_id]
@@ -0,0 +1,107 @@
+"""
+Admission control primitives: per-client token buckets and a global
+concurrency limiter with a bounded, two-class (priority/public) wait queue.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets, refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate: float, burst: float, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        # client -> [tokens, last refill time]; least recently seen first
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, client: str) -> float:
+        """Take one token. Returns 0 when allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = [self.burst, now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(client)
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight requests. Public requests may only use
+    `max_concurrency - reserved` slots, so a flood of public traffic always
+    leaves room for priority (authenticated) work; freed slots go to queued
+    priority requests first. Each class has a bounded FIFO queue.
+    """
+
+    def __init__(self, max_concurrency: int, reserved: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.reserved = min(reserved, max_concurrency - 1)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Dict[bool, Deque[asyncio.Future]] = {True: deque(), False: deque()}
+
+    def _limit(self, priority: bool) -> int:
+        return self.max_concurrency if priority else self.max_concurrency - self.reserved
+
+    def queued(self) -> int:
+        return len(self._waiters[True]) + len(self._waiters[False])
+
+    def _has_waiters_ahead(self, priority: bool) -> bool:
+        if priority:
+            return bool(self._waiters[True])
+        return bool(self._waiters[True]) or bool(self._waiters[False])
+
+    async def acquire(self, priority: bool) -> str:
+        """
+        Wait for a slot. Returns "ok" once a slot is held, or the rejection
+        reason ("queue_full" / "queue_timeout") without holding one.
+        """
+        if self.active < self._limit(priority) and not self._has_waiters_ahead(priority):
+            self.active += 1
+            return "ok"
+
+        queue = self._waiters[priority]
+        if len(queue) >= self.max_queue:
+            return "queue_full"
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+            return "ok"
+        except asyncio.TimeoutError:
+            if future.done():
+                return "ok"  # granted just as the timeout fired
+            future.cancel()
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # granted, but the caller went away
+            future.cancel()
+            raise
+        finally:
+            if future in queue:
+                queue.remove(future)
+
+    def release(self) -> None:
+        self.active -= 1
+        for priority in (True, False):
+            queue = self._waiters[priority]
+            while queue and self.active < self._limit(priority):
+                future = queue.popleft()
+                if not future.done():
+                    self.active += 1
+                    future.set_result(None)
@@ -1,21 +1,116 @@
+"""
+Non-blocking structured logging.
+
+Loggers only enqueue records; a background QueueListener thread serializes them
+as JSON and writes them to stdout. The queue is bounded and never blocks the
+caller: when it is full the record is dropped and counted, so a slow stdout
+cannot stall the event loop.
+"""
+import atexit
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from config.settings import settings
+from utils.metrics import metrics
+from utils.request_context import get_request_id
 
-def setup_logger(name: str) -> logging.Logger:
-    """Set up logger with consistent formatting"""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.INFO)
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    handler.setFormatter(formatter)
-    
-    logger.addHandler(handler)
-    return logger
+log_records_dropped = metrics.counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+)
+log_queue_depth = metrics.gauge(
+    "log_queue_depth",
+    "Log records waiting to be written",
+)
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Capture request context on the calling thread/task; leave JSON work to the listener
+        record.request_id = get_request_id()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped.inc()
 
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """
+    Route all logging through a bounded queue drained by a background thread.
+    Safe to call more than once; only the first call installs handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.setLevel(level or settings.LOG_LEVEL)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(BoundedQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    log_queue_depth.set_callback(log_queue.qsize)
+
+
+def setup_logger(name: str) -> logging.Logger:
+    """Get a logger that writes through the shared non-blocking pipeline"""
+    setup_logging()
+    return logging.getLogger(name)
@@ -0,0 +1,123 @@
+"""
+Content negotiation for API responses.
+
+Routes keep returning Pydantic models. FastAPI turns them into plain
+dicts/lists through the route's response_model, and NegotiatedResponse then
+encodes that content in the format the client's Accept header prefers:
+
+    application/json                      default
+    application/msgpack                   any response
+    application/vnd.apache.arrow.stream   list responses (one row per item)
+
+The encoded fields are the same as in the JSON body. Arrow columns are the
+union of every row's keys (null where a row lacks one); rows whose values
+cannot share a column type are sent as JSON instead.
+"""
+import io
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.background import BackgroundTask
+
+from utils.request_context import accept_var
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+_WILDCARDS = {"*/*", "application/*"}
+
+
+def parse_accept(header: Optional[str]) -> List[str]:
+    """Media types from an Accept header, most preferred first (q=0 dropped)"""
+    ranked = []
+    for position, part in enumerate((header or "").split(",")):
+        media, _, params = part.strip().partition(";")
+        if not media:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranked.append((-quality, position, media.strip().lower()))
+    return [media for _, _, media in sorted(ranked)]
+
+
+@lru_cache(maxsize=None)
+def _available(media_type: str) -> bool:
+    """Binary formats need their (optional) encoder installed"""
+    module = {MSGPACK: "msgpack", ARROW: "pyarrow"}.get(media_type)
+    if module is None:
+        return True
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def choose_media_type(accept: Optional[str], tabular: bool) -> str:
+    """Best supported media type for an Accept header; JSON when nothing else fits"""
+    offered = (MSGPACK, ARROW, JSON) if tabular else (MSGPACK, JSON)
+    for media in parse_accept(accept):
+        media = _ALIASES.get(media, media)
+        if media in offered and _available(media):
+            return media
+        if media in _WILDCARDS:
+            return JSON
+    return JSON
+
+
+class NegotiatedResponse(JSONResponse):
+    """JSONResponse that switches to MessagePack or Arrow IPC when the client asks for it"""
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        if media_type is None:
+            tabular = isinstance(content, list) and all(isinstance(item, dict) for item in content)
+            media_type = choose_media_type(accept_var.get(), tabular)
+        headers = {**(headers or {}), "vary": "Accept"}
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK:
+            import msgpack
+            return msgpack.packb(content, use_bin_type=True)
+        if self.media_type == ARROW:
+            body = _arrow_stream(content)
+            if body is not None:
+                return body
+            # Headers are built after render, so the response goes out as JSON
+            self.media_type = JSON
+        return super().render(content)
+
+
+def _arrow_stream(rows: List[dict]) -> Optional[bytes]:
+    """Rows as an Arrow IPC stream, or None when a column's values have no common type"""
+    import pyarrow as pa
+    # Extra fields (models with extra="allow") can appear in any row, not just the first
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+    try:
+        table = pa.table({key: pa.array([row.get(key) for row in rows]) for key in keys})
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
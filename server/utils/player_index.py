@@ -0,0 +1,307 @@
+"""
+Column-oriented player index shared between worker processes.
+
+The search index is a set of NumPy columns (ids, season span, scores, names).
+It can be saved to a single file and loaded back with mmap, so N uvicorn
+workers map the same physical pages instead of each holding a private copy
+of the catalog.
+
+File layout:
+    MAGIC | header length (uint64 LE) | JSON header | padding | column data...
+Each column is stored raw at a 64-byte aligned offset described in the header.
+String columns are stored as one UTF-8 blob joined by a unit separator.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"CMPIDX01"
+_ALIGN = 64
+_SEPARATOR = "\x1f"  # ASCII unit separator; never appears in player names
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def encode_strings(values: Iterable[str]) -> np.ndarray:
+    """Pack strings into a single uint8 array"""
+    joined = _SEPARATOR.join((v or "").replace(_SEPARATOR, " ") for v in values)
+    return np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+
+
+def decode_strings(blob: np.ndarray, count: int) -> List[str]:
+    """Unpack a column written by encode_strings"""
+    if count == 0:
+        return []
+    return blob.tobytes().decode("utf-8").split(_SEPARATOR)
+
+
+def season_span(seasons: Iterable) -> Tuple[int, int]:
+    """First and last season year from a seasons map or list of years (0, 0 if unknown)"""
+    years = [int(year) for year in (seasons or {})]
+    if not years:
+        return 0, 0
+    return min(years), max(years)
+
+
+# The only document fields the index needs; loads project to these
+INDEX_FIELDS = ["mlbam_id", "name", "season_years", "overall_score", "projected_score", "team_abbrev", "career_pa"]
+
+
+def _career_pa(doc: Dict) -> int:
+    """Career plate appearances, denormalized on the document or summed from its seasons"""
+    if doc.get("career_pa") is not None:
+        return int(doc["career_pa"])
+    return sum(int(stats.get("plate_appearances") or 0) for stats in (doc.get("seasons") or {}).values())
+
+
+class PlayerIndex:
+    """Read-only columnar snapshot of the player catalog"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], meta: Optional[Dict] = None, buffer=None):
+        self.columns = columns
+        self.meta = meta or {}
+        self._buffer = buffer  # keeps the mmap alive for memory-mapped columns
+        self._names: Optional[List[str]] = None
+        self._names_lower: Optional[List[str]] = None
+        # facet -> value -> packed bitmap (np.packbits of a row mask), built on first use
+        self._bitmaps: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["mlbam_id"])
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[Dict], meta: Optional[Dict] = None) -> "PlayerIndex":
+        """Build an index from `players` documents (full or projected to INDEX_FIELDS)"""
+        ids, first_years, last_years, scores, projected, names = [], [], [], [], [], []
+        team_codes, career_pa, season_offsets, season_years = [], [], [0], []
+        teams: Dict[str, int] = {}
+        for doc in docs:
+            if doc.get("mlbam_id") is None:
+                continue
+            years = doc.get("season_years")
+            if years is None:
+                years = [int(year) for year in (doc.get("seasons") or {})]
+            first, last = season_span(years)
+            ids.append(int(doc["mlbam_id"]))
+            first_years.append(first)
+            last_years.append(last)
+            scores.append(float(doc.get("overall_score") or 0.0))
+            projected_score = doc.get("projected_score")
+            projected.append(np.nan if projected_score is None else float(projected_score))
+            names.append(sys.intern(doc.get("name") or ""))
+            team = doc.get("team_abbrev")
+            team_codes.append(teams.setdefault(team, len(teams)) if team else -1)
+            career_pa.append(_career_pa(doc))
+            season_years.extend(sorted(int(year) for year in years))
+            season_offsets.append(len(season_years))
+
+        mlbam_ids = np.asarray(ids, dtype=np.int64)
+        order = np.argsort(mlbam_ids, kind="stable")
+        columns = {
+            "mlbam_id": mlbam_ids,
+            "first_year": np.asarray(first_years, dtype=np.int16),
+            "last_year": np.asarray(last_years, dtype=np.int16),
+            "overall_score": np.asarray(scores, dtype=np.float64),
+            "projected_score": np.asarray(projected, dtype=np.float64),  # NaN: no projection
+            "name": encode_strings(names),
+            "id_order": order.astype(np.int64),
+            "sorted_id": mlbam_ids[order],
+            "team_code": np.asarray(team_codes, dtype=np.int16),
+            "career_pa": np.asarray(career_pa, dtype=np.int32),
+            # Seasons played, CSR style: row i played season_year[season_offset[i]:season_offset[i + 1]]
+            "season_offset": np.asarray(season_offsets, dtype=np.int64),
+            "season_year": np.asarray(season_years, dtype=np.int16),
+        }
+        meta = dict(meta or {}, teams=list(teams))
+        index = cls(columns, meta)
+        index._names = names
+        return index
+
+    @property
+    def mlbam_ids(self) -> np.ndarray:
+        return self.columns["mlbam_id"]
+
+    @property
+    def overall_score(self) -> np.ndarray:
+        return self.columns["overall_score"]
+
+    @property
+    def projected_score(self) -> np.ndarray:
+        """Projected next-season wRC+ (NaN without a projection, or in index files written before it existed)"""
+        column = self.columns.get("projected_score")
+        return column if column is not None else np.full(len(self), np.nan)
+
+    @property
+    def names(self) -> List[str]:
+        """Player names, decoded (and interned, so repeated names share one object) once per process"""
+        if self._names is None:
+            self._names = [sys.intern(name) for name in decode_strings(self.columns["name"], len(self))]
+        return self._names
+
+    @property
+    def names_lower(self) -> List[str]:
+        """Lowercased names used as fuzzy-match choices"""
+        if self._names_lower is None:
+            self._names_lower = [name.lower() for name in self.names]
+        return self._names_lower
+
+    def row(self, mlbam_id: int) -> Optional[int]:
+        """Row of a player by MLBAM id (binary search), or None"""
+        sorted_ids = self.columns["sorted_id"]
+        pos = int(np.searchsorted(sorted_ids, mlbam_id))
+        if pos < len(sorted_ids) and sorted_ids[pos] == mlbam_id:
+            return int(self.columns["id_order"][pos])
+        return None
+
+    def rows(self, mlbam_ids: np.ndarray) -> np.ndarray:
+        """Vectorized row(): one binary search per id, -1 where the id is not indexed"""
+        sorted_ids = self.columns["sorted_id"]
+        mlbam_ids = np.asarray(mlbam_ids, dtype=np.int64)
+        if len(sorted_ids) == 0:
+            return np.full(len(mlbam_ids), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(sorted_ids, mlbam_ids), len(sorted_ids) - 1)
+        return np.where(sorted_ids[pos] == mlbam_ids, self.columns["id_order"][pos], -1)
+
+    def changed_scores(self, previous: "PlayerIndex") -> Dict[int, float]:
+        """overall_score for players that are new or whose score differs from `previous`"""
+        ids = self.mlbam_ids
+        old_rows = previous.rows(ids)
+        scores = self.overall_score
+        old_scores = previous.overall_score[np.where(old_rows >= 0, old_rows, 0)] if len(previous) else scores
+        changed = (old_rows < 0) | (scores != old_scores)
+        return {int(player_id): float(score) for player_id, score in zip(ids[changed], scores[changed])}
+
+    def team_abbrev(self, row: int) -> Optional[str]:
+        code = int(self.columns["team_code"][row])
+        return self.teams[code] if code >= 0 else None
+
+    def years_active(self, row: int) -> str:
+        first = int(self.columns["first_year"][row])
+        last = int(self.columns["last_year"][row])
+        if not first:
+            return "Unknown"
+        if first == last:
+            return str(first)
+        return f"{first}-{last}"
+
+    @property
+    def teams(self) -> List[str]:
+        """Team abbreviations; team_code values index into this list"""
+        return self.meta.get("teams", [])
+
+    def _facet(self, facet: str) -> Dict:
+        """Packed row bitmaps for every value of a facet, computed once per index"""
+        bitmaps = self._bitmaps.get(facet)
+        if bitmaps is not None:
+            return bitmaps
+        bitmaps = {}
+        if facet == "team":
+            codes = self.columns["team_code"]
+            for code, team in enumerate(self.teams):
+                bitmaps[team] = np.packbits(codes == code)
+        elif facet == "season":
+            offsets = self.columns["season_offset"]
+            years = self.columns["season_year"]
+            rows = np.repeat(np.arange(len(self)), np.diff(offsets))
+            for year in np.unique(years):
+                mask = np.zeros(len(self), dtype=bool)
+                mask[rows[years == year]] = True
+                bitmaps[int(year)] = np.packbits(mask)
+        self._bitmaps[facet] = bitmaps
+        return bitmaps
+
+    def filter_rows(
+        self,
+        team_abbrev: Optional[str] = None,
+        season: Optional[int] = None,
+        min_career_pa: Optional[int] = None,
+        min_overall_score: Optional[float] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Rows matching every given filter, ascending, or None when no filter is set.
+        Facets (team, season) AND together as packed bitmaps before thresholds apply.
+        """
+        if team_abbrev is None and season is None and min_career_pa is None and min_overall_score is None:
+            return None
+
+        empty = np.zeros((len(self) + 7) // 8, dtype=np.uint8)
+        packed = None
+        for facet, value in (("team", team_abbrev and team_abbrev.upper()), ("season", season)):
+            if value is None:
+                continue
+            bitmap = self._facet(facet).get(value, empty)
+            packed = bitmap if packed is None else packed & bitmap
+
+        mask = np.ones(len(self), dtype=bool) if packed is None else np.unpackbits(packed, count=len(self)).view(bool)
+        if min_career_pa is not None:
+            mask &= self.columns["career_pa"] >= min_career_pa
+        if min_overall_score is not None:
+            mask &= self.columns["overall_score"] >= min_overall_score
+        return np.flatnonzero(mask)
+
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def save(self, path: str) -> None:
+        """Write the index to `path` atomically (readers keep their old mapping)"""
+        header = {"columns": {}, "meta": self.meta}
+        offset = 0
+        for name, column in self.columns.items():
+            column = np.ascontiguousarray(column)
+            header["columns"][name] = {"dtype": column.dtype.str, "count": int(column.size), "offset": offset}
+            offset = _align(offset + column.nbytes)
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            for name, column in self.columns.items():
+                f.seek(data_start + header["columns"][name]["offset"])
+                f.write(np.ascontiguousarray(column).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PlayerIndex":
+        """Memory-map an index file; columns are read-only views of the shared pages"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if buffer[:len(MAGIC)] != MAGIC:
+            buffer.close()
+            raise ValueError(f"{path} is not a player index file")
+        (header_len,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(buffer[header_start:header_start + header_len])
+        data_start = _align(header_start + header_len)
+
+        columns = {}
+        for name, spec in header["columns"].items():
+            dtype = np.dtype(spec["dtype"])
+            if spec["count"] == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+                continue
+            columns[name] = np.frombuffer(buffer, dtype=dtype, count=spec["count"],
+                                          offset=data_start + spec["offset"])
+        return cls(columns, header.get("meta"), buffer=buffer)
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(inode, mtime) of an index file, used to notice when it has been replaced"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
@@ -0,0 +1,226 @@
+"""
+Per-request sampling profiler.
+
+A sampler thread wakes every few milliseconds and records the stack of the
+thread serving the request. Each sample is weighted by the wall time and by the
+thread CPU time that elapsed since the previous sample, so time spent awaiting
+I/O shows up in the wall profile but not the CPU profile. Weighting by elapsed
+time also keeps native calls that hold the GIL (and so delay the sampler)
+from being under-counted.
+
+The event loop thread is shared by every in-flight request, so a sample is
+only attributed to its stack when the loop is running one of the profiled
+request's own tasks: the request task, and any task created while it (or one
+of its tasks) was running. Otherwise the sample is recorded as OTHER_TASKS
+(the loop was running another request's task) or IDLE (no task was running:
+the loop was waiting in select or running I/O callbacks, e.g. while this
+request awaited the network or a worker thread).
+`concurrent_requests` is the most requests in flight at once during the
+profile; with more than one, expect OTHER_TASKS time, and thread CPU time
+(`cpu_ms`) that includes other requests' work.
+
+Work run in worker threads (asyncio.to_thread, guarded Firestore calls) is
+not sampled. It shows up as IDLE wall time on the loop, not as the stacks that
+did the work.
+
+Profiles are kept as folded stacks ("root;caller;callee microseconds"), the
+input format of flamegraph.pl, speedscope and inferno.
+"""
+import asyncio
+import contextvars
+import itertools
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Iterator, List, Optional
+
+IDLE = "(idle)"
+OTHER_TASKS = "(other tasks)"
+
+# The profile of the request whose task is running; inherited by the tasks it creates
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+# Running task per event loop (CPython keeps it in this dict); None where unavailable
+_running_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+
+_SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _short_filename(filename: str) -> str:
+    if filename.startswith(_SERVER_ROOT):
+        return os.path.relpath(filename, _SERVER_ROOT)
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def _thread_cpu_clock(thread_id: int) -> Optional[int]:
+    """CPU-time clock of another thread (Linux/BSD); None where unsupported"""
+    try:
+        return time.pthread_getcpuclockid(thread_id)
+    except (AttributeError, OSError):
+        return None
+
+
+@dataclass
+class RequestProfile:
+    """Folded wall and CPU stacks captured for one request"""
+    id: int
+    method: str
+    path: str
+    started_at: float
+    interval_ms: float
+    duration_ms: float = 0.0
+    cpu_ms: Optional[float] = None
+    status_code: Optional[int] = None
+    samples: int = 0
+    concurrent_requests: int = 1
+    wall: Counter = field(default_factory=Counter)
+    cpu: Counter = field(default_factory=Counter)
+    tasks: weakref.WeakSet = field(default_factory=weakref.WeakSet, repr=False)
+
+    def folded(self, kind: str = "wall") -> str:
+        stacks = self.cpu if kind == "cpu" else self.wall
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def _profiled_task_factory(parent_factory):
+    """Task factory that adds tasks created under a profiled request to its profile"""
+    def factory(loop, coro, **kwargs):
+        if parent_factory is not None:
+            task = parent_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.tasks.add(task)
+        return task
+    factory.tracks_profiles = True
+    return factory
+
+
+@contextmanager
+def tracking_request_tasks(profile: RequestProfile) -> Iterator[None]:
+    """
+    Attribute the current task, and the tasks it creates inside the block, to
+    `profile`. Installs the tracking task factory on the running loop the first time.
+    """
+    loop = asyncio.get_running_loop()
+    parent = loop.get_task_factory()
+    if not getattr(parent, "tracks_profiles", False):
+        loop.set_task_factory(_profiled_task_factory(parent))
+    profile.tasks.add(asyncio.current_task())
+    token = _current_profile.set(profile)
+    try:
+        yield
+    finally:
+        _current_profile.reset(token)
+
+
+class RequestSampler:
+    """Samples one thread's stack on a background thread until stopped"""
+
+    def __init__(self, profile: RequestProfile, thread_id: int,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.profile = profile
+        self._thread_id = thread_id
+        # With the loop, samples are attributed to the profile's tasks (see the module docstring)
+        self._loop = loop if _running_tasks is not None else None
+        self._interval = profile.interval_ms / 1000
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-sampler", daemon=True)
+        self._cpu_clock = _thread_cpu_clock(thread_id)
+        self._cpu_start: Optional[float] = None
+        self._wall_start = 0.0
+
+    def _cpu_now(self) -> Optional[float]:
+        if self._cpu_clock is None:
+            return None
+        try:
+            return time.clock_gettime(self._cpu_clock)
+        except OSError:
+            return None
+
+    def _stack(self, frame) -> str:
+        frames: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({_short_filename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(frames))
+
+    def _attribute(self, frame) -> str:
+        if self._loop is None:
+            return self._stack(frame)
+        task = _running_tasks.get(self._loop)
+        if task is None:
+            return IDLE
+        if task not in self.profile.tasks:
+            return OTHER_TASKS
+        return self._stack(frame)
+
+    def _run(self) -> None:
+        last_wall = time.perf_counter()
+        last_cpu = self._cpu_now()
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            wall = time.perf_counter()
+            cpu = self._cpu_now()
+            if frame is not None:
+                stack = self._attribute(frame)
+                self.profile.samples += 1
+                self.profile.wall[stack] += int((wall - last_wall) * 1e6)
+                if cpu is not None and last_cpu is not None and cpu > last_cpu:
+                    self.profile.cpu[stack] += int((cpu - last_cpu) * 1e6)
+            last_wall, last_cpu = wall, cpu
+
+    def start(self) -> None:
+        self._wall_start = time.perf_counter()
+        self._cpu_start = self._cpu_now()
+        self._thread.start()
+
+    def stop(self) -> RequestProfile:
+        self._stop.set()
+        self._thread.join()
+        self.profile.duration_ms = (time.perf_counter() - self._wall_start) * 1000
+        cpu_end = self._cpu_now()
+        if self._cpu_start is not None and cpu_end is not None:
+            self.profile.cpu_ms = (cpu_end - self._cpu_start) * 1000
+        return self.profile
+
+
+class ProfileStore:
+    """Keeps the most recent N request profiles"""
+
+    def __init__(self, max_profiles: int):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def new_profile(self, method: str, path: str, interval_ms: float) -> RequestProfile:
+        return RequestProfile(
+            id=next(self._ids), method=method, path=path,
+            started_at=time.time(), interval_ms=interval_ms,
+        )
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
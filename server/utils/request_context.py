@@ -0,0 +1,19 @@
+"""
+Per-request context shared across middleware, services and logging.
+
+Values live in context variables so they follow the request through awaits
+and into worker threads started with asyncio.to_thread.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+# Raw Accept header, read by NegotiatedResponse to pick the response encoding
+accept_var: ContextVar[Optional[str]] = ContextVar("accept", default=None)
+# Monotonic time by which the request should be answered; storage calls size their timeouts from it
+deadline_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """Return the id of the request being handled, if any"""
+    return request_id_var.get()
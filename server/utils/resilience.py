@@ -0,0 +1,246 @@
+"""
+Resilience for blocking storage calls.
+
+Every Firestore call made on a request path goes through a StorageGuard,
+which runs it in a worker thread and adds four protections:
+
+- a deadline: each attempt gets min(STORAGE_CALL_TIMEOUT, what is left of the
+  request's REQUEST_BUDGET_SECONDS), so a slow backend cannot hold a request
+  past its budget
+- a circuit breaker: after CIRCUIT_FAILURE_THRESHOLD consecutive failures the
+  guard fails fast (503) for CIRCUIT_RESET_SECONDS, then lets one probe through
+- retries with full-jitter exponential backoff, for idempotent reads only
+- optional hedging: if a read has not answered after `hedge_after` seconds,
+  a second identical read is started and the first answer wins
+
+A timed-out attempt cannot be cancelled inside its thread; the request stops
+waiting for it, and the thread finishes (or fails) in the background.
+"""
+import asyncio
+import random
+import time
+from typing import Callable, Optional, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, status
+
+from config.settings import settings
+from utils.metrics import metrics, track_backend
+from utils.request_context import deadline_var
+
+T = TypeVar("T")
+
+storage_attempts = metrics.counter(
+    "storage_attempts_total",
+    "Guarded storage attempts; outcome=ok, error, timeout, or rejected while the circuit was open",
+    ["backend", "operation", "outcome"],
+)
+storage_hedges = metrics.counter(
+    "storage_hedged_reads_total",
+    "Hedged second reads started, and which read answered first",
+    ["backend", "operation", "winner"],
+)
+storage_fallbacks = metrics.counter(
+    "storage_fallbacks_total",
+    "Responses served from stale cached data because storage was unavailable",
+    ["backend", "operation"],
+)
+circuit_state = metrics.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["breaker"],
+)
+
+
+class StorageUnavailable(HTTPException):
+    """Storage failed or its circuit is open; clients should retry later"""
+    def __init__(self, detail: str = "Storage is temporarily unavailable"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(max(1, int(settings.CIRCUIT_RESET_SECONDS)))},
+        )
+
+
+class DeadlineExceeded(HTTPException):
+    """The request budget ran out while waiting on storage"""
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Storage did not respond in time")
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current request's budget, or None outside a request"""
+    deadline = deadline_var.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one probe) -> closed or open"""
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._set_state(self.CLOSED)
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        circuit_state.set(state, breaker=self.name)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._set_state(self.HALF_OPEN)
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self._set_state(self.OPEN)
+
+
+class StorageGuard:
+    """Deadline, circuit breaker, retries and hedging around one backend's blocking calls"""
+
+    def __init__(self, backend: str, breaker: CircuitBreaker):
+        self.backend = backend
+        self.breaker = breaker
+
+    async def call(
+        self,
+        operation: str,
+        fn: Callable[[], T],
+        idempotent: bool = False,
+        hedge_after: Optional[float] = None,
+        use_budget: bool = True,
+        timeout: Optional[float] = None,
+        passthrough: Tuple[Type[BaseException], ...] = (),
+    ) -> T:
+        """
+        Run `fn` (a blocking storage call) in a thread under the guard.
+        Reads pass idempotent=True to be retried; `hedge_after` enables hedging;
+        streaming responses and shared background loads pass use_budget=False so only
+        the per-call timeout applies; `timeout` replaces STORAGE_CALL_TIMEOUT.
+        Exceptions in `passthrough` (answers such as "user not found") reach the
+        caller unchanged and count as a healthy backend.
+        """
+        attempts = 1 + (settings.STORAGE_RETRIES if idempotent else 0)
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                storage_attempts.inc(backend=self.backend, operation=operation, outcome="rejected")
+                raise StorageUnavailable()
+            attempt_timeout = self._timeout(use_budget, timeout)
+            if attempt_timeout <= 0:
+                raise DeadlineExceeded()
+            try:
+                result = await self._attempt(operation, fn, attempt_timeout, hedge_after)
+            except asyncio.CancelledError:
+                # The caller went away; a half-open probe must not stay claimed
+                self.breaker.release_probe()
+                raise
+            except passthrough:
+                storage_attempts.inc(backend=self.backend, operation=operation, outcome="ok")
+                self.breaker.record_success()
+                raise
+            except asyncio.TimeoutError:
+                storage_attempts.inc(backend=self.backend, operation=operation, outcome="timeout")
+                self.breaker.record_failure()
+                timed_out = True
+            except Exception:
+                storage_attempts.inc(backend=self.backend, operation=operation, outcome="error")
+                self.breaker.record_failure()
+                timed_out = False
+            else:
+                storage_attempts.inc(backend=self.backend, operation=operation, outcome="ok")
+                self.breaker.record_success()
+                return result
+
+            if attempt + 1 < attempts:
+                # Full jitter keeps retrying clients from hitting the backend in lockstep
+                backoff = random.uniform(0, min(settings.STORAGE_RETRY_BACKOFF_MAX,
+                                                settings.STORAGE_RETRY_BACKOFF * 2 ** attempt))
+                remaining = remaining_budget() if use_budget else None
+                if remaining is not None and remaining <= backoff:
+                    break
+                await asyncio.sleep(backoff)
+
+        if timed_out:
+            raise DeadlineExceeded()
+        raise StorageUnavailable()
+
+    def _timeout(self, use_budget: bool, timeout: Optional[float] = None) -> float:
+        timeout = settings.STORAGE_CALL_TIMEOUT if timeout is None else timeout
+        remaining = remaining_budget() if use_budget else None
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def _run(self, operation: str, fn: Callable[[], T]) -> T:
+        with track_backend(self.backend, operation):
+            return fn()
+
+    async def _attempt(self, operation: str, fn: Callable[[], T], timeout: float,
+                       hedge_after: Optional[float]) -> T:
+        primary = asyncio.ensure_future(asyncio.to_thread(self._run, operation, fn))
+        if not hedge_after or hedge_after >= timeout:
+            return await asyncio.wait_for(primary, timeout)
+
+        start = time.monotonic()
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+        hedge = asyncio.ensure_future(asyncio.to_thread(self._run, operation, fn))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout - (time.monotonic() - start), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                if task.exception() is None:
+                    winner = "primary" if task is primary else "hedge"
+                    storage_hedges.inc(backend=self.backend, operation=operation, winner=winner)
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        for task in pending:
+            task.cancel()
+        if error is not None and not pending:
+            raise error
+        raise asyncio.TimeoutError()
+
+
+# Shared by every Firestore call on a request path, so one breaker sees the backend's health
+firestore_guard = StorageGuard(
+    "firestore",
+    CircuitBreaker("firestore", settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS),
+)
+
+# Firebase Authentication calls (token checks on every authenticated request) get their own breaker
+auth_guard = StorageGuard(
+    "firebase_auth",
+    CircuitBreaker("firebase_auth", settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS),
+)
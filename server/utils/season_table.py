@@ -0,0 +1,141 @@
+"""
+Per-season stat tables and percentile ranks.
+
+The ingest pipeline writes one columnar document per season to
+`season_stats/{year}` (a list per stat, aligned by row with `mlbam_id`).
+A SeasonTable turns that document into NumPy columns, and it keeps one
+presorted array per stat holding only the qualified hitters. A percentile
+lookup is then two binary searches rather than a scan of the league.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Stats with a percentile rank; LOWER_IS_BETTER ranks are flipped so 99 is always best
+PERCENTILE_STATS = [
+    "woba", "wrc_plus", "war", "batting_average", "on_base_percentage", "slugging_percentage",
+    "isolated_power", "walk_rate", "strikeout_rate", "barrel_rate", "hard_hit_rate",
+    "avg_exit_velocity", "base_running", "stolen_bases",
+]
+LOWER_IS_BETTER = {"strikeout_rate"}
+
+# Batting title threshold: 3.1 PA per team game
+QUALIFYING_PA_PER_GAME = 3.1
+
+
+class SeasonTable:
+    """One season's stats for every player, as columns"""
+
+    def __init__(self, season: int, columns: Dict[str, np.ndarray], teams: List[Optional[str]],
+                 updated_at: Optional[str] = None):
+        self.season = season
+        self.columns = columns
+        self.teams = teams
+        self.updated_at = updated_at
+
+        ids = columns["mlbam_id"]
+        self._id_order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._id_order]
+
+        # Most games by any player approximates team games played, so partial seasons qualify proportionally
+        games = columns.get("games")
+        team_games = float(games.max()) if games is not None and len(games) else 0.0
+        self.qualifying_pa = int(QUALIFYING_PA_PER_GAME * team_games)
+        self.qualified = columns["plate_appearances"] >= self.qualifying_pa
+
+        self._sorted: Dict[str, np.ndarray] = {}
+        for stat in PERCENTILE_STATS:
+            values = columns.get(stat)
+            if values is not None:
+                values = values[self.qualified]
+                self._sorted[stat] = np.sort(values[~np.isnan(values)])
+
+    def __len__(self) -> int:
+        return len(self.columns["mlbam_id"])
+
+    @classmethod
+    def from_document(cls, doc: Dict) -> "SeasonTable":
+        """Build from a `season_stats/{year}` document"""
+        columns = {"mlbam_id": np.asarray(doc.get("mlbam_id") or [], dtype=np.int64)}
+        for stat, values in doc.items():
+            if stat in ("season", "updated_at", "mlbam_id", "team_abbrev") or not isinstance(values, list):
+                continue
+            columns[stat] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        if "plate_appearances" not in columns:
+            columns["plate_appearances"] = np.zeros(len(columns["mlbam_id"]))
+        return cls(int(doc["season"]), columns, list(doc.get("team_abbrev") or []), doc.get("updated_at"))
+
+    def row(self, mlbam_id: int) -> Optional[int]:
+        pos = int(np.searchsorted(self._sorted_ids, mlbam_id))
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == mlbam_id:
+            return int(self._id_order[pos])
+        return None
+
+    def rows(self, mlbam_ids: np.ndarray) -> np.ndarray:
+        """Vectorized row(): -1 where the player has no line this season"""
+        mlbam_ids = np.asarray(mlbam_ids, dtype=np.int64)
+        if len(self._sorted_ids) == 0:
+            return np.full(len(mlbam_ids), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, mlbam_ids), len(self._sorted_ids) - 1)
+        return np.where(self._sorted_ids[pos] == mlbam_ids, self._id_order[pos], -1)
+
+    def line(self, row: int) -> Dict:
+        """One player's season line as a dict shaped like a `seasons` entry"""
+        line = {}
+        for stat, values in self.columns.items():
+            if stat == "mlbam_id":
+                continue
+            value = float(values[row])
+            line[stat] = None if np.isnan(value) else value
+        line["team_abbrev"] = self.teams[row] if row < len(self.teams) else None
+        return line
+
+    def changed_ids(self, previous: "SeasonTable") -> np.ndarray:
+        """Players whose line is new or differs from `previous` (NaN == NaN)"""
+        ids = self.columns["mlbam_id"]
+        if len(previous) == 0:
+            return ids
+        old_rows = previous.rows(ids)
+        changed = old_rows < 0
+        found = ~changed
+        for stat, values in self.columns.items():
+            if stat == "mlbam_id":
+                continue
+            old_values = previous.columns.get(stat)
+            if old_values is None:
+                changed |= found & ~np.isnan(values)
+                continue
+            old = old_values[np.where(found, old_rows, 0)]
+            changed |= found & (values != old) & ~(np.isnan(values) & np.isnan(old))
+        if self.teams or previous.teams:
+            new_teams = np.asarray(self.teams + [None] * (len(ids) - len(self.teams)), dtype=object)
+            old_teams = np.asarray(previous.teams + [None] * (len(previous) - len(previous.teams)), dtype=object)
+            changed |= found & (new_teams != old_teams[np.where(found, old_rows, 0)])
+        return ids[changed]
+
+    def percentile(self, stat: str, value: float) -> Optional[int]:
+        """
+        Percentile (0-99, as Baseball Savant shows them; higher is better) of a value
+        among qualified hitters; ties share the midpoint rank
+        """
+        ranked = self._sorted.get(stat)
+        if ranked is None or len(ranked) == 0 or np.isnan(value):
+            return None
+        below = np.searchsorted(ranked, value, side="left")
+        at_or_below = np.searchsorted(ranked, value, side="right")
+        pct = 100.0 * (below + at_or_below) / 2 / len(ranked)
+        if stat in LOWER_IS_BETTER:
+            pct = 100.0 - pct
+        return int(min(99, max(0, round(pct))))
+
+    def percentiles(self, mlbam_id: int) -> Optional[Dict[str, int]]:
+        """Every available percentile for one player, or None if they have no line this season"""
+        row = self.row(mlbam_id)
+        if row is None:
+            return None
+        result = {}
+        for stat in self._sorted:
+            pct = self.percentile(stat, float(self.columns[stat][row]))
+            if pct is not None:
+                result[stat] = pct
+        return result
@@ -0,0 +1,61 @@
+"""
+Request coalescing ("single flight").
+
+Concurrent callers asking for the same key share one in-flight execution and
+its result (or exception) instead of each issuing the same backend call.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+from utils.metrics import metrics
+
+T = TypeVar("T")
+
+singleflight_calls = metrics.counter(
+    "singleflight_calls_total",
+    "Calls through a single-flight group; result=leader ran the work, shared reused it",
+    ["group", "result"],
+)
+singleflight_coalesced_ratio = metrics.gauge(
+    "singleflight_coalesced_ratio",
+    "Fraction of calls served by joining an in-flight execution",
+    ["group"],
+)
+
+
+class SingleFlight:
+    """Coalesce concurrent async calls that share a key"""
+
+    def __init__(self, group: str):
+        self.group = group
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def _record(self, shared: bool) -> None:
+        singleflight_calls.inc(group=self.group, result="shared" if shared else "leader")
+        leaders = singleflight_calls.value(group=self.group, result="leader")
+        shared_calls = singleflight_calls.value(group=self.group, result="shared")
+        singleflight_coalesced_ratio.set(shared_calls / (leaders + shared_calls), group=self.group)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn()` unless a call with the same key is already in flight, in which
+        case wait for that call's outcome. The work runs in its own task, so a
+        cancelled caller does not cancel it for the others.
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        self._record(shared)
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,257 @@
+"""
+Date-partitioned Statcast pitch store and per-batter aggregates.
+
+scripts/statcast.py stages pitch-level Statcast rows (one row per pitch) as
+one Parquet file per game date:
+
+    <root>/game_year=<year>/game_date=<yyyy-mm-dd>.parquet
+
+Only PITCH_COLUMNS are kept, and each file is sorted by batter.
+`StatcastStore.aggregate` picks the files in the requested date range from
+their names (partition pruning), so a two-week query never opens the rest of
+the season. It then streams record batches of the needed columns,
+optionally filtered to some batters. About 64k pitches at a time are reduced
+to per-(batter, split) sums with a vectorized Arrow group-by, and the sums
+are added up at the end. Memory is bounded by one such chunk plus one row per
+batter and split, whatever the number of pitches.
+
+Rates follow the FanGraphs-derived season lines: hard-hit (95+ mph), barrel
+and whiff rates are fractions like `hard_hit_rate`, and wOBA / xwOBA use
+Statcast's per-PA `woba_value` / `woba_denom`.
+"""
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+PITCH_COLUMNS = {
+    "game_date": "date32",
+    "batter": "int32",
+    "pitcher": "int32",
+    "stand": "string",
+    "p_throws": "string",
+    "inning_topbot": "string",
+    "pitch_type": "string",
+    "type": "string",           # B (ball), S (strike), X (in play)
+    "description": "string",
+    "events": "string",         # Set on the last pitch of a plate appearance
+    "launch_speed": "float32",
+    "launch_angle": "float32",
+    "launch_speed_angle": "float32",  # 6 = barrel
+    "estimated_woba_using_speedangle": "float32",
+    "woba_value": "float32",
+    "woba_denom": "float32",
+}
+
+# Group-by dimensions beyond the batter; None aggregates every pitch in the range
+SPLITS = {
+    "pitcher_hand": "p_throws",
+    "batter_side": "stand",
+    "home_away": "inning_topbot",
+    "month": "game_date",
+    "pitch_type": "pitch_type",
+}
+
+HARD_HIT_MPH = 95
+BARREL = 6
+HITS = ["single", "double", "triple", "home_run"]
+WALKS = ["walk", "intent_walk"]
+STRIKEOUTS = ["strikeout", "strikeout_double_play"]
+NOT_A_PA = ["truncated_pa"]  # Ended by a baserunner out; Statcast still sets `events`
+WHIFFS = ["swinging_strike", "swinging_strike_blocked", "foul_tip", "missed_bunt"]
+SWINGS = WHIFFS + ["foul", "foul_bunt", "foul_pitchout", "hit_into_play", "bunt_foul_tip"]
+
+# Summed per (batter, split); every reported stat derives from these
+SUM_COLUMNS = [
+    "pitches", "plate_appearances", "hits", "home_runs", "walks", "strikeouts",
+    "batted_balls", "hard_hit", "barrels", "exit_velocity", "launch_angle",
+    "swings", "whiffs", "woba_value", "xwoba_value", "woba_denom",
+]
+_PRECISION = 4
+_BATCH_ROWS = 65_536
+# `batter` is stored as int32 (MLBAM ids); no staged pitch can have an id outside it
+MAX_BATTER_ID = 2**31 - 1
+
+
+def pitch_schema():
+    import pyarrow as pa
+    return pa.schema([(name, getattr(pa, kind)()) for name, kind in PITCH_COLUMNS.items()])
+
+
+def _ratio(numerator: float, denominator: float, precision: int = _PRECISION) -> Optional[float]:
+    return round(numerator / denominator, precision) if denominator else None
+
+
+class StatcastStore:
+    """Pitch-level Statcast rows partitioned by game date under `root`"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, day: date) -> Path:
+        return self.root / f"game_year={day.year}" / f"game_date={day.isoformat()}.parquet"
+
+    def dates(self, start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+        """Staged game dates within [start, end], from directory and file names only"""
+        days = []
+        for year_dir in sorted(self.root.glob("game_year=*")):
+            year = int(year_dir.name.split("=", 1)[1])
+            if (start and year < start.year) or (end and year > end.year):
+                continue
+            for file in year_dir.glob("game_date=*.parquet"):
+                day = date.fromisoformat(file.stem.split("=", 1)[1])
+                if (start is None or day >= start) and (end is None or day <= end):
+                    days.append(day)
+        return sorted(days)
+
+    def write_day(self, day: date, table) -> int:
+        """Replace one game date's file with `table` (PITCH_SCHEMA columns); returns its pitch count"""
+        import os
+        import pyarrow.parquet as pq
+
+        table = table.select(list(PITCH_COLUMNS)).cast(pitch_schema()).sort_by("batter")
+        path = self.path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so an interrupted write is never taken as staged
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+        return table.num_rows
+
+    def pitch_count(self, start: Optional[date] = None, end: Optional[date] = None) -> int:
+        """Pitches staged within [start, end], from Parquet footers"""
+        import pyarrow.parquet as pq
+        return sum(pq.ParquetFile(self.path(day)).metadata.num_rows for day in self.dates(start, end))
+
+    def aggregate(self, start: Optional[date] = None, end: Optional[date] = None,
+                  batters: Optional[Iterable[int]] = None, split: Optional[str] = None) -> List[Dict]:
+        """
+        Per-batter aggregates over [start, end] (inclusive; open ends mean every
+        staged date), one row per batter and split value, sorted by batter.
+        `batters` limits the scan to those ids; `split` is a SPLITS key.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        if split is not None and split not in SPLITS:
+            raise ValueError(f"Unknown split {split!r}; expected one of {sorted(SPLITS)}")
+        files = [str(self.path(day)) for day in self.dates(start, end)]
+        if not files:
+            return []
+
+        columns = [name for name in PITCH_COLUMNS if name not in ("pitcher", "pitch_type", "stand",
+                                                                    "p_throws", "inning_topbot")]
+        if split is not None and SPLITS[split] not in columns:
+            columns.append(SPLITS[split])
+        row_filter = None
+        if batters is not None:
+            ids = sorted(batter for batter in set(batters) if 0 <= batter <= MAX_BATTER_ID)
+            row_filter = pc.field("batter").isin(pa.array(ids, type=pa.int32()))
+
+        dataset = ds.dataset(files, format="parquet", schema=pitch_schema())
+        partials, pending, pending_rows = [], [], 0
+        for batch in dataset.to_batches(columns=columns, filter=row_filter, batch_size=_BATCH_ROWS):
+            # A game day is a few thousand pitches; reduce about _BATCH_ROWS at a time so the
+            # group-by's fixed cost is paid per chunk rather than per file
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= _BATCH_ROWS:
+                partials.append(_batch_sums(pa.Table.from_batches(pending).combine_chunks(), split))
+                pending, pending_rows = [], 0
+        if pending_rows:
+            partials.append(_batch_sums(pa.Table.from_batches(pending).combine_chunks(), split))
+        if not partials:
+            return []
+        # Per-batch sums have one row per (batter, split), so the final group-by is over a small table
+        totals = pa.concat_tables(partials).group_by(["batter", "split"]).aggregate(
+            [(column, "sum") for column in SUM_COLUMNS]
+        ).sort_by([("batter", "ascending"), ("split", "ascending")])
+        return [_stats(row) for row in totals.to_pylist()]
+
+
+def _batch_sums(batch, split: Optional[str]):
+    """A chunk of pitches (table or record batch) reduced to SUM_COLUMNS per (batter, split)"""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    def isin(column: str, values: List[str]):
+        return pc.fill_null(pc.is_in(batch.column(column), value_set=pa.array(values)), False)
+
+    def where(mask, values=None):
+        # Masked values (or ones) as float64, with nulls counted as zero
+        values = pa.scalar(1.0) if values is None else pc.fill_null(pc.cast(values, pa.float64()), 0.0)
+        return pc.if_else(mask, values, 0.0)
+
+    events = batch.column("events")
+    plate_appearance = pc.and_(pc.is_valid(events), pc.invert(isin("events", NOT_A_PA)))
+    speed, angle = batch.column("launch_speed"), batch.column("launch_angle")
+    # Balls in play with both launch values, so every contact average shares one denominator
+    batted = pc.fill_null(pc.and_(pc.equal(batch.column("type"), "X"),
+                                  pc.and_(pc.is_valid(speed), pc.is_valid(angle))), False)
+    hard_hit = pc.fill_null(pc.and_(batted, pc.greater_equal(speed, HARD_HIT_MPH)), False)
+    barrel = pc.fill_null(pc.and_(batted, pc.equal(batch.column("launch_speed_angle"), BARREL)), False)
+    # xwOBA credits batted balls with their expected value and everything else with its actual value
+    expected = batch.column("estimated_woba_using_speedangle")
+    xwoba_value = pc.if_else(pc.is_valid(expected), expected, batch.column("woba_value"))
+
+    if split is None:
+        split_values = pa.nulls(batch.num_rows, pa.string())
+    elif split == "month":
+        split_values = pc.utf8_lpad(pc.cast(pc.month(batch.column("game_date")), pa.string()), 2, "0")
+    elif split == "home_away":
+        split_values = pc.if_else(pc.equal(batch.column("inning_topbot"), "Bot"), "home", "away")
+    else:
+        split_values = batch.column(SPLITS[split])
+
+    table = pa.table({
+        "batter": batch.column("batter"),
+        "split": split_values,
+        "pitches": np.ones(batch.num_rows),
+        "plate_appearances": where(plate_appearance),
+        "hits": where(isin("events", HITS)),
+        "home_runs": where(pc.fill_null(pc.equal(events, "home_run"), False)),
+        "walks": where(isin("events", WALKS)),
+        "strikeouts": where(isin("events", STRIKEOUTS)),
+        "batted_balls": where(batted),
+        "hard_hit": where(hard_hit),
+        "barrels": where(barrel),
+        "exit_velocity": where(batted, speed),
+        "launch_angle": where(batted, angle),
+        "swings": where(isin("description", SWINGS)),
+        "whiffs": where(isin("description", WHIFFS)),
+        "woba_value": where(plate_appearance, batch.column("woba_value")),
+        "xwoba_value": where(plate_appearance, xwoba_value),
+        "woba_denom": where(plate_appearance, batch.column("woba_denom")),
+    })
+    sums = table.group_by(["batter", "split"]).aggregate([(column, "sum") for column in SUM_COLUMNS])
+    return sums.rename_columns([
+        column[:-len("_sum")] if column.endswith("_sum") else column for column in sums.column_names
+    ])
+
+
+def _stats(row: Dict) -> Dict:
+    """Reported stats for one (batter, split) from its summed columns"""
+    total = {column: row[f"{column}_sum"] or 0.0 for column in SUM_COLUMNS}
+    plate_appearances = total["plate_appearances"]
+    batted_balls = total["batted_balls"]
+    return {
+        "mlbam_id": int(row["batter"]),
+        "split": row["split"],
+        "pitches": int(total["pitches"]),
+        "plate_appearances": int(plate_appearances),
+        "hits": int(total["hits"]),
+        "home_runs": int(total["home_runs"]),
+        "walks": int(total["walks"]),
+        "strikeouts": int(total["strikeouts"]),
+        "batted_balls": int(batted_balls),
+        "walk_rate": _ratio(total["walks"], plate_appearances),
+        "strikeout_rate": _ratio(total["strikeouts"], plate_appearances),
+        "woba": _ratio(total["woba_value"], total["woba_denom"], 3),
+        "xwoba": _ratio(total["xwoba_value"], total["woba_denom"], 3),
+        "hard_hit_rate": _ratio(total["hard_hit"], batted_balls),
+        "barrel_rate": _ratio(total["barrels"], batted_balls),
+        "avg_exit_velocity": _ratio(total["exit_velocity"], batted_balls, 1),
+        "avg_launch_angle": _ratio(total["launch_angle"], batted_balls, 1),
+        "whiff_rate": _ratio(total["whiffs"], total["swings"]),
+    }
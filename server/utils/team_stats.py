@@ -0,0 +1,105 @@
+"""
+Team-season offensive aggregates from a SeasonTable.
+
+One vectorized group-by over a season's player lines keyed on `team_abbrev`:
+PA-weighted OBP, ISO and wOBA, total WAR, and the distribution of the roster's
+offensive player scores. The score is the same as
+scripts/seed_teams.py's `offensive_player_score`:
+
+    (1 - K%) + BB% + OBP + ISO + BsR
+
+Players without a single team for the season (FanGraphs' "- - -" for
+multi-team lines, stored as None) are left out.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from utils.season_table import SeasonTable
+
+RATE_STATS = ["on_base_percentage", "isolated_power", "woba"]
+SCORE_QUANTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75}
+
+_PRECISION = 4
+
+
+def offensive_scores(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """offensive_player_score for every row; NaN where a component is missing"""
+    return ((1 - columns["strikeout_rate"]) + columns["walk_rate"] + columns["on_base_percentage"]
+            + columns["isolated_power"] + columns["base_running"])
+
+
+def _round(values: np.ndarray) -> List:
+    return [None if np.isnan(value) else round(float(value), _PRECISION) for value in values]
+
+
+def team_aggregates(table: SeasonTable) -> List[Dict]:
+    """One aggregate per team with a player line in `table`, sorted by team_abbrev"""
+    teams = np.asarray(table.teams + [None] * (len(table) - len(table.teams)), dtype=object)
+    on_team = np.fromiter((team is not None for team in teams), dtype=bool, count=len(teams))
+    if not on_team.any():
+        return []
+    abbrevs, team_of = np.unique(teams[on_team].astype(str), return_inverse=True)
+    n_teams = len(abbrevs)
+    columns = {stat: values[on_team] for stat, values in table.columns.items()}
+    missing = np.full(on_team.sum(), np.nan)
+
+    pa = np.nan_to_num(columns["plate_appearances"])
+    aggregates = {
+        "players": np.bincount(team_of, minlength=n_teams),
+        "plate_appearances": np.bincount(team_of, weights=pa, minlength=n_teams),
+        "war": np.bincount(team_of, weights=np.nan_to_num(columns.get("war", missing)), minlength=n_teams),
+    }
+    for stat in RATE_STATS:
+        values = columns.get(stat, missing)
+        has = ~np.isnan(values)
+        # PA behind the players who have this rate, so a missing value does not drag the team down
+        weight = np.bincount(team_of, weights=pa * has, minlength=n_teams)
+        total = np.bincount(team_of, weights=np.where(has, values * pa, 0.0), minlength=n_teams)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            aggregates[stat] = np.where(weight > 0, total / weight, np.nan)
+
+    # Score distribution: sort by (team, score), then read each team's quantiles from its slice
+    scores = offensive_scores({stat: columns.get(stat, missing) for stat in
+                               ("strikeout_rate", "walk_rate", "on_base_percentage", "isolated_power",
+                                "base_running")})
+    scored = ~np.isnan(scores)
+    counts = np.bincount(team_of[scored], minlength=n_teams)
+    distribution = {name: np.full(n_teams, np.nan) for name in ("mean", "min", *SCORE_QUANTILES, "max")}
+    if scored.any():
+        scores, scored_team = scores[scored], team_of[scored]
+        sorted_scores = scores[np.lexsort((scores, scored_team))]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        has = counts > 0
+        last = np.where(has, starts + counts - 1, 0)
+        first = np.where(has, starts, 0)
+        totals = np.bincount(scored_team, weights=scores, minlength=n_teams)
+        distribution["mean"][has] = totals[has] / counts[has]
+        distribution["min"][has] = sorted_scores[first][has]
+        distribution["max"][has] = sorted_scores[last][has]
+        for name, q in SCORE_QUANTILES.items():
+            # Linear interpolation between order statistics, as np.quantile does
+            position = first + q * (last - first)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, last)
+            value = sorted_scores[lower] + (position - lower) * (sorted_scores[upper] - sorted_scores[lower])
+            distribution[name][has] = value[has]
+
+    rates = {stat: _round(aggregates[stat]) for stat in RATE_STATS}
+    war = _round(aggregates["war"])
+    stats = {name: _round(values) for name, values in distribution.items()}
+    return [
+        {
+            "team_abbrev": str(abbrev),
+            "season": table.season,
+            "players": int(aggregates["players"][t]),
+            "plate_appearances": int(aggregates["plate_appearances"][t]),
+            **{stat: rates[stat][t] for stat in RATE_STATS},
+            "war": war[t],
+            "offensive_player_score": {
+                "players": int(counts[t]),
+                **{name: stats[name][t] for name in ("mean", "min", "p25", "median", "p75", "max")},
+            },
+        }
+        for t, abbrev in enumerate(abbrevs)
+    ]